@@ -14,11 +14,21 @@ if str(src_dir) not in sys.path:
     sys.path.insert(0, str(src_dir))
 
 from weirdion import NODE_CLASS_MAPPINGS, NODE_DISPLAY_NAME_MAPPINGS  # noqa: E402
-from weirdion.server import register_profile_routes  # noqa: E402
+from weirdion.server import (  # noqa: E402
+    register_cache_routes,
+    register_model_routes,
+    register_profile_routes,
+    register_stats_routes,
+    register_warmup_routes,
+)
 
 # Register web assets for ComfyUI UI extensions.
 WEB_DIRECTORY = "web"
 
 register_profile_routes()
+register_model_routes()
+register_stats_routes()
+register_cache_routes()
+register_warmup_routes()
 
 __all__ = ["NODE_CLASS_MAPPINGS", "NODE_DISPLAY_NAME_MAPPINGS"]
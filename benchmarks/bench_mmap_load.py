@@ -0,0 +1,133 @@
+"""
+Compare peak RSS of copied and mapped safetensors loads onto the CPU.
+
+Writes a synthetic checkpoint of --size-mb of float16 linear layers, then in
+a fresh subprocess per mode builds a model of the same shape and loads it:
+
+- copied: safetensors.torch.load_file, then Module.load_state_dict (what
+  ComfyUI does)
+- mapped: safetensors_map.map_state_dict, Module.load_state_dict, then
+  adopt_mapped_weights to drop the copies
+
+and reports load time, peak RSS, the private (anonymous) and file-backed
+memory left afterwards, and the mapped/copied split from account_weights.
+A copied load ends with the model in private memory after peaking at twice
+its size; a mapped load ends with it in reclaimable page cache shared with
+other mappings. Requires torch and safetensors, on Linux.
+
+Usage:
+    python benchmarks/bench_mmap_load.py [--size-mb 1024] [--layers 64] [--dir /path]
+"""
+
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import types
+from pathlib import Path
+from typing import Any
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from weirdion.utils.mapped_load import account_weights, adopt_mapped_weights  # noqa: E402
+from weirdion.utils.safetensors_map import map_state_dict  # noqa: E402
+
+
+def build_model(layers: int, width: int) -> Any:
+    import torch
+
+    with torch.device("meta"):
+        model = torch.nn.Sequential(
+            *(torch.nn.Linear(width, width, bias=False, dtype=torch.float16) for _ in range(layers))
+        )
+    # Allocate real, uninitialised CPU storage the way a model is created before its weights are loaded
+    return model.to_empty(device="cpu")
+
+
+def memory_status() -> dict[str, float]:
+    """Return RssAnon and RssFile from /proc/self/status, in megabytes."""
+    status = {}
+    with open("/proc/self/status") as handle:
+        for line in handle:
+            name, _, value = line.partition(":")
+            if name in ("RssAnon", "RssFile"):
+                status[name] = int(value.split()[0]) / 1024
+    return status
+
+
+def layer_width(size_mb: int, layers: int) -> int:
+    return int((size_mb * 1024**2 / layers / 2) ** 0.5)
+
+
+def write_checkpoint(path: str, size_mb: int, layers: int) -> None:
+    import torch
+    from safetensors.torch import save_file
+
+    width = layer_width(size_mb, layers)
+    save_file({f"{index}.weight": torch.randn(width, width).half() for index in range(layers)}, path)
+
+
+def run_child(mode: str, path: str, layers: int, size_mb: int) -> dict[str, object]:
+    from safetensors.torch import load_file
+
+    model = build_model(layers, layer_width(size_mb, layers))
+    start = time.perf_counter()
+    if mode == "copied":
+        state_dict, weights = load_file(path), None
+    else:
+        state_dict, _metadata = map_state_dict(path)
+        weights = dict(state_dict)
+    model.load_state_dict(state_dict)
+    del state_dict
+    outputs = (types.SimpleNamespace(model=model),)
+    adopted = adopt_mapped_weights(outputs, weights) if weights is not None else 0
+    seconds = time.perf_counter() - start
+    mapped, copied, _device = account_weights(outputs, weights)
+    status = memory_status()
+    return {
+        "seconds": seconds,
+        # Linux reports kilobytes
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        "anon_mb": status.get("RssAnon", 0.0),
+        "file_mb": status.get("RssFile", 0.0),
+        "mapped_mb": mapped / 1024**2,
+        "copied_mb": copied / 1024**2,
+        "adopted_mb": adopted / 1024**2,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size-mb", type=int, default=1024)
+    parser.add_argument("--layers", type=int, default=64)
+    parser.add_argument("--dir", default=None)
+    parser.add_argument("--child", choices=("copied", "mapped"), help=argparse.SUPPRESS)
+    parser.add_argument("--path", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(run_child(args.child, args.path, args.layers, args.size_mb)))
+        return 0
+
+    with tempfile.TemporaryDirectory(dir=args.dir) as tmp:
+        path = os.path.join(tmp, "checkpoint.safetensors")
+        write_checkpoint(path, args.size_mb, args.layers)
+        print(f"CPU checkpoint loads ({args.size_mb} MB, {args.layers} layers)")
+        for mode in ("copied", "mapped"):
+            command = [sys.executable, __file__, "--child", mode, "--path", path]
+            command += ["--size-mb", str(args.size_mb), "--layers", str(args.layers)]
+            result = json.loads(subprocess.run(command, check=True, capture_output=True, text=True).stdout)
+            print(
+                f"  {mode:<7} {result['seconds'] * 1000:>8.1f} ms  peak RSS {result['peak_rss_mb']:>8,.0f} MB  "
+                f"anon {result['anon_mb']:>7,.0f} MB  file {result['file_mb']:>7,.0f} MB  "
+                f"mapped {result['mapped_mb']:>7,.0f} MB  copied {result['copied_mb']:>7,.0f} MB"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
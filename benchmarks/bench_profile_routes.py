@@ -0,0 +1,239 @@
+"""
+Load-test the profile and model HTTP routes under concurrent clients.
+
+Runs the real route handlers on a local aiohttp test server behind a stub
+PromptServer, with a generated profile store and checkpoint listing, and
+drives a mix of reads and writes from concurrent clients. Reports latency
+percentiles per operation and how late the event loop ran its timers.
+
+Usage:
+    python benchmarks/bench_profile_routes.py [--profiles 5000] [--checkpoints 20000]
+        [--clients 30] [--duration 10] [--rate 0] [--write-ratio 0.05]
+        [--full-save-ratio 0.0] [--backend json]
+
+--rate is requests per second per client (0 sends the next request as soon as
+the previous one completes). --write-ratio is the share of PATCH requests and
+--full-save-ratio the share of whole-library POSTs; the rest are GETs.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+import types
+from collections import defaultdict
+from pathlib import Path
+from typing import Any
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from weirdion.utils import profile_store  # noqa: E402
+
+# Interval of the event-loop lag probe
+LAG_PROBE_SECONDS = 0.01
+
+
+def make_checkpoints(count: int) -> list[str]:
+    return [f"family-{index % 40:02d}/checkpoint-{index:05d}.safetensors" for index in range(count)]
+
+
+def make_profiles(count: int, checkpoints: list[str]) -> dict[str, dict[str, Any]]:
+    return {
+        f"profile-{index:05d}": {
+            "steps": 20 + index % 30,
+            "cfg": 5.0 + (index % 10) / 2,
+            "sampler": "euler_ancestral",
+            "scheduler": "karras",
+            "denoise": 1.0,
+            "clip_skip": -2,
+            "note": f"profile {index}",
+            "checkpoints": [checkpoints[(index * 7) % len(checkpoints)]] if checkpoints else [],
+        }
+        for index in range(count)
+    }
+
+
+def install_stubs(checkpoints: list[str]) -> Any:
+    """Install stub server and folder_paths modules; return the route table the handlers register on."""
+    from aiohttp import web
+
+    routes = web.RouteTableDef()
+    sent: list[str] = []
+    instance = types.SimpleNamespace(routes=routes, send_sync=lambda event, data: sent.append(event))
+    server_module = types.ModuleType("server")
+    server_module.PromptServer = types.SimpleNamespace(instance=instance)  # type: ignore[attr-defined]
+    sys.modules["server"] = server_module
+
+    folder_paths = types.ModuleType("folder_paths")
+    listings = {"checkpoints": checkpoints}
+    folder_paths.get_filename_list = lambda kind: listings.get(kind, [])  # type: ignore[attr-defined]
+    sys.modules["folder_paths"] = folder_paths
+    return routes
+
+
+class Recorder:
+    """Latency samples per operation, plus failures."""
+
+    def __init__(self) -> None:
+        self.latencies: dict[str, list[float]] = defaultdict(list)
+        self.errors: dict[str, int] = defaultdict(int)
+
+    def record(self, operation: str, seconds: float, ok: bool) -> None:
+        self.latencies[operation].append(seconds)
+        if not ok:
+            self.errors[operation] += 1
+
+
+async def client_loop(
+    client: Any,
+    recorder: Recorder,
+    names: list[str],
+    checkpoints: list[str],
+    args: argparse.Namespace,
+    deadline: float,
+    seed: int,
+) -> None:
+    rng = random.Random(seed)
+    etag: str | None = None
+    interval = 1.0 / args.rate if args.rate > 0 else 0.0
+    next_send = time.perf_counter()
+
+    while time.perf_counter() < deadline:
+        if interval:
+            # Open loop: requests go out on schedule however long earlier ones took
+            next_send += interval * rng.uniform(0.5, 1.5)
+            delay = next_send - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+        roll = rng.random()
+        headers = {}
+        if roll < args.full_save_ratio:
+            operation, method, path = "POST /profiles", "POST", "/weirdion/profiles"
+            body = await asyncio.to_thread(lambda: json.dumps(profile_store.get_profile_snapshot().to_dict()))
+        elif roll < args.full_save_ratio + args.write_ratio:
+            name = rng.choice(names)
+            operation, method, path = "PATCH /profiles/{name}", "PATCH", f"/weirdion/profiles/{name}"
+            body = json.dumps({"steps": rng.randint(1, 80)})
+        else:
+            body = None
+            method = "GET"
+            kind = rng.random()
+            if kind < 0.5:
+                operation, path = "GET /profiles", "/weirdion/profiles"
+                if etag is not None:
+                    headers["If-None-Match"] = etag
+            elif kind < 0.8:
+                operation = "GET /profiles?checkpoint="
+                path = f"/weirdion/profiles?checkpoint={rng.choice(checkpoints)}"
+            else:
+                operation = "GET /models/checkpoints?q="
+                path = f"/weirdion/models/checkpoints?q=checkpoint-{rng.randint(0, 99):02d}&limit=50"
+
+        start = time.perf_counter()
+        response = await client.request(method, path, data=body, headers=headers)
+        await response.read()
+        recorder.record(operation, time.perf_counter() - start, response.status < 400)
+        if operation == "GET /profiles" and response.status == 200:
+            etag = response.headers.get("ETag")
+
+
+async def probe_loop_lag(samples: list[float], deadline: float) -> None:
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        await asyncio.sleep(LAG_PROBE_SECONDS)
+        samples.append(time.perf_counter() - start - LAG_PROBE_SECONDS)
+
+
+async def run(args: argparse.Namespace, routes: Any, names: list[str], checkpoints: list[str]) -> Any:
+    from aiohttp import web
+    from aiohttp.test_utils import TestClient, TestServer
+
+    app = web.Application(client_max_size=512 * 1024**2)
+    app.add_routes(routes)
+    recorder = Recorder()
+    lag: list[float] = []
+
+    async with TestClient(TestServer(app)) as client:
+        # Warm the snapshot, model index and response caches before measuring
+        await (await client.get("/weirdion/profiles")).read()
+        await (await client.get("/weirdion/models/checkpoints")).read()
+
+        deadline = time.perf_counter() + args.duration
+        started = time.perf_counter()
+        await asyncio.gather(
+            probe_loop_lag(lag, deadline),
+            *(client_loop(client, recorder, names, checkpoints, args, deadline, seed) for seed in range(args.clients)),
+        )
+        elapsed = time.perf_counter() - started
+    return recorder, lag, elapsed
+
+
+def percentile(samples: list[float], fraction: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def report(args: argparse.Namespace, recorder: Recorder, lag: list[float], elapsed: float) -> None:
+    total = sum(len(samples) for samples in recorder.latencies.values())
+    rate = f"{args.rate:g}/s per client" if args.rate > 0 else "closed loop"
+    print(
+        f"Profile routes ({args.profiles} profiles, {args.checkpoints} checkpoints, {args.backend} backend, "
+        f"{args.clients} clients, {rate}, {elapsed:.1f}s)"
+    )
+    print(f"  {'operation':<28} {'count':>7} {'err':>5} {'p50 ms':>9} {'p90 ms':>9} {'p99 ms':>9} {'max ms':>9}")
+    for operation in sorted(recorder.latencies):
+        samples = recorder.latencies[operation]
+        print(
+            f"  {operation:<28} {len(samples):>7} {recorder.errors[operation]:>5} "
+            f"{percentile(samples, 0.5) * 1000:>9.2f} {percentile(samples, 0.9) * 1000:>9.2f} "
+            f"{percentile(samples, 0.99) * 1000:>9.2f} {max(samples) * 1000:>9.2f}"
+        )
+    print(f"  throughput {total / elapsed:,.0f} req/s")
+    if lag:
+        print(
+            f"  event-loop lag: mean {statistics.fmean(lag) * 1000:.2f} ms, "
+            f"p99 {percentile(lag, 0.99) * 1000:.2f} ms, max {max(lag) * 1000:.2f} ms"
+        )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--profiles", type=int, default=5_000)
+    parser.add_argument("--checkpoints", type=int, default=20_000)
+    parser.add_argument("--clients", type=int, default=30)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--rate", type=float, default=0.0)
+    parser.add_argument("--write-ratio", type=float, default=0.05)
+    parser.add_argument("--full-save-ratio", type=float, default=0.0)
+    parser.add_argument("--backend", choices=("json", "sqlite"), default="json")
+    args = parser.parse_args()
+
+    checkpoints = make_checkpoints(args.checkpoints)
+    profiles = make_profiles(args.profiles, checkpoints)
+    routes = install_stubs(checkpoints)
+    os.environ[profile_store.PROFILE_BACKEND_ENV] = args.backend
+
+    from weirdion.server import register_model_routes, register_profile_routes
+
+    with tempfile.TemporaryDirectory() as tmp:
+        profile_store._config_dir = lambda: Path(tmp)  # type: ignore[method-assign]
+        profile_store.save_user_profiles({"profiles": profiles, "checkpoint_defaults": {}})
+        profile_store.flush_profile_writes()
+
+        register_profile_routes()
+        register_model_routes()
+        recorder, lag, elapsed = asyncio.run(run(args, routes, list(profiles), checkpoints or [""]))
+        profile_store.flush_profile_writes()
+
+    report(args, recorder, lag, elapsed)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,120 @@
+"""
+Benchmark profile validation for large profile libraries.
+
+Usage:
+    python benchmarks/bench_profile_validation.py [--profiles 10000] [--repeat 5]
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from weirdion.utils import profile_store  # noqa: E402
+from weirdion.utils.profile_schema import profile_errors  # noqa: E402
+
+
+def make_profiles(count: int) -> dict[str, dict[str, Any]]:
+    return {
+        f"profile-{index:05d}": {
+            "steps": 20 + index % 30,
+            "cfg": 5.0 + (index % 10) / 2,
+            "sampler": "euler_ancestral",
+            "scheduler": "karras",
+            "denoise": 1.0,
+            "clip_skip": -2,
+            "note": f"profile {index}",
+            "checkpoints": [f"checkpoint-{index % 500:03d}.safetensors"],
+        }
+        for index in range(count)
+    }
+
+
+def legacy_validate(profile: dict[str, Any], name: str) -> None:
+    """The per-call schema check profile_store used before the compiled validator."""
+    if not isinstance(profile, dict):
+        raise ValueError(f"profile '{name}' must be an object")
+
+    required = {
+        "steps": int,
+        "cfg": (int, float),
+        "sampler": str,
+        "scheduler": str,
+        "denoise": (int, float),
+        "clip_skip": int,
+        "note": str,
+    }
+
+    for key, expected_type in required.items():
+        if key not in profile:
+            raise ValueError(f"profile '{name}' missing '{key}'")
+        if not isinstance(profile[key], expected_type):
+            raise ValueError(f"profile '{name}' field '{key}' has invalid type")
+
+    checkpoints = profile.get("checkpoints", [])
+    if not isinstance(checkpoints, list) or not all(isinstance(c, str) for c in checkpoints):
+        raise ValueError(f"profile '{name}' field 'checkpoints' must be a list of strings")
+
+
+def best_of(repeat: int, func: Callable[[], object]) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--profiles", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    profiles = make_profiles(args.profiles)
+    count = len(profiles)
+
+    def run_legacy() -> None:
+        for name, profile in profiles.items():
+            legacy_validate(profile, name)
+
+    def run_compiled() -> None:
+        for name, profile in profiles.items():
+            profile_errors(profile, name)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        profile_store._config_dir = lambda: Path(tmp)  # type: ignore[method-assign]
+        profile_store.save_user_profiles({"profiles": profiles, "checkpoint_defaults": {}})
+
+        edited = dict(profiles)
+        first = next(iter(edited))
+
+        def run_incremental_save() -> None:
+            edited[first] = dict(edited[first], steps=edited[first]["steps"] % 50 + 1)
+            profile_store.save_user_profiles({"profiles": edited, "checkpoint_defaults": {}})
+
+        def run_full_save() -> None:
+            profile_store._snapshot = None
+            profile_store.save_user_profiles({"profiles": profiles, "checkpoint_defaults": {}})
+
+        results = [
+            ("legacy validator, all profiles", best_of(args.repeat, run_legacy)),
+            ("compiled validator, all profiles", best_of(args.repeat, run_compiled)),
+            ("save, no previous snapshot", best_of(args.repeat, run_full_save)),
+            ("save, one profile changed", best_of(args.repeat, run_incremental_save)),
+        ]
+        profile_store.flush_profile_writes()
+
+    print(f"Profile validation ({count} profiles, best of {args.repeat})")
+    for label, seconds in results:
+        print(f"  {label:<36} {seconds * 1000:9.2f} ms  {seconds / count * 1e6:7.2f} us/profile")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,124 @@
+"""
+Benchmark checkpoint reads with and without page-cache hints.
+
+Writes a file the size of a checkpoint, drops it from the page cache, then
+reads it start to finish the way a loader does:
+
+- default: kernel readahead as configured (POSIX_FADV_NORMAL)
+- hinted: advise_will_need() before the read (WILLNEED)
+- prefetched: prefetch() while --compute seconds of other work run, then read
+- warm: already in the page cache, the upper bound for the modes above
+
+and reports throughput for each, plus how much the page cache shrank when
+release_page_cache() dropped the file, as it does on cache eviction.
+
+On tmpfs (/dev/shm) the file never leaves memory, so every mode measures the
+same memory copy; use a directory on the disk checkpoints live on.
+
+Usage:
+    python benchmarks/bench_readahead.py [--size-mb 2048] [--dir /path/on/model/disk]
+        [--repeat 3] [--compute 2.0] [--chunk-mb 16]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from weirdion.utils import readahead  # noqa: E402
+
+
+def write_file(path: str, size_mb: int) -> None:
+    block = os.urandom(1024**2)
+    with open(path, "wb") as handle:
+        for _ in range(size_mb):
+            handle.write(block)
+        handle.flush()
+        # Dirty pages cannot be dropped, so write them back first
+        os.fsync(handle.fileno())
+
+
+def drop_cache(path: str) -> None:
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_NORMAL)
+        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+    finally:
+        os.close(fd)
+
+
+def read_through(path: str, chunk_bytes: int) -> float:
+    start = time.perf_counter()
+    with open(path, "rb", buffering=0) as handle:
+        while handle.read(chunk_bytes):
+            pass
+    return time.perf_counter() - start
+
+
+def cached_kib() -> int | None:
+    try:
+        with open("/proc/meminfo") as handle:
+            for line in handle:
+                if line.startswith("Cached:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+
+def run_mode(mode: str, path: str, args: argparse.Namespace) -> float:
+    if mode == "warm":
+        read_through(path, args.chunk_mb * 1024**2)
+    else:
+        drop_cache(path)
+    if mode == "hinted":
+        readahead.advise_will_need(path)
+    elif mode == "prefetched":
+        readahead.prefetch(path)
+        # Stands in for sampling with the previous checkpoint
+        time.sleep(args.compute)
+    return read_through(path, args.chunk_mb * 1024**2)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size-mb", type=int, default=2048)
+    parser.add_argument("--dir", default=None)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--compute", type=float, default=2.0)
+    parser.add_argument("--chunk-mb", type=int, default=16)
+    args = parser.parse_args()
+
+    if not readahead.is_enabled():
+        print("posix_fadvise is unavailable or disabled; nothing to measure")
+        return 0
+
+    with tempfile.TemporaryDirectory(dir=args.dir) as tmp:
+        path = os.path.join(tmp, "checkpoint.safetensors")
+        write_file(path, args.size_mb)
+
+        print(f"Checkpoint reads ({args.size_mb} MB in {tmp}, {args.chunk_mb} MB chunks, best of {args.repeat})")
+        for mode in ("default", "hinted", "prefetched", "warm"):
+            seconds = [run_mode(mode, path, args) for _ in range(args.repeat)]
+            best = min(seconds)
+            print(
+                f"  {mode:<11} {args.size_mb / best:>9,.0f} MB/s  "
+                f"best {best * 1000:>8.1f} ms  mean {statistics.fmean(seconds) * 1000:>8.1f} ms"
+            )
+
+        read_through(path, args.chunk_mb * 1024**2)
+        before = cached_kib()
+        readahead.release_page_cache(path)
+        after = cached_kib()
+        if before is not None and after is not None:
+            print(f"  release_page_cache freed {(before - after) / 1024:,.0f} MB of page cache")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
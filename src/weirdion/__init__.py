@@ -4,7 +4,7 @@ ComfyUI weirdion - Structured Custom Node Suite
 A type-safe, well-tested collection of ComfyUI custom nodes.
 """
 
-# Import all node modules to trigger @register_node decorators
+# Declare all nodes; each node module is imported when ComfyUI first looks its class up
 from . import nodes  # noqa: F401
 from .core.registry import get_node_mappings
 
@@ -1,7 +1,15 @@
 """Core abstractions for ComfyUI weirdion nodes."""
 
 from .base import BaseNode, LoaderNode, ProcessingNode, PromptingNode, UtilityNode
-from .registry import NodeRegistry, register_node
+from .profiling import (
+    disable_node_profiling,
+    enable_node_profiling,
+    get_node_stats,
+    is_node_profiling_enabled,
+    record_cache_event,
+    reset_node_stats,
+)
+from .registry import LazyNodeMapping, NodeDeclaration, NodeRegistry, declare_node, register_node
 
 __all__ = [
     "BaseNode",
@@ -10,5 +18,14 @@ __all__ = [
     "LoaderNode",
     "PromptingNode",
     "NodeRegistry",
+    "NodeDeclaration",
+    "LazyNodeMapping",
+    "declare_node",
     "register_node",
+    "enable_node_profiling",
+    "disable_node_profiling",
+    "is_node_profiling_enabled",
+    "get_node_stats",
+    "reset_node_stats",
+    "record_cache_event",
 ]
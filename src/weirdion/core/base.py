@@ -6,9 +6,61 @@ a consistent structure across all custom nodes.
 """
 
 from abc import ABC, abstractmethod
+from collections.abc import Callable, Hashable
 from typing import Any, ClassVar
 
 from ..types import ComfyReturnType, InputSpec, NodeOutput
+from .profiling import instrument
+
+Dependencies = tuple[Callable[[], Hashable], ...]
+
+
+def _dependency_key(dependencies: Dependencies) -> tuple[Hashable, ...] | None:
+    """Evaluate dependencies into a cache key, or None if one of them cannot be read."""
+    try:
+        return tuple(dependency() for dependency in dependencies)
+    except Exception:
+        return None
+
+
+class _CachedClassAttribute:
+    """
+    Class-level attribute computed by a classmethod on first access.
+
+    The value is cached per class and recomputed when the class's
+    RETURN_TYPES_DEPENDENCIES return new values, or after
+    BaseNode.refresh_return_types(). A class whose classmethod is still
+    abstract, or returns None, has no such attribute.
+    """
+
+    def __init__(self, method_name: str) -> None:
+        self.method_name = method_name
+        self.cache_name = ""
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        self.cache_name = f"_{name.lower()}_cache"
+
+    def __get__(self, instance: object, owner: type) -> Any:
+        method = getattr(owner, self.method_name)
+        if getattr(method, "__isabstractmethod__", False):
+            raise AttributeError(f"{owner.__name__} does not implement {self.method_name}()")
+
+        key = _dependency_key(owner.RETURN_TYPES_DEPENDENCIES)
+        cached = owner.__dict__.get(self.cache_name)
+        if key is not None and cached is not None and cached[0] == key:
+            value = cached[1]
+        else:
+            value = method()
+            if key is not None:
+                setattr(owner, self.cache_name, (key, value))
+
+        if value is None:
+            raise AttributeError(f"{owner.__name__}.{self.method_name}() returned None")
+        return value
+
+    def clear(self, owner: type) -> None:
+        if self.cache_name in owner.__dict__:
+            delattr(owner, self.cache_name)
 
 
 class BaseNode(ABC):
@@ -28,6 +80,27 @@ class BaseNode(ABC):
     CATEGORY: ClassVar[str] = "weirdion"
     FUNCTION: ClassVar[str] = "process"  # Name of the method ComfyUI will call
 
+    # Zero-argument callables whose results key the cached input spec, such as a
+    # model listing or profile store revision. INPUT_TYPES rebuilds the spec only
+    # when one of them returns a new value; with none, it is built once.
+    INPUT_SPEC_DEPENDENCIES: ClassVar[Dependencies] = ()
+
+    # Same, for RETURN_TYPES and RETURN_NAMES
+    RETURN_TYPES_DEPENDENCIES: ClassVar[Dependencies] = ()
+
+    # ComfyUI reads these as class attributes; they are computed from
+    # get_return_types() and get_return_names() on first access, not at class
+    # definition, so nothing ComfyUI registers later is missed.
+    RETURN_TYPES = _CachedClassAttribute("get_return_types")
+    RETURN_NAMES = _CachedClassAttribute("get_return_names")
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        # Profile each concrete process() (see core.profiling); free while profiling is off
+        process = cls.__dict__.get("process")
+        if callable(process) and not getattr(process, "__isabstractmethod__", False):
+            cls.process = instrument(process)  # type: ignore[method-assign]
+
     @classmethod
     @abstractmethod
     def get_input_spec(cls) -> InputSpec:
@@ -77,25 +150,34 @@ class BaseNode(ABC):
         """
         ComfyUI interface method.
 
-        This is called by ComfyUI to determine node inputs. We delegate to
-        get_input_spec() which subclasses implement.
+        This is called by ComfyUI to determine node inputs, on every object_info
+        request. We delegate to get_input_spec(), which subclasses implement,
+        and cache its result per class until a declared dependency changes.
         """
-        return cls.get_input_spec()
+        key = _dependency_key(cls.INPUT_SPEC_DEPENDENCIES)
+        if key is None:
+            # A dependency that cannot be read cannot key the cache; build uncached
+            return cls.get_input_spec()
 
-    # ComfyUI expects RETURN_TYPES as a class attribute (not a method or property)
-    # We need to set this in __init_subclass__ to properly inherit from get_return_types()
-    def __init_subclass__(cls, **kwargs: Any) -> None:
-        """Automatically set RETURN_TYPES and RETURN_NAMES as class attributes when subclass is defined."""
-        super().__init_subclass__(**kwargs)
+        cached = cls.__dict__.get("_input_spec_cache")
+        if cached is not None and cached[0] == key:
+            return cached[1]
 
-        # Only set these if the class implements get_return_types (not abstract)
-        if not getattr(cls.get_return_types, "__isabstractmethod__", False):
-            cls.RETURN_TYPES = cls.get_return_types()
+        spec = cls.get_input_spec()
+        cls._input_spec_cache = (key, spec)
+        return spec
 
-            # Set RETURN_NAMES if defined
-            return_names = cls.get_return_names()
-            if return_names is not None:
-                cls.RETURN_NAMES = return_names
+    @classmethod
+    def invalidate_input_spec(cls) -> None:
+        """Drop the cached input spec so the next INPUT_TYPES call rebuilds it."""
+        if "_input_spec_cache" in cls.__dict__:
+            del cls._input_spec_cache
+
+    @classmethod
+    def refresh_return_types(cls) -> None:
+        """Drop the cached RETURN_TYPES and RETURN_NAMES so the next access recomputes them."""
+        BaseNode.__dict__["RETURN_TYPES"].clear(cls)
+        BaseNode.__dict__["RETURN_NAMES"].clear(cls)
 
     @abstractmethod
     def process(self, **kwargs: Any) -> NodeOutput:
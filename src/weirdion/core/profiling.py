@@ -0,0 +1,229 @@
+"""
+Optional execution profiling for nodes.
+
+BaseNode wraps every subclass's process() with instrument(). While profiling
+is disabled the wrapper costs one flag check. When enabled, each call records
+wall time, CPU time of the executing thread and, if memory tracing is on, the
+peak Python allocation measured with tracemalloc on every Nth call. Nodes can
+also report cache hits and misses with record_cache_event(), which are
+attributed to the node currently executing.
+
+Profiling is enabled with WEIRDION_NODE_PROFILING=1 (or =memory to also trace
+allocations), or at runtime with enable_node_profiling(). tracemalloc slows
+every allocation in the process, so if profiling started it, profiling stops
+it again when disabled or when memory tracing is turned off.
+"""
+
+from __future__ import annotations
+
+import contextvars
+import functools
+import os
+import threading
+import time
+import tracemalloc
+from collections.abc import Callable
+from dataclasses import asdict, dataclass, field
+from typing import Any
+
+from . import tracing
+
+# Environment variable enabling profiling at import: "1" for timings, "memory" to add tracemalloc
+NODE_PROFILING_ENV = "WEIRDION_NODE_PROFILING"
+
+# With memory tracing on, measure the allocation peak on one call in this many per node
+DEFAULT_MEMORY_SAMPLE_EVERY = 10
+
+
+@dataclass
+class NodeStats:
+    """Aggregated execution statistics for one node class."""
+
+    calls: int = 0
+    errors: int = 0
+    wall_seconds_total: float = 0.0
+    wall_seconds_max: float = 0.0
+    cpu_seconds_total: float = 0.0
+    memory_samples: int = 0
+    peak_alloc_bytes_max: int = 0
+    # cache name -> [hits, misses]
+    cache_events: dict[str, list[int]] = field(default_factory=dict)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return a JSON-compatible copy, with the mean wall time and per-cache hit rates."""
+        data = asdict(self)
+        data["wall_seconds_mean"] = self.wall_seconds_total / self.calls if self.calls else 0.0
+        data["cache_events"] = {
+            name: {"hits": hits, "misses": misses, "hit_rate": hits / (hits + misses) if hits + misses else 0.0}
+            for name, (hits, misses) in self.cache_events.items()
+        }
+        return data
+
+
+_enabled = False
+_trace_memory = False
+_memory_sample_every = DEFAULT_MEMORY_SAMPLE_EVERY
+_stats: dict[str, NodeStats] = {}
+_stats_lock = threading.Lock()
+# True while tracemalloc runs because profiling started it
+_started_tracemalloc = False
+_tracemalloc_lock = threading.Lock()
+
+# Name of the node whose process() is running in this context, if profiled
+_current_node: contextvars.ContextVar[str | None] = contextvars.ContextVar("weirdion_current_node", default=None)
+
+
+def enable_node_profiling(
+    *, trace_memory: bool = False, memory_sample_every: int = DEFAULT_MEMORY_SAMPLE_EVERY
+) -> None:
+    """
+    Start recording node execution statistics.
+
+    Args:
+        trace_memory: Also measure peak Python allocations with tracemalloc
+        memory_sample_every: Measure allocations on one call in this many per node
+    """
+    global _enabled, _trace_memory, _memory_sample_every
+    if memory_sample_every < 1:
+        raise ValueError("memory_sample_every must be at least 1")
+    _trace_memory = trace_memory
+    _memory_sample_every = memory_sample_every
+    _enabled = True
+    if not trace_memory:
+        _stop_tracemalloc()
+
+
+def disable_node_profiling() -> None:
+    """Stop recording node execution statistics; collected statistics are kept."""
+    global _enabled
+    _enabled = False
+    _stop_tracemalloc()
+
+
+def is_node_profiling_enabled() -> bool:
+    """Return True if node executions are being profiled."""
+    return _enabled
+
+
+def get_node_stats() -> dict[str, Any]:
+    """Return the profiling state and a JSON-compatible copy of the per-node statistics."""
+    with _stats_lock:
+        nodes = {name: stats.to_dict() for name, stats in sorted(_stats.items())}
+    return {"enabled": _enabled, "trace_memory": _trace_memory, "nodes": nodes}
+
+
+def reset_node_stats() -> None:
+    """Discard all collected statistics."""
+    with _stats_lock:
+        _stats.clear()
+
+
+def record_cache_event(cache: str, hit: bool) -> None:
+    """
+    Report a cache lookup made by the node currently executing.
+
+    Does nothing unless profiling is enabled and called from inside a node's process().
+
+    Args:
+        cache: Name of the cache, e.g. "lora_state_dict"
+        hit: True for a hit, False for a miss
+    """
+    node = _current_node.get()
+    if node is None:
+        return
+    with _stats_lock:
+        counts = _stats.setdefault(node, NodeStats()).cache_events.setdefault(cache, [0, 0])
+        counts[0 if hit else 1] += 1
+
+
+def instrument(process: Callable[..., Any]) -> Callable[..., Any]:
+    """Wrap a node's process() so its executions are profiled and traced while either is enabled."""
+    if getattr(process, "__weirdion_instrumented__", False):
+        return process
+
+    @functools.wraps(process)
+    def wrapper(self: Any, *args: Any, **kwargs: Any) -> Any:
+        if not _enabled and not tracing.is_tracing_enabled():
+            return process(self, *args, **kwargs)
+        node = type(self).__qualname__
+        with tracing.node_span(node):
+            # A subclass calling super().process() is already being measured
+            if not _enabled or _current_node.get() is not None:
+                return process(self, *args, **kwargs)
+            return _profiled_call(node, process, self, args, kwargs)
+
+    wrapper.__weirdion_instrumented__ = True  # type: ignore[attr-defined]
+    return wrapper
+
+
+def _profiled_call(
+    node: str,
+    process: Callable[..., Any],
+    self: Any,
+    args: tuple[Any, ...],
+    kwargs: dict[str, Any],
+) -> Any:
+    with _stats_lock:
+        stats = _stats.setdefault(node, NodeStats())
+        sample_memory = _trace_memory and stats.calls % _memory_sample_every == 0
+
+    base_alloc = 0
+    if sample_memory:
+        _start_tracemalloc()
+        tracemalloc.reset_peak()
+        base_alloc = tracemalloc.get_traced_memory()[0]
+
+    token = _current_node.set(node)
+    failed = False
+    wall_start = time.perf_counter()
+    cpu_start = time.thread_time()
+    try:
+        return process(self, *args, **kwargs)
+    except BaseException:
+        failed = True
+        raise
+    finally:
+        cpu = time.thread_time() - cpu_start
+        wall = time.perf_counter() - wall_start
+        _current_node.reset(token)
+        # Tracing may have been stopped by disable_node_profiling() meanwhile
+        peak = max(tracemalloc.get_traced_memory()[1] - base_alloc, 0) if sample_memory else 0
+
+        with _stats_lock:
+            stats = _stats.setdefault(node, NodeStats())
+            stats.calls += 1
+            stats.errors += failed
+            stats.wall_seconds_total += wall
+            stats.wall_seconds_max = max(stats.wall_seconds_max, wall)
+            stats.cpu_seconds_total += cpu
+            if sample_memory:
+                stats.memory_samples += 1
+                stats.peak_alloc_bytes_max = max(stats.peak_alloc_bytes_max, peak)
+
+
+def _start_tracemalloc() -> None:
+    global _started_tracemalloc
+    with _tracemalloc_lock:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            _started_tracemalloc = True
+
+
+def _stop_tracemalloc() -> None:
+    """Stop tracemalloc if profiling started it; tracing started by anyone else is left running."""
+    global _started_tracemalloc
+    with _tracemalloc_lock:
+        if _started_tracemalloc:
+            tracemalloc.stop()
+            _started_tracemalloc = False
+
+
+def _configure_from_env() -> None:
+    value = os.environ.get(NODE_PROFILING_ENV, "").strip().lower()
+    if value in ("1", "true", "yes", "on"):
+        enable_node_profiling()
+    elif value == "memory":
+        enable_node_profiling(trace_memory=True)
+
+
+_configure_from_env()
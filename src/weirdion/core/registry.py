@@ -3,17 +3,61 @@ Node registration system for ComfyUI.
 
 Provides a clean API for registering nodes and generating the mappings
 that ComfyUI expects.
+
+Nodes can be declared by name, display name and import location instead of
+registered as classes. A declared node's module is only imported when its
+class is first looked up, so importing the package stays cheap; the
+@register_node decorator in that module then binds the class to its
+declaration.
 """
 
+import importlib
+import threading
+from collections.abc import Iterator, Mapping
+from dataclasses import dataclass
 from typing import Any, TypeAlias
 
 from .base import BaseNode
 
 # ComfyUI expects these exact variable names
-NodeClassMappings: TypeAlias = dict[str, type[BaseNode]]
+NodeClassMappings: TypeAlias = Mapping[str, type[BaseNode]]
 NodeDisplayNameMappings: TypeAlias = dict[str, str]
 
 
+@dataclass(frozen=True)
+class NodeDeclaration:
+    """Where to find a node class without importing it."""
+
+    name: str
+    display_name: str
+    module: str
+    attribute: str
+
+
+class LazyNodeMapping(Mapping[str, type[BaseNode]]):
+    """
+    Read-only NODE_CLASS_MAPPINGS view that imports each node class on first access.
+
+    Iterating, len() and membership tests never import anything.
+    """
+
+    def __init__(self, registry: "NodeRegistry") -> None:
+        """Wrap a registry."""
+        self._registry = registry
+
+    def __getitem__(self, name: str) -> type[BaseNode]:
+        return self._registry.get_node_class(name)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._registry.get_display_name_mappings())
+
+    def __len__(self) -> int:
+        return len(self._registry.get_display_name_mappings())
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._registry.get_display_name_mappings()
+
+
 class NodeRegistry:
     """
     Registry for ComfyUI custom nodes.
@@ -23,8 +67,49 @@ class NodeRegistry:
 
     def __init__(self) -> None:
         """Initialize empty registry."""
-        self._class_mappings: NodeClassMappings = {}
+        self._class_mappings: dict[str, type[BaseNode]] = {}
         self._display_name_mappings: NodeDisplayNameMappings = {}
+        self._declarations: dict[str, NodeDeclaration] = {}
+        # Reentrant: importing a declared module runs its @register_node decorator
+        self._lock = threading.RLock()
+
+    def declare(self, declaration: NodeDeclaration) -> None:
+        """
+        Declare a node whose class is imported on first lookup.
+
+        Raises:
+            ValueError: If the name is already declared or registered.
+        """
+        with self._lock:
+            if declaration.name in self._display_name_mappings:
+                raise ValueError(f"Node '{declaration.name}' already registered")
+            self._declarations[declaration.name] = declaration
+            self._display_name_mappings[declaration.name] = declaration.display_name
+
+    def get_node_class(self, name: str) -> type[BaseNode]:
+        """
+        Return a node class, importing its module first if it was only declared.
+
+        Raises:
+            KeyError: If no node has this name.
+        """
+        node_class = self._class_mappings.get(name)
+        if node_class is not None:
+            return node_class
+
+        with self._lock:
+            if name not in self._class_mappings:
+                declaration = self._declarations[name]
+                module = importlib.import_module(declaration.module)
+                node_class = getattr(module, declaration.attribute)
+                if not (isinstance(node_class, type) and issubclass(node_class, BaseNode)):
+                    raise TypeError(f"{declaration.module}.{declaration.attribute} is not a BaseNode subclass")
+                self._class_mappings[name] = node_class
+            return self._class_mappings[name]
+
+    def is_loaded(self, name: str) -> bool:
+        """Return True if the node's class has been imported or was registered directly."""
+        return name in self._class_mappings
 
     def register(
         self,
@@ -61,11 +146,23 @@ class NodeRegistry:
             internal_name = name or cls.__name__
             ui_name = display_name or internal_name
 
-            if internal_name in self._class_mappings:
-                raise ValueError(f"Node '{internal_name}' already registered")
-
-            self._class_mappings[internal_name] = cls
-            self._display_name_mappings[internal_name] = ui_name
+            with self._lock:
+                if internal_name in self._class_mappings:
+                    raise ValueError(f"Node '{internal_name}' already registered")
+
+                declaration = self._declarations.get(internal_name)
+                if declaration is None:
+                    if internal_name in self._display_name_mappings:
+                        raise ValueError(f"Node '{internal_name}' already registered")
+                elif (cls.__module__, cls.__qualname__, ui_name) != (
+                    declaration.module,
+                    declaration.attribute,
+                    declaration.display_name,
+                ):
+                    raise ValueError(f"Node '{internal_name}' does not match its declaration")
+
+                self._class_mappings[internal_name] = cls
+                self._display_name_mappings[internal_name] = ui_name
             return cls
 
         # Called as @register (without parens)
@@ -77,12 +174,13 @@ class NodeRegistry:
 
     def get_class_mappings(self) -> NodeClassMappings:
         """
-        Get the NODE_CLASS_MAPPINGS dict for ComfyUI.
+        Get the NODE_CLASS_MAPPINGS mapping for ComfyUI.
 
         Returns:
-            Dictionary mapping node names to classes
+            Live, read-only mapping of node names to classes; declared classes
+            are imported when first looked up
         """
-        return self._class_mappings.copy()
+        return LazyNodeMapping(self)
 
     def get_display_name_mappings(self) -> NodeDisplayNameMappings:
         """
@@ -133,6 +231,24 @@ def register_node(
     return decorator
 
 
+def declare_node(name: str, display_name: str, module: str, attribute: str) -> None:
+    """
+    Declare a node with the global registry without importing it.
+
+    Args:
+        name: Internal node name
+        display_name: UI display name
+        module: Absolute module path of the node class
+        attribute: Class name within the module
+
+    Example:
+        declare_node(
+            "WDN_TextCombine", "Text Combine", "weirdion.nodes.utilities.text_combine", "TextCombineNode"
+        )
+    """
+    _global_registry.declare(NodeDeclaration(name, display_name, module, attribute))
+
+
 def get_node_mappings() -> tuple[NodeClassMappings, NodeDisplayNameMappings]:
     """
     Get the global node mappings for ComfyUI.
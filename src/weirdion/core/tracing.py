@@ -0,0 +1,256 @@
+"""
+Opt-in Chrome trace-event export of node execution.
+
+When tracing is enabled, node executions and the loading steps inside them
+(checkpoint read, config guess, LoRA resolve/load/patch, text encode) are
+recorded as complete ("X") trace events with the native id of the thread that
+ran them. Events are grouped by ComfyUI prompt id, and after each node
+finishes the prompt's trace is rewritten to <directory>/<prompt_id>.trace.json,
+which opens directly in Perfetto (ui.perfetto.dev) or chrome://tracing.
+
+Tracing is enabled with WEIRDION_TRACE_DIR=/path/to/traces, or at runtime with
+enable_tracing(). While disabled, trace_span() costs one flag check.
+"""
+
+from __future__ import annotations
+
+import contextvars
+import json
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any
+
+# Environment variable naming the directory trace files are written to
+TRACE_DIR_ENV = "WEIRDION_TRACE_DIR"
+
+# Prompts whose events are kept in memory; older ones are dropped (their files remain)
+MAX_BUFFERED_PROMPTS = 16
+
+# Prompt id used when no ComfyUI prompt is executing
+UNKNOWN_PROMPT_ID = "unknown"
+
+_enabled = False
+_directory: Path | None = None
+_traces: OrderedDict[str, list[dict[str, Any]]] = OrderedDict()
+_named_threads: dict[str, set[int]] = {}
+_trace_lock = threading.Lock()
+
+# True while inside a traced node, so nested node spans do not write the file again
+_in_node: contextvars.ContextVar[bool] = contextvars.ContextVar("weirdion_in_traced_node", default=False)
+
+
+def enable_tracing(directory: str | os.PathLike[str]) -> None:
+    """
+    Start recording trace events, writing one file per prompt to directory.
+
+    Args:
+        directory: Folder for <prompt_id>.trace.json files; created if missing
+    """
+    global _enabled, _directory
+    path = Path(directory)
+    path.mkdir(parents=True, exist_ok=True)
+    _directory = path
+    _enabled = True
+
+
+def disable_tracing() -> None:
+    """Stop recording trace events; buffered traces are kept until cleared."""
+    global _enabled
+    _enabled = False
+
+
+def is_tracing_enabled() -> bool:
+    """Return True if trace events are being recorded."""
+    return _enabled
+
+
+def clear_traces() -> None:
+    """Drop all buffered trace events."""
+    with _trace_lock:
+        _traces.clear()
+        _named_threads.clear()
+
+
+def get_trace(prompt_id: str) -> dict[str, Any] | None:
+    """Return the Chrome trace object buffered for a prompt id, or None if there is none."""
+    with _trace_lock:
+        events = _traces.get(prompt_id)
+        if events is None:
+            return None
+        return _trace_document(prompt_id, list(events))
+
+
+@contextmanager
+def trace_span(name: str, category: str = "weirdion", **args: Any) -> Iterator[dict[str, Any]]:
+    """
+    Record the enclosed block as one trace event.
+
+    Yields a dict that the block may add arguments to, such as a resolved file
+    name; they show up in the viewer's details pane.
+
+    Args:
+        name: Span name, e.g. "checkpoint.read"
+        category: Trace category, e.g. "checkpoint" or "lora"
+        **args: Initial span arguments
+    """
+    if not _enabled:
+        yield args
+        return
+
+    prompt_id = _current_prompt_id()
+    start = time.perf_counter_ns()
+    try:
+        yield args
+    except BaseException as exc:
+        args["error"] = repr(exc)
+        raise
+    finally:
+        end = time.perf_counter_ns()
+        _record(prompt_id, name, category, start, end, args)
+
+
+@contextmanager
+def node_span(node: str) -> Iterator[None]:
+    """
+    Trace one node execution and write its prompt's trace file afterwards.
+
+    Does nothing while tracing is disabled.
+    """
+    if not _enabled or _in_node.get():
+        yield
+        return
+
+    token = _in_node.set(True)
+    try:
+        with trace_span(node, "node", **_executing_node_args()):
+            yield
+    finally:
+        _in_node.reset(token)
+        write_trace(_current_prompt_id())
+
+
+def write_trace(prompt_id: str) -> Path | None:
+    """
+    Write a prompt's buffered events to <directory>/<prompt_id>.trace.json.
+
+    Returns:
+        The path written, or None if there is nothing to write.
+    """
+    directory = _directory
+    trace = get_trace(prompt_id)
+    if directory is None or trace is None:
+        return None
+
+    path = directory / f"{_safe_file_name(prompt_id)}.trace.json"
+    temp_path = path.with_suffix(".tmp")
+    try:
+        temp_path.write_text(json.dumps(trace), encoding="utf-8")
+        os.replace(temp_path, path)
+    except OSError as exc:
+        print(f"[weirdion] Warning: Failed to write trace '{path}': {exc}")
+        return None
+    return path
+
+
+def _record(prompt_id: str, name: str, category: str, start_ns: int, end_ns: int, args: dict[str, Any]) -> None:
+    pid = os.getpid()
+    tid = threading.get_native_id()
+    event = {
+        "name": name,
+        "cat": category,
+        "ph": "X",
+        "ts": start_ns / 1000,
+        "dur": (end_ns - start_ns) / 1000,
+        "pid": pid,
+        "tid": tid,
+        "args": {key: _json_safe(value) for key, value in args.items()},
+    }
+
+    with _trace_lock:
+        events = _traces.get(prompt_id)
+        if events is None:
+            events = _traces[prompt_id] = []
+            _named_threads[prompt_id] = set()
+            while len(_traces) > MAX_BUFFERED_PROMPTS:
+                dropped, _events = _traces.popitem(last=False)
+                _named_threads.pop(dropped, None)
+        else:
+            _traces.move_to_end(prompt_id)
+
+        named = _named_threads[prompt_id]
+        if tid not in named:
+            named.add(tid)
+            events.append(
+                {
+                    "name": "thread_name",
+                    "ph": "M",
+                    "pid": pid,
+                    "tid": tid,
+                    "args": {"name": threading.current_thread().name},
+                }
+            )
+        events.append(event)
+
+
+def _trace_document(prompt_id: str, events: list[dict[str, Any]]) -> dict[str, Any]:
+    return {
+        "traceEvents": events,
+        "displayTimeUnit": "ms",
+        "otherData": {"prompt_id": prompt_id},
+    }
+
+
+def _current_prompt_id() -> str:
+    context = _executing_context()
+    prompt_id = getattr(context, "prompt_id", None)
+    if prompt_id is None:
+        try:
+            from server import PromptServer
+
+            prompt_id = getattr(PromptServer.instance, "last_prompt_id", None)
+        except Exception:
+            prompt_id = None
+    return str(prompt_id) if prompt_id else UNKNOWN_PROMPT_ID
+
+
+def _executing_node_args() -> dict[str, Any]:
+    node_id = getattr(_executing_context(), "node_id", None)
+    return {} if node_id is None else {"node_id": node_id}
+
+
+def _executing_context() -> Any:
+    try:
+        from comfy_execution.utils import get_executing_context
+
+        return get_executing_context()
+    except Exception:
+        # Older ComfyUI, or no ComfyUI at all (e.g., during testing)
+        return None
+
+
+def _json_safe(value: Any) -> Any:
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    return str(value)
+
+
+def _safe_file_name(prompt_id: str) -> str:
+    return re.sub(r"[^A-Za-z0-9._-]", "_", prompt_id)
+
+
+def _configure_from_env() -> None:
+    directory = os.environ.get(TRACE_DIR_ENV, "").strip()
+    if directory:
+        try:
+            enable_tracing(directory)
+        except OSError as exc:
+            print(f"[weirdion] Warning: Tracing disabled, cannot use '{directory}': {exc}")
+
+
+_configure_from_env()
@@ -1,6 +1,6 @@
 """ComfyUI weirdion custom nodes."""
 
-# Import all node modules to trigger registration
+# Import the node packages to declare their nodes; node modules load on first use
 from . import loaders, prompting, utilities
 
 __all__ = ["loaders", "prompting", "utilities"]
@@ -1,13 +1,53 @@
-"""Loader nodes for models, checkpoints, and resources."""
+"""
+Loader nodes for models, checkpoints, and resources.
 
-from .load_checkpoint import LoadCheckpointNode
-from .load_checkpoint_with_clip_skip import LoadCheckpointWithClipSkipNode
-from .load_checkpoint_with_profiles import LoadCheckpointWithProfilesNode
-from .load_profile_input_parameters import LoadProfileInputParametersNode
+Nodes are declared here and their modules imported on first use, either by
+ComfyUI looking the class up or by importing it from this package.
+"""
 
-__all__ = [
+import importlib
+from typing import Any
+
+from ...core import declare_node
+
+# Exported class name -> defining module
+_EXPORTS = {
+    "LoadCheckpointNode": f"{__name__}.load_checkpoint",
+    "LoadCheckpointWithClipSkipNode": f"{__name__}.load_checkpoint_with_clip_skip",
+    "LoadCheckpointWithProfilesNode": f"{__name__}.load_checkpoint_with_profiles",
+    "LoadProfileInputParametersNode": f"{__name__}.load_profile_input_parameters",
+}
+
+declare_node(
+    "weirdion_LoadCheckpointWithOverrides",
+    "Load Checkpoint w/ Overrides (weirdion)",
+    _EXPORTS["LoadCheckpointNode"],
     "LoadCheckpointNode",
+)
+declare_node(
+    "weirdion_LoadCheckpointWithClipSkip",
+    "Load Checkpoint w/ Clip Skip (weirdion)",
+    _EXPORTS["LoadCheckpointWithClipSkipNode"],
     "LoadCheckpointWithClipSkipNode",
+)
+declare_node(
+    "weirdion_LoadCheckpointWithProfiles",
+    "Load Checkpoint w/ Profiles (weirdion)",
+    _EXPORTS["LoadCheckpointWithProfilesNode"],
     "LoadCheckpointWithProfilesNode",
+)
+declare_node(
+    "weirdion_LoadProfileInputParameters",
+    "Load Profile Input Parameters (weirdion)",
+    _EXPORTS["LoadProfileInputParametersNode"],
     "LoadProfileInputParametersNode",
-]
+)
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str) -> Any:
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(importlib.import_module(module), name)
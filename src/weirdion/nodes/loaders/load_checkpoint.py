@@ -4,10 +4,14 @@ Load Checkpoint node.
 Loads a checkpoint and allows optional CLIP/VAE overrides.
 """
 
+from functools import partial
 from typing import Any
 
 from ...core import LoaderNode, register_node
 from ...types import ComfyType, InputSpec, NodeOutput
+from ...utils.checkpoint_loader import load_checkpoint
+from ...utils.input_validation import checkpoint_error
+from ...utils.model_index import get_model_index, get_model_revision
 
 
 @register_node(name="weirdion_LoadCheckpointWithOverrides", display_name="Load Checkpoint w/ Overrides (weirdion)")
@@ -25,17 +29,12 @@ class LoadCheckpointNode(LoaderNode):
         "VAE (latent/pixel conversion)",
         "Checkpoint name",
     )
+    INPUT_SPEC_DEPENDENCIES = (partial(get_model_revision, "checkpoints"),)
 
     @classmethod
     def get_input_spec(cls) -> InputSpec:
         """Define inputs: checkpoint name and optional CLIP/VAE."""
-        try:
-            import folder_paths
-
-            ckpt_list = folder_paths.get_filename_list("checkpoints")
-            ckpt_choices = ["Select Checkpoint"] + ckpt_list
-        except Exception:
-            ckpt_choices = ["Select Checkpoint"]
+        ckpt_choices = ["Select Checkpoint", *get_model_index("checkpoints").names]
 
         return {
             "required": {
@@ -60,6 +59,13 @@ class LoadCheckpointNode(LoaderNode):
         """Name the outputs."""
         return ("model", "clip", "vae", "model_name")
 
+    @classmethod
+    def VALIDATE_INPUTS(cls, checkpoint: str | None = None) -> bool | str:  # noqa: N802
+        """Reject a missing checkpoint when the prompt is queued."""
+        if checkpoint is None:
+            return True
+        return checkpoint_error(checkpoint, "Select Checkpoint") or True
+
     def process(
         self,
         checkpoint: str,
@@ -67,21 +73,7 @@ class LoadCheckpointNode(LoaderNode):
         opt_vae: Any | None = None,
     ) -> NodeOutput:
         """Load checkpoint and apply optional overrides."""
-        try:
-            import comfy.sd
-            import folder_paths
-        except Exception as e:  # pragma: no cover - ComfyUI runtime only
-            raise RuntimeError("ComfyUI runtime dependencies not available") from e
-
-        ckpt_path = folder_paths.get_full_path("checkpoints", checkpoint)
-        outputs = comfy.sd.load_checkpoint_guess_config(
-            ckpt_path,
-            output_vae=True,
-            output_clip=True,
-            embedding_directory=folder_paths.get_folder_paths("embeddings"),
-        )
-
-        model, loaded_clip, loaded_vae = outputs[:3]
+        model, loaded_clip, loaded_vae = load_checkpoint(checkpoint)
 
         output_clip = opt_clip if opt_clip is not None else loaded_clip
         output_vae = opt_vae if opt_vae is not None else loaded_vae
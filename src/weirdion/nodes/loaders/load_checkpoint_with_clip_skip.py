@@ -4,11 +4,14 @@ Load Checkpoint with CLIP skip.
 Loads a checkpoint, applies CLIP skip, and allows optional CLIP/VAE overrides.
 """
 
+from functools import partial
 from typing import Any
 
 from ...core import LoaderNode, register_node
 from ...types import ComfyType, InputSpec, NodeOutput
 from ...utils.checkpoint_loader import load_checkpoint_with_clip_skip
+from ...utils.input_validation import checkpoint_error
+from ...utils.model_index import get_model_index, get_model_revision
 
 
 @register_node(
@@ -30,17 +33,12 @@ class LoadCheckpointWithClipSkipNode(LoaderNode):
         "Checkpoint name",
         "Clip skip value (string)",
     )
+    INPUT_SPEC_DEPENDENCIES = (partial(get_model_revision, "checkpoints"),)
 
     @classmethod
     def get_input_spec(cls) -> InputSpec:
         """Define inputs: checkpoint name, clip skip, and optional CLIP/VAE."""
-        try:
-            import folder_paths
-
-            ckpt_list = folder_paths.get_filename_list("checkpoints")
-            ckpt_choices = ["Select Checkpoint"] + ckpt_list
-        except Exception:
-            ckpt_choices = ["Select Checkpoint"]
+        ckpt_choices = ["Select Checkpoint", *get_model_index("checkpoints").names]
 
         return {
             "required": {
@@ -75,6 +73,13 @@ class LoadCheckpointWithClipSkipNode(LoaderNode):
         """Name the outputs."""
         return ("model", "clip", "vae", "model_name", "clip_skip_value")
 
+    @classmethod
+    def VALIDATE_INPUTS(cls, checkpoint: str | None = None) -> bool | str:  # noqa: N802
+        """Reject a missing checkpoint when the prompt is queued."""
+        if checkpoint is None:
+            return True
+        return checkpoint_error(checkpoint, "Select Checkpoint") or True
+
     def process(
         self,
         checkpoint: str,
@@ -4,12 +4,17 @@ Load Checkpoint with Profiles node.
 Loads a checkpoint, applies CLIP skip, and outputs profile-driven parameters.
 """
 
+from collections.abc import Mapping
+from functools import partial
 from typing import Any
 
 from ...core import LoaderNode, register_node
 from ...types import ComfyReturnType, InputSpec, NodeOutput
 from ...utils.checkpoint_loader import load_checkpoint_with_clip_skip
-from ...utils.profile_store import DEFAULT_PROFILE_NAME, load_default_profile, load_user_profiles, resolve_profile
+from ...utils.input_validation import checkpoint_error, profile_error
+from ...utils.model_index import get_model_index, get_model_revision
+from ...utils.profile_store import DEFAULT_PROFILE_NAME, get_profile_snapshot, get_store_revision, resolve_profile
+from ...utils.samplers import get_sampler_scheduler_key, get_sampler_scheduler_types
 
 
 @register_node(
@@ -36,21 +41,21 @@ class LoadCheckpointWithProfilesNode(LoaderNode):
         "Clip skip",
         "Denoise",
     )
+    INPUT_SPEC_DEPENDENCIES = (
+        partial(get_model_revision, "checkpoints"),
+        get_store_revision,
+        get_sampler_scheduler_key,
+    )
+    RETURN_TYPES_DEPENDENCIES = (get_sampler_scheduler_key,)
 
     @classmethod
     def get_input_spec(cls) -> InputSpec:
         """Define inputs: checkpoint, profile, parameters, and optional overrides."""
         profiles = cls._get_profile_names()
-        sampler_types, scheduler_types = cls._get_sampler_scheduler_types()
+        sampler_types, scheduler_types = get_sampler_scheduler_types()
         default_profile = cls._get_default_profile()
 
-        try:
-            import folder_paths
-
-            ckpt_list = folder_paths.get_filename_list("checkpoints")
-            ckpt_choices = [cls.CHECKPOINT_PLACEHOLDER] + ckpt_list
-        except Exception:
-            ckpt_choices = [cls.CHECKPOINT_PLACEHOLDER]
+        ckpt_choices = [cls.CHECKPOINT_PLACEHOLDER, *get_model_index("checkpoints").names]
 
         return {
             "required": {
@@ -120,7 +125,7 @@ class LoadCheckpointWithProfilesNode(LoaderNode):
     @classmethod
     def get_return_types(cls) -> tuple[ComfyReturnType, ...]:
         """Returns checkpoint outputs plus generation parameters."""
-        sampler_types, scheduler_types = cls._get_sampler_scheduler_types()
+        sampler_types, scheduler_types = get_sampler_scheduler_types()
         return (
             "MODEL",
             "CLIP",
@@ -154,6 +159,23 @@ class LoadCheckpointWithProfilesNode(LoaderNode):
             "denoise",
         )
 
+    @classmethod
+    def VALIDATE_INPUTS(cls, checkpoint: str | None = None, profile: str | None = None) -> bool | str:  # noqa: N802
+        """Reject a missing checkpoint or an unknown profile when the prompt is queued."""
+        if checkpoint is not None:
+            error = checkpoint_error(checkpoint, cls.CHECKPOINT_PLACEHOLDER)
+            if error:
+                return error
+        if profile is not None:
+            error = profile_error(
+                cls._normalize_profile_name(profile),
+                checkpoint_name=checkpoint,
+                allow_checkpoint_default=True,
+            )
+            if error:
+                return error
+        return True
+
     def process(
         self,
         checkpoint: str,
@@ -203,26 +225,16 @@ class LoadCheckpointWithProfilesNode(LoaderNode):
     @staticmethod
     def _get_profile_names() -> list[str]:
         try:
-            user_data = load_user_profiles()
-            names = list(user_data["profiles"].keys())
+            names = list(get_profile_snapshot().profiles.keys())
         except Exception:
             names = []
 
         return [DEFAULT_PROFILE_NAME] + sorted(names)
 
     @staticmethod
-    def _get_sampler_scheduler_types() -> tuple[list[str], list[str]]:
-        try:
-            import comfy.samplers
-
-            return (comfy.samplers.KSampler.SAMPLERS, comfy.samplers.KSampler.SCHEDULERS)
-        except Exception:
-            return (["euler_ancestral"], ["karras"])
-
-    @staticmethod
-    def _get_default_profile() -> dict[str, Any]:
+    def _get_default_profile() -> Mapping[str, Any]:
         try:
-            return load_default_profile()
+            return get_profile_snapshot().default_profile
         except Exception:
             return {
                 "steps": 30,
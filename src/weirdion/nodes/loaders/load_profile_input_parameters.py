@@ -4,11 +4,14 @@ Load Profile Input Parameters node.
 Loads generation parameters from a named profile, keyed by checkpoint.
 """
 
+from collections.abc import Mapping
 from typing import Any
 
 from ...core import LoaderNode, register_node
 from ...types import ComfyReturnType, InputSpec, NodeOutput
-from ...utils.profile_store import DEFAULT_PROFILE_NAME, load_default_profile, load_user_profiles, resolve_profile
+from ...utils.input_validation import profile_error
+from ...utils.profile_store import DEFAULT_PROFILE_NAME, get_profile_snapshot, get_store_revision, resolve_profile
+from ...utils.samplers import get_sampler_scheduler_key, get_sampler_scheduler_types
 
 
 @register_node(
@@ -30,12 +33,14 @@ class LoadProfileInputParametersNode(LoaderNode):
         "Clip skip",
         "Denoise",
     )
+    INPUT_SPEC_DEPENDENCIES = (get_store_revision, get_sampler_scheduler_key)
+    RETURN_TYPES_DEPENDENCIES = (get_sampler_scheduler_key,)
 
     @classmethod
     def get_input_spec(cls) -> InputSpec:
         """Define inputs: checkpoint name and profile selection."""
         profiles = cls._get_profile_names()
-        sampler_types, scheduler_types = cls._get_sampler_scheduler_types()
+        sampler_types, scheduler_types = get_sampler_scheduler_types()
         default_profile = cls._get_default_profile()
 
         return {
@@ -98,7 +103,7 @@ class LoadProfileInputParametersNode(LoaderNode):
     @classmethod
     def get_return_types(cls) -> tuple[ComfyReturnType, ...]:
         """Returns generation parameters."""
-        sampler_types, scheduler_types = cls._get_sampler_scheduler_types()
+        sampler_types, scheduler_types = get_sampler_scheduler_types()
         return (
             "INT",
             "FLOAT",
@@ -124,6 +129,13 @@ class LoadProfileInputParametersNode(LoaderNode):
             "denoise",
         )
 
+    @classmethod
+    def VALIDATE_INPUTS(cls, profile: str | None = None) -> bool | str:  # noqa: N802
+        """Reject an unknown profile when the prompt is queued."""
+        if profile is None:
+            return True
+        return profile_error(cls._normalize_profile_name(profile), allow_checkpoint_default=False) or True
+
     def process(
         self,
         profile: str,
@@ -152,26 +164,16 @@ class LoadProfileInputParametersNode(LoaderNode):
     @staticmethod
     def _get_profile_names() -> list[str]:
         try:
-            user_data = load_user_profiles()
-            names = list(user_data["profiles"].keys())
+            names = list(get_profile_snapshot().profiles.keys())
         except Exception:
             names = []
 
         return [DEFAULT_PROFILE_NAME] + sorted(names)
 
     @staticmethod
-    def _get_sampler_scheduler_types() -> tuple[list[str], list[str]]:
-        try:
-            import comfy.samplers
-
-            return (comfy.samplers.KSampler.SAMPLERS, comfy.samplers.KSampler.SCHEDULERS)
-        except Exception:
-            return (["euler_ancestral"], ["karras"])
-
-    @staticmethod
-    def _get_default_profile() -> dict[str, Any]:
+    def _get_default_profile() -> Mapping[str, Any]:
         try:
-            return load_default_profile()
+            return get_profile_snapshot().default_profile
         except Exception:
             return {
                 "steps": 30,
@@ -1,6 +1,39 @@
-"""Prompting nodes for text encoding and prompt management."""
+"""
+Prompting nodes for text encoding and prompt management.
 
-from .prompt_with_embedding import PromptWithEmbeddingNode
-from .prompt_with_lora import PromptWithLoraNode
+Nodes are declared here and their modules imported on first use, either by
+ComfyUI looking the class up or by importing it from this package.
+"""
 
-__all__ = ["PromptWithEmbeddingNode", "PromptWithLoraNode"]
+import importlib
+from typing import Any
+
+from ...core import declare_node
+
+# Exported class name -> defining module
+_EXPORTS = {
+    "PromptWithEmbeddingNode": f"{__name__}.prompt_with_embedding",
+    "PromptWithLoraNode": f"{__name__}.prompt_with_lora",
+}
+
+declare_node(
+    "weirdion_PromptWithEmbedding",
+    "Prompt w/ Embedding (weirdion)",
+    _EXPORTS["PromptWithEmbeddingNode"],
+    "PromptWithEmbeddingNode",
+)
+declare_node(
+    "weirdion_PromptWithLora",
+    "Prompt w/ LoRA (weirdion)",
+    _EXPORTS["PromptWithLoraNode"],
+    "PromptWithLoraNode",
+)
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str) -> Any:
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(importlib.import_module(module), name)
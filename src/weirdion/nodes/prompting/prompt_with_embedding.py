@@ -4,10 +4,13 @@ Prompt with Embedding node.
 Simplified prompt node that handles embedding insertion and optional text encoding.
 """
 
+from functools import partial
 from typing import Any
 
 from ...core import PromptingNode, register_node
+from ...core.tracing import trace_span
 from ...types import ComfyType, InputSpec, NodeOutput
+from ...utils.model_index import get_model_index, get_model_revision
 
 
 @register_node(
@@ -29,18 +32,13 @@ class PromptWithEmbeddingNode(PromptingNode):
         "CONDITIONING (if clip input provided)",
         "Prompt text",
     )
+    INPUT_SPEC_DEPENDENCIES = (partial(get_model_revision, "embeddings"),)
 
     @classmethod
     def get_input_spec(cls) -> InputSpec:
         """Define inputs: prompt text, embedding dropdown, and optional CLIP."""
-        try:
-            import folder_paths
-
-            embedding_list = folder_paths.get_filename_list("embeddings")
-            embedding_choices = ["Insert Embedding"] + [name.rsplit(".", 1)[0] for name in embedding_list]
-        except Exception:
-            # Fallback if ComfyUI imports fail (e.g., during testing)
-            embedding_choices = ["Insert Embedding"]
+        embedding_list = get_model_index("embeddings").names
+        embedding_choices = ["Insert Embedding"] + [name.rsplit(".", 1)[0] for name in embedding_list]
 
         return {
             "required": {
@@ -89,7 +87,8 @@ class PromptWithEmbeddingNode(PromptingNode):
             try:
                 from nodes import CLIPTextEncode
 
-                conditioning = CLIPTextEncode().encode(opt_clip, prompt)[0]
+                with trace_span("text.encode", "conditioning", characters=len(prompt)):
+                    conditioning = CLIPTextEncode().encode(opt_clip, prompt)[0]
             except Exception as e:
                 print(f"[weirdion_PromptWithEmbedding] Warning: Failed to encode prompt: {e}")
 
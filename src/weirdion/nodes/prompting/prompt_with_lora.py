@@ -4,12 +4,16 @@ Prompt with LoRA node.
 Clean, opinionated prompt node that handles LoRA insertion and loading.
 """
 
-from pathlib import Path
+from functools import partial
 from typing import Any
 
 from ...core import PromptingNode, register_node
+from ...core.tracing import trace_span
 from ...types import ComfyType, InputSpec, NodeOutput
 from ...utils import parse_lora_tags, strip_lora_tags
+from ...utils.input_validation import lora_tags_error
+from ...utils.lora_loader import apply_lora, resolve_lora_name
+from ...utils.model_index import get_model_index, get_model_revision
 
 
 @register_node(name="weirdion_PromptWithLora", display_name="Prompt w/ LoRA (weirdion)")
@@ -37,23 +41,15 @@ class PromptWithLoraNode(PromptingNode):
         "CONDITIONING (if clip input provided)",
         "Prompt text (LoRA tags preserved)",
     )
+    INPUT_SPEC_DEPENDENCIES = (partial(get_model_revision, "loras"), partial(get_model_revision, "embeddings"))
 
     @classmethod
     def get_input_spec(cls) -> InputSpec:
         """Define inputs: prompt, LoRA/embedding dropdowns, and optional MODEL/CLIP."""
-        # Import here to avoid circular dependencies
-        try:
-            import folder_paths
-
-            lora_list = folder_paths.get_filename_list("loras")
-            # Strip extensions for cleaner display
-            lora_choices = ["Insert LoRA"] + [name.rsplit(".", 1)[0] for name in lora_list]
-            embedding_list = folder_paths.get_filename_list("embeddings")
-            embedding_choices = ["Insert Embedding"] + [name.rsplit(".", 1)[0] for name in embedding_list]
-        except Exception:
-            # Fallback if ComfyUI imports fail (e.g., during testing)
-            lora_choices = ["Insert LoRA"]
-            embedding_choices = ["Insert Embedding"]
+        # Strip extensions for cleaner display
+        lora_choices = ["Insert LoRA"] + [name.rsplit(".", 1)[0] for name in get_model_index("loras").names]
+        embedding_list = get_model_index("embeddings").names
+        embedding_choices = ["Insert Embedding"] + [name.rsplit(".", 1)[0] for name in embedding_list]
 
         return {
             "required": {
@@ -90,6 +86,20 @@ class PromptWithLoraNode(PromptingNode):
         """Name the outputs."""
         return ("model", "clip", "conditioning", "prompt_text")
 
+    @classmethod
+    def VALIDATE_INPUTS(  # noqa: N802
+        cls, prompt: str | None = None, input_types: dict[str, Any] | None = None
+    ) -> bool | str:
+        """
+        Reject LoRA tags that match no LoRA file when the prompt is queued.
+
+        Tags are only loaded when both MODEL and CLIP are connected, so only
+        then are they checked; otherwise they are just text.
+        """
+        if prompt is None or not input_types or "opt_model" not in input_types or "opt_clip" not in input_types:
+            return True
+        return lora_tags_error(prompt) or True
+
     def process(
         self,
         prompt: str,
@@ -121,14 +131,10 @@ class PromptWithLoraNode(PromptingNode):
         if opt_model is not None and opt_clip is not None and lora_tags:
             for lora_tag in lora_tags:
                 try:
-                    # Import LoraLoader from ComfyUI
-                    from nodes import LoraLoader
-
                     lora_name = self._resolve_lora_name(lora_tag.name)
 
                     # Load LoRA into model and clip
-                    # LoraLoader.load_lora returns (model, clip)
-                    opt_model, opt_clip = LoraLoader().load_lora(
+                    opt_model, opt_clip = apply_lora(
                         opt_model, opt_clip, lora_name, lora_tag.strength, lora_tag.strength
                     )
                 except Exception as e:
@@ -145,7 +151,8 @@ class PromptWithLoraNode(PromptingNode):
                 clean_prompt = strip_lora_tags(prompt)
 
                 # Encode (CLIPTextEncode returns tuple with conditioning as first element)
-                conditioning = CLIPTextEncode().encode(opt_clip, clean_prompt)[0]
+                with trace_span("text.encode", "conditioning", characters=len(clean_prompt)):
+                    conditioning = CLIPTextEncode().encode(opt_clip, clean_prompt)[0]
             except Exception as e:
                 print(f"[weirdion_PromptWithLora] Warning: Failed to encode prompt: {e}")
 
@@ -156,28 +163,4 @@ class PromptWithLoraNode(PromptingNode):
     @staticmethod
     def _resolve_lora_name(name: str) -> str:
         """Resolve a LoRA tag name to a file name if possible."""
-        try:
-            import folder_paths
-
-            lora_files = folder_paths.get_filename_list("loras")
-        except Exception:
-            return name
-
-        if name in lora_files:
-            return name
-
-        lowered = name.lower()
-        for candidate in lora_files:
-            candidate_lower = candidate.lower()
-            if candidate_lower == lowered:
-                return candidate
-
-            candidate_no_ext = Path(candidate).with_suffix("").as_posix().lower()
-            if candidate_no_ext == lowered:
-                return candidate
-
-        for candidate in lora_files:
-            if Path(candidate).stem.lower() == lowered:
-                return candidate
-
-        return name
+        return resolve_lora_name(name)
@@ -1,5 +1,15 @@
 """Server routes for ComfyUI weirdion."""
 
+from .cache_routes import register_cache_routes
+from .model_routes import register_model_routes
 from .profile_routes import register_profile_routes
+from .stats_routes import register_stats_routes
+from .warmup_routes import register_warmup_routes
 
-__all__ = ["register_profile_routes"]
+__all__ = [
+    "register_cache_routes",
+    "register_model_routes",
+    "register_profile_routes",
+    "register_stats_routes",
+    "register_warmup_routes",
+]
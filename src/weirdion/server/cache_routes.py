@@ -0,0 +1,137 @@
+"""
+Cache administration API routes.
+
+GET /weirdion/cache reports the shared resource budget and every resident
+entry of every budgeted cache (size, age, hits, pin state), plus the host-wide
+shared tier's entries and references when it is enabled, the safetensors
+conversions of pickle checkpoints, and how many bytes recent checkpoint loads
+mapped versus copied. The other routes
+free or protect memory without restarting ComfyUI:
+
+    DELETE /weirdion/cache                          flush every cache
+    GET    /weirdion/cache/{cache}                  one cache's totals and entries
+    DELETE /weirdion/cache/{cache}                  flush one cache
+    PUT    /weirdion/cache/{cache}/pins/{key}       pin a key, resident or not
+    DELETE /weirdion/cache/{cache}/pins/{key}       unpin a key
+    DELETE /weirdion/cache/{cache}/entries/{key}    evict one entry
+
+Flushes spare pinned entries unless ?include_pinned=true is given.
+"""
+
+from typing import Any
+
+# Imported for their side effect of registering the checkpoint and LoRA caches
+from ..utils import checkpoint_loader, lora_loader  # noqa: F401
+from ..utils.ckpt_conversion import get_conversion_cache
+from ..utils.resource_budget import BudgetedCache, get_resource_budget
+from ..utils.shared_tier import get_shared_tier
+from .route_utils import run_blocking, timed
+
+
+def register_cache_routes() -> None:
+    """Register cache administration routes with the ComfyUI server."""
+    try:
+        from aiohttp import web
+        from server import PromptServer
+    except ModuleNotFoundError:
+        return
+
+    if not hasattr(PromptServer, "instance"):
+        return
+
+    routes = PromptServer.instance.routes
+
+    @routes.get("/weirdion/cache")
+    @timed
+    async def get_caches(request: "web.Request") -> web.Response:
+        return web.json_response(await run_blocking(_describe_budget))
+
+    @routes.delete("/weirdion/cache")
+    @timed
+    async def flush_caches(request: "web.Request") -> web.Response:
+        include_pinned = _parse_bool(request.query.get("include_pinned"))
+        caches = list(get_resource_budget().caches().values())
+        removed = await run_blocking(_flush, caches, include_pinned)
+        return web.json_response({"status": "ok", "removed": removed})
+
+    @routes.get("/weirdion/cache/{cache}")
+    @timed
+    async def get_cache(request: "web.Request") -> web.Response:
+        cache = _find_cache(request.match_info["cache"])
+        if cache is None:
+            return _cache_not_found(request.match_info["cache"])
+        return web.json_response(await run_blocking(_describe_cache, cache))
+
+    @routes.delete("/weirdion/cache/{cache}")
+    @timed
+    async def flush_cache(request: "web.Request") -> web.Response:
+        cache = _find_cache(request.match_info["cache"])
+        if cache is None:
+            return _cache_not_found(request.match_info["cache"])
+        include_pinned = _parse_bool(request.query.get("include_pinned"))
+        removed = await run_blocking(_flush, [cache], include_pinned)
+        return web.json_response({"status": "ok", "removed": removed})
+
+    @routes.put("/weirdion/cache/{cache}/pins/{key:.+}")
+    @timed
+    async def pin_entry(request: "web.Request") -> web.Response:
+        return await _set_pin(request, pinned=True)
+
+    @routes.delete("/weirdion/cache/{cache}/pins/{key:.+}")
+    @timed
+    async def unpin_entry(request: "web.Request") -> web.Response:
+        return await _set_pin(request, pinned=False)
+
+    @routes.delete("/weirdion/cache/{cache}/entries/{key:.+}")
+    @timed
+    async def evict_entry(request: "web.Request") -> web.Response:
+        cache = _find_cache(request.match_info["cache"])
+        if cache is None:
+            return _cache_not_found(request.match_info["cache"])
+        key = request.match_info["key"]
+        if not await run_blocking(cache.evict, key):
+            return web.json_response({"error": f"Not cached: '{key}'"}, status=404)
+        return web.json_response({"status": "ok", "cache": cache.name, "key": key})
+
+    async def _set_pin(request: "web.Request", *, pinned: bool) -> web.Response:
+        cache = _find_cache(request.match_info["cache"])
+        if cache is None:
+            return _cache_not_found(request.match_info["cache"])
+        key = request.match_info["key"]
+        resident = cache.pin(key, pinned)
+        return web.json_response(
+            {"status": "ok", "cache": cache.name, "key": key, "pinned": pinned, "resident": resident}
+        )
+
+    def _cache_not_found(name: str) -> web.Response:
+        return web.json_response({"error": f"Unknown cache: '{name}'"}, status=404)
+
+
+def _find_cache(name: str) -> BudgetedCache | None:
+    return get_resource_budget().caches().get(name)
+
+
+def _describe_budget() -> dict[str, Any]:
+    budget = get_resource_budget()
+    payload = budget.stats()
+    payload["caches"] = [_describe_cache(cache) for cache in budget.caches().values()]
+    tier = get_shared_tier()
+    payload["shared_tier"] = None if tier is None else {**tier.stats(), "items": tier.entries()}
+    conversions = get_conversion_cache()
+    payload["conversions"] = None if conversions is None else {**conversions.stats(), "items": conversions.entries()}
+    payload["recent_loads"] = checkpoint_loader.get_load_reports()
+    return payload
+
+
+def _describe_cache(cache: BudgetedCache) -> dict[str, Any]:
+    payload = cache.stats()
+    payload["items"] = cache.entries()
+    return payload
+
+
+def _flush(caches: list[BudgetedCache], include_pinned: bool) -> dict[str, int]:
+    return {cache.name: cache.clear(include_pinned=include_pinned) for cache in caches}
+
+
+def _parse_bool(value: str | None) -> bool:
+    return value is not None and value.lower() in ("1", "true", "yes", "on")
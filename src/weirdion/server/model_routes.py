@@ -0,0 +1,70 @@
+"""
+Model listing API routes.
+
+GET /weirdion/models/{kind}?q=&offset=&limit= searches one model folder
+through its cached ModelIndex and returns a page of file names, so clients
+can fetch candidates on demand instead of receiving every file up front.
+"""
+
+from typing import Any
+
+from ..utils.model_index import get_model_index
+from .route_utils import run_blocking, timed
+
+# Page size when the request does not give one, and the largest page served
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+
+def register_model_routes() -> None:
+    """Register model listing routes with the ComfyUI server."""
+    try:
+        from aiohttp import web
+        from server import PromptServer
+    except ModuleNotFoundError:
+        return
+
+    if not hasattr(PromptServer, "instance"):
+        return
+
+    routes = PromptServer.instance.routes
+
+    @routes.get("/weirdion/models/{kind}")
+    @timed
+    async def list_models(request: "web.Request") -> web.Response:
+        try:
+            query = request.query.get("q", "")
+            offset = _parse_int(request.query.get("offset"), "offset", 0, minimum=0)
+            limit = _parse_int(request.query.get("limit"), "limit", DEFAULT_PAGE_SIZE, minimum=1)
+            limit = min(limit, MAX_PAGE_SIZE)
+            kind = request.match_info["kind"]
+            payload = await run_blocking(_search_models, kind, query, offset, limit)
+            return web.json_response(payload)
+        except Exception as exc:
+            return web.json_response({"error": str(exc)}, status=400)
+
+
+def _search_models(kind: str, query: str, offset: int, limit: int) -> dict[str, Any]:
+    index = get_model_index(kind)
+    total, items = index.search(query, offset=offset, limit=limit)
+    return {
+        "kind": kind,
+        "query": query,
+        "total": total,
+        "offset": offset,
+        "limit": limit,
+        "items": items,
+        "revision": index.revision,
+    }
+
+
+def _parse_int(value: str | None, name: str, default: int, *, minimum: int) -> int:
+    if value is None or value == "":
+        return default
+    try:
+        number = int(value)
+    except ValueError:
+        raise ValueError(f"'{name}' must be an integer") from None
+    if number < minimum:
+        raise ValueError(f"'{name}' must be at least {minimum}")
+    return number
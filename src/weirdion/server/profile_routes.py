@@ -1,10 +1,62 @@
-"""Profile manager API routes."""
+"""
+Profile manager API routes.
+
+Handlers never block the event loop: file and database I/O, JSON parsing,
+validation and the checkpoint listing run on the shared route thread pool.
+Identical GETs that arrive while one is being computed share its result.
+
+/weirdion/profiles/export and /weirdion/profiles/import move whole profile
+libraries as newline-delimited JSON, one record per line:
+
+    {"type": "header", "format": "weirdion-profiles", "version": 1, "revision": 12}
+    {"type": "profile", "name": "Fast", "profile": {...}}
+    {"type": "checkpoint_default", "checkpoint": "model.safetensors", "profile": "Fast"}
+
+Both directions are streamed in batches, so memory use does not grow with the
+size of the library. Imports create or replace the listed entries and keep the
+rest; a checkpoint default must come after the profile it points to.
+"""
+
+import asyncio
+import json
+import secrets
+from collections.abc import Callable, Iterator
+from typing import Any
 
 from ..utils.profile_store import (
-    load_default_profile,
-    load_user_profiles,
+    ProfileChange,
+    ProfileSnapshot,
+    add_profile_listener,
+    delete_checkpoint_default,
+    delete_profile,
+    get_profile_snapshot,
+    get_store_revision,
+    patch_profile,
     save_user_profiles,
+    set_checkpoint_default,
+    update_profiles,
 )
+from .route_utils import run_blocking, timed
+
+# Distinguishes ETags across server restarts, since store revisions restart at 1
+_ETAG_EPOCH = secrets.token_hex(4)
+
+# Websocket event pushed to every client after the profile store changes
+PROFILES_CHANGED_EVENT = "weirdion.profiles.changed"
+
+# Changes to more profiles than this are pushed without their contents; clients refetch instead
+MAX_DELTA_PROFILES = 100
+
+# NDJSON export/import format identifier and version, written in the header record
+EXPORT_FORMAT = "weirdion-profiles"
+EXPORT_VERSION = 1
+
+# Records encoded per export chunk and committed per import transaction
+EXPORT_BATCH_SIZE = 500
+IMPORT_BATCH_SIZE = 500
+
+# In-flight GET computations keyed by their ?checkpoint= filter (None for the full payload)
+_inflight_gets: dict[str | None, "asyncio.Future[tuple[str, str]]"] = {}
 
 
 def register_profile_routes() -> None:
@@ -19,39 +71,309 @@ def register_profile_routes() -> None:
         return
 
     routes = PromptServer.instance.routes
+    add_profile_listener(_push_profile_change)
 
     @routes.get("/weirdion/profiles")
+    @timed
     async def get_profiles(request: "web.Request") -> web.Response:
         try:
-            default_profile = load_default_profile()
-            user_data = load_user_profiles()
-            checkpoints = _get_checkpoints()
-            payload = {
-                "default_profile": default_profile,
-                "profiles": user_data["profiles"],
-                "checkpoint_defaults": user_data["checkpoint_defaults"],
-                "checkpoints": checkpoints,
-            }
-            return web.json_response(payload)
+            etag, body = await _coalesced_get(request.query.get("checkpoint"))
+            if_none_match = _parse_if_none_match(request.headers.get("If-None-Match"))
+            if etag in if_none_match or "*" in if_none_match:
+                return web.Response(status=304, headers={"ETag": etag})
+            return web.Response(text=body, content_type="application/json", headers={"ETag": etag})
         except Exception as exc:
             return web.json_response({"error": str(exc)}, status=400)
 
     @routes.post("/weirdion/profiles")
+    @timed
     async def save_profiles(request: "web.Request") -> web.Response:
         try:
-            data = await request.json()
-            if not isinstance(data, dict):
-                raise ValueError("payload must be a JSON object")
+            await run_blocking(_save_profiles, await request.read())
+            return web.json_response({"status": "ok"})
+        except Exception as exc:
+            return web.json_response({"error": str(exc)}, status=400)
+        finally:
+            _inflight_gets.clear()
+
+    # Registered before /weirdion/profiles/{name} so these paths are never read as profile names
+    @routes.get("/weirdion/profiles/export")
+    @timed
+    async def export_profiles(request: "web.Request") -> web.StreamResponse:
+        try:
+            snapshot = await run_blocking(get_profile_snapshot)
+        except Exception as exc:
+            return web.json_response({"error": str(exc)}, status=400)
+        response = web.StreamResponse(headers={"Content-Disposition": 'attachment; filename="profiles.ndjson"'})
+        response.content_type = "application/x-ndjson"
+        response.enable_chunked_encoding()
+        await response.prepare(request)
+
+        header = {"type": "header", "format": EXPORT_FORMAT, "version": EXPORT_VERSION, "revision": snapshot.revision}
+        await response.write(_encode_records([header]))
+        for batch in _batched(sorted(snapshot.profiles), EXPORT_BATCH_SIZE):
+            await response.write(await run_blocking(_encode_profile_records, snapshot, batch))
+        for batch in _batched(sorted(snapshot.checkpoint_defaults), EXPORT_BATCH_SIZE):
+            await response.write(_encode_default_records(snapshot, batch))
+        await response.write_eof()
+        return response
+
+    @routes.post("/weirdion/profiles/import")
+    @timed
+    async def import_profiles(request: "web.Request") -> web.Response:
+        importer = _ProfileImporter()
+        try:
+            batch: list[tuple[int, bytes]] = []
+            line_number = 0
+            async for line in request.content:
+                line_number += 1
+                if line.strip():
+                    batch.append((line_number, line))
+                if len(batch) >= IMPORT_BATCH_SIZE:
+                    await run_blocking(importer.import_batch, batch)
+                    batch = []
+            if batch:
+                await run_blocking(importer.import_batch, batch)
+            return web.json_response({"status": "ok", **importer.summary()})
+        except Exception as exc:
+            return web.json_response({"error": str(exc), **importer.summary()}, status=400)
+        finally:
+            _inflight_gets.clear()
 
-            save_user_profiles(
-                {
-                    "profiles": data.get("profiles", {}),
-                    "checkpoint_defaults": data.get("checkpoint_defaults", {}),
-                }
+    @routes.patch("/weirdion/profiles/{name}")
+    @timed
+    async def patch_profile_route(request: "web.Request") -> web.Response:
+        try:
+            name = request.match_info["name"]
+            profile, revision = await run_blocking(_patch_profile, name, await request.read())
+            return web.json_response({"status": "ok", "name": name, "profile": profile, "revision": revision})
+        except Exception as exc:
+            return web.json_response({"error": str(exc)}, status=400)
+        finally:
+            _inflight_gets.clear()
+
+    @routes.delete("/weirdion/profiles/{name}")
+    @timed
+    async def delete_profile_route(request: "web.Request") -> web.Response:
+        try:
+            name = request.match_info["name"]
+            deleted, revision = await run_blocking(_mutate, delete_profile, name)
+            if not deleted:
+                return web.json_response({"error": f"Profile not found: '{name}'"}, status=404)
+            return web.json_response({"status": "ok", "name": name, "revision": revision})
+        except Exception as exc:
+            return web.json_response({"error": str(exc)}, status=400)
+        finally:
+            _inflight_gets.clear()
+
+    @routes.patch("/weirdion/checkpoint-defaults/{checkpoint}")
+    @timed
+    async def patch_checkpoint_default_route(request: "web.Request") -> web.Response:
+        try:
+            checkpoint = request.match_info["checkpoint"]
+            profile_name, revision = await run_blocking(_set_checkpoint_default, checkpoint, await request.read())
+            return web.json_response(
+                {"status": "ok", "checkpoint": checkpoint, "profile": profile_name, "revision": revision}
             )
-            return web.json_response({"status": "ok"})
         except Exception as exc:
             return web.json_response({"error": str(exc)}, status=400)
+        finally:
+            _inflight_gets.clear()
+
+    @routes.delete("/weirdion/checkpoint-defaults/{checkpoint}")
+    @timed
+    async def delete_checkpoint_default_route(request: "web.Request") -> web.Response:
+        try:
+            checkpoint = request.match_info["checkpoint"]
+            deleted, revision = await run_blocking(_mutate, delete_checkpoint_default, checkpoint)
+            if not deleted:
+                return web.json_response({"error": f"No default profile for checkpoint '{checkpoint}'"}, status=404)
+            return web.json_response({"status": "ok", "checkpoint": checkpoint, "revision": revision})
+        except Exception as exc:
+            return web.json_response({"error": str(exc)}, status=400)
+        finally:
+            _inflight_gets.clear()
+
+
+async def _coalesced_get(checkpoint: str | None) -> tuple[str, str]:
+    """
+    Return (etag, JSON body) for a GET, sharing one computation between concurrent callers.
+
+    The shared future is shielded so a client disconnecting does not cancel it
+    for the others, and mutations drop it so later GETs never see stale data.
+    """
+    future = _inflight_gets.get(checkpoint)
+    if future is None or future.get_loop() is not asyncio.get_running_loop():
+        future = asyncio.ensure_future(run_blocking(_build_get_response, checkpoint))
+        _inflight_gets[checkpoint] = future
+
+        def forget(done: "asyncio.Future[tuple[str, str]]") -> None:
+            if _inflight_gets.get(checkpoint) is done:
+                del _inflight_gets[checkpoint]
+
+        future.add_done_callback(forget)
+    return await asyncio.shield(future)
+
+
+def _build_get_response(checkpoint: str | None) -> tuple[str, str]:
+    snapshot = get_profile_snapshot()
+    checkpoints = _get_checkpoints() if checkpoint is None else []
+    etag = _etag(snapshot, checkpoints)
+
+    if checkpoint is not None:
+        payload = snapshot.checkpoint_view(checkpoint)
+    else:
+        payload = snapshot.to_dict()
+        payload["checkpoints"] = checkpoints
+    payload["revision"] = snapshot.revision
+    return etag, json.dumps(payload)
+
+
+class _ProfileImporter:
+    """Parses NDJSON import records and commits them one batch at a time."""
+
+    def __init__(self) -> None:
+        self.profiles = 0
+        self.checkpoint_defaults = 0
+        self.batches = 0
+        self.revision: int | None = None
+
+    def import_batch(self, lines: list[tuple[int, bytes]]) -> None:
+        """
+        Validate and commit one batch of (line number, line) records.
+
+        Raises:
+            ValueError: Naming the first malformed line; earlier batches stay committed.
+        """
+        profiles: dict[str, Any] = {}
+        defaults: dict[str, str] = {}
+        for line_number, line in lines:
+            try:
+                self._parse_record(json.loads(line), profiles, defaults)
+            except ValueError as exc:
+                raise ValueError(f"line {line_number}: {exc}") from None
+
+        self.revision = update_profiles(profiles, defaults)
+        self.profiles += len(profiles)
+        self.checkpoint_defaults += len(defaults)
+        self.batches += 1
+
+    def summary(self) -> dict[str, Any]:
+        """Counts of the entries committed so far."""
+        return {
+            "profiles": self.profiles,
+            "checkpoint_defaults": self.checkpoint_defaults,
+            "batches": self.batches,
+            "revision": self.revision,
+        }
+
+    @staticmethod
+    def _parse_record(record: Any, profiles: dict[str, Any], defaults: dict[str, str]) -> None:
+        if not isinstance(record, dict):
+            raise ValueError("record must be a JSON object")
+
+        kind = record.get("type")
+        if kind == "header":
+            if record.get("format") != EXPORT_FORMAT or record.get("version") != EXPORT_VERSION:
+                raise ValueError(f"unsupported format, expected {EXPORT_FORMAT} version {EXPORT_VERSION}")
+        elif kind == "profile":
+            name = record.get("name")
+            if not isinstance(name, str) or not name:
+                raise ValueError("profile record needs a 'name' string")
+            profiles[name] = record.get("profile")
+        elif kind == "checkpoint_default":
+            checkpoint, profile_name = record.get("checkpoint"), record.get("profile")
+            if not isinstance(checkpoint, str) or not isinstance(profile_name, str):
+                raise ValueError("checkpoint_default record needs 'checkpoint' and 'profile' strings")
+            defaults[checkpoint] = profile_name
+        else:
+            raise ValueError(f"unknown record type {kind!r}")
+
+
+def _encode_profile_records(snapshot: ProfileSnapshot, names: list[str]) -> bytes:
+    return _encode_records([{"type": "profile", "name": name, "profile": snapshot.profile(name)} for name in names])
+
+
+def _encode_default_records(snapshot: ProfileSnapshot, checkpoints: list[str]) -> bytes:
+    defaults = snapshot.checkpoint_defaults
+    return _encode_records(
+        [{"type": "checkpoint_default", "checkpoint": ckpt, "profile": defaults[ckpt]} for ckpt in checkpoints]
+    )
+
+
+def _encode_records(records: list[dict[str, Any]]) -> bytes:
+    return "".join(json.dumps(record) + "\n" for record in records).encode("utf-8")
+
+
+def _batched(items: list[str], size: int) -> Iterator[list[str]]:
+    for start in range(0, len(items), size):
+        yield items[start : start + size]
+
+
+def _parse_json_body(body: bytes) -> Any:
+    if not body:
+        raise ValueError("request body must be JSON")
+    return json.loads(body)
+
+
+def _save_profiles(body: bytes) -> None:
+    data = _parse_json_body(body)
+    if not isinstance(data, dict):
+        raise ValueError("payload must be a JSON object")
+
+    save_user_profiles(
+        {
+            "profiles": data.get("profiles", {}),
+            "checkpoint_defaults": data.get("checkpoint_defaults", {}),
+        }
+    )
+
+
+def _patch_profile(name: str, body: bytes) -> tuple[dict[str, Any], int]:
+    return _mutate(patch_profile, name, _parse_json_body(body))
+
+
+def _set_checkpoint_default(checkpoint: str, body: bytes) -> tuple[str, int]:
+    data = _parse_json_body(body)
+    if not isinstance(data, dict) or not isinstance(data.get("profile"), str):
+        raise ValueError("payload must be a JSON object with a 'profile' string")
+    set_checkpoint_default(checkpoint, data["profile"])
+    return data["profile"], get_store_revision()
+
+
+def _mutate(func: Callable[..., Any], *args: Any) -> tuple[Any, int]:
+    """Call a store mutation and return its result with the resulting store revision."""
+    result = func(*args)
+    return result, get_store_revision()
+
+
+def _push_profile_change(change: ProfileChange) -> None:
+    """Send a profile store change to every connected client over the ComfyUI websocket."""
+    try:
+        from server import PromptServer
+    except ModuleNotFoundError:
+        return
+
+    instance = getattr(PromptServer, "instance", None)
+    if instance is None:
+        return
+
+    if len(change.profiles) > MAX_DELTA_PROFILES:
+        payload = {"revision": change.snapshot.revision, "full": True}
+    else:
+        payload = change.to_dict()
+    instance.send_sync(PROFILES_CHANGED_EVENT, payload)
+
+
+def _etag(snapshot: ProfileSnapshot, checkpoints: list[str]) -> str:
+    """Strong ETag for the GET payload: store revision plus the checkpoint listing."""
+    return f'"{_ETAG_EPOCH}-{snapshot.revision}-{hash(tuple(checkpoints)) & 0xFFFFFFFF:08x}"'
+
+
+def _parse_if_none_match(header: str | None) -> set[str]:
+    if not header:
+        return set()
+    return {tag.strip().removeprefix("W/") for tag in header.split(",")}
 
 
 def _get_checkpoints() -> list[str]:
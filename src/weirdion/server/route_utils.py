@@ -0,0 +1,58 @@
+"""
+Shared helpers for weirdion API routes.
+
+Route handlers run on ComfyUI's event loop, which also drives websocket
+progress updates, so any blocking work is handed to a small dedicated
+thread pool with run_blocking(). Handlers wrapped with @timed report their
+duration in a Server-Timing header.
+"""
+
+import asyncio
+import functools
+import threading
+import time
+from collections.abc import Awaitable, Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+# Worker threads for blocking route work; the pool never grows past this
+ROUTE_WORKERS = 4
+
+# Requests slower than this are logged
+SLOW_REQUEST_SECONDS = 1.0
+
+_executor: ThreadPoolExecutor | None = None
+_executor_lock = threading.Lock()
+
+
+def timed(handler: Callable[[Any], Awaitable[Any]]) -> Callable[[Any], Awaitable[Any]]:
+    """Add a Server-Timing header with the handler's wall time and log slow requests."""
+
+    @functools.wraps(handler)
+    async def wrapper(request: Any) -> Any:
+        start = time.perf_counter()
+        response = await handler(request)
+        elapsed = time.perf_counter() - start
+        # Streamed responses have already sent their headers
+        if not response.prepared:
+            response.headers["Server-Timing"] = f"handler;dur={elapsed * 1000:.1f}"
+        if elapsed >= SLOW_REQUEST_SECONDS:
+            print(f"[weirdion] Warning: {request.method} {request.path} took {elapsed:.2f}s")
+        return response
+
+    return wrapper
+
+
+async def run_blocking(func: Callable[..., Any], *args: Any) -> Any:
+    """Run func(*args) on the route thread pool and await its result."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_get_executor(), functools.partial(func, *args))
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=ROUTE_WORKERS, thread_name_prefix="weirdion-routes")
+    return _executor
@@ -0,0 +1,70 @@
+"""
+Node profiling API routes.
+
+GET /weirdion/stats/nodes returns the per-node statistics collected by
+core.profiling, DELETE discards them, and POST turns profiling on or off
+without restarting ComfyUI.
+"""
+
+from typing import Any
+
+from ..core.profiling import (
+    DEFAULT_MEMORY_SAMPLE_EVERY,
+    disable_node_profiling,
+    enable_node_profiling,
+    get_node_stats,
+    reset_node_stats,
+)
+from .route_utils import timed
+
+
+def register_stats_routes() -> None:
+    """Register node profiling routes with the ComfyUI server."""
+    try:
+        from aiohttp import web
+        from server import PromptServer
+    except ModuleNotFoundError:
+        return
+
+    if not hasattr(PromptServer, "instance"):
+        return
+
+    routes = PromptServer.instance.routes
+
+    @routes.get("/weirdion/stats/nodes")
+    @timed
+    async def get_stats(request: "web.Request") -> web.Response:
+        return web.json_response(get_node_stats())
+
+    @routes.post("/weirdion/stats/nodes")
+    @timed
+    async def configure_stats(request: "web.Request") -> web.Response:
+        try:
+            payload = await request.json()
+            _configure_profiling(payload)
+            return web.json_response(get_node_stats())
+        except Exception as exc:
+            return web.json_response({"error": str(exc)}, status=400)
+
+    @routes.delete("/weirdion/stats/nodes")
+    @timed
+    async def reset_stats(request: "web.Request") -> web.Response:
+        reset_node_stats()
+        return web.json_response(get_node_stats())
+
+
+def _configure_profiling(payload: Any) -> None:
+    if not isinstance(payload, dict) or not isinstance(payload.get("enabled"), bool):
+        raise ValueError("Body must be an object with a boolean 'enabled'")
+
+    if not payload["enabled"]:
+        disable_node_profiling()
+        return
+
+    trace_memory = payload.get("trace_memory", False)
+    sample_every = payload.get("memory_sample_every", DEFAULT_MEMORY_SAMPLE_EVERY)
+    if not isinstance(trace_memory, bool):
+        raise ValueError("'trace_memory' must be a boolean")
+    if not isinstance(sample_every, int) or isinstance(sample_every, bool):
+        raise ValueError("'memory_sample_every' must be an integer")
+    enable_node_profiling(trace_memory=trace_memory, memory_sample_every=sample_every)
@@ -0,0 +1,49 @@
+"""
+Warm-up API routes.
+
+register_warmup_routes() starts the background warm-up of the checkpoints and
+LoRAs named in profile warm lists (see utils.warmup), announces readiness
+over the ComfyUI websocket, and serves the progress report at
+GET /weirdion/warmup.
+"""
+
+from typing import Any
+
+from ..utils.warmup import get_warmup_report, start_warmup
+from .route_utils import timed
+
+# Websocket event pushed to every client once warm-up completes
+WARMUP_READY_EVENT = "weirdion.warmup.ready"
+
+
+def register_warmup_routes() -> None:
+    """Register the warm-up report route and start warming profile warm lists."""
+    try:
+        from aiohttp import web
+        from server import PromptServer
+    except ModuleNotFoundError:
+        return
+
+    if not hasattr(PromptServer, "instance"):
+        return
+
+    routes = PromptServer.instance.routes
+
+    @routes.get("/weirdion/warmup")
+    @timed
+    async def get_warmup(request: "web.Request") -> web.Response:
+        return web.json_response(get_warmup_report())
+
+    start_warmup(on_ready=_push_ready)
+
+
+def _push_ready(report: dict[str, Any]) -> None:
+    """Announce a completed warm-up to every connected client."""
+    try:
+        from server import PromptServer
+    except ModuleNotFoundError:
+        return
+
+    instance = getattr(PromptServer, "instance", None)
+    if instance is not None:
+        instance.send_sync(WARMUP_READY_EVENT, report)
@@ -0,0 +1,17 @@
+"""Helpers for weirdion's background threads."""
+
+from __future__ import annotations
+
+import os
+import threading
+from contextlib import suppress
+
+# Niceness applied to background threads where the OS supports per-thread priorities
+BACKGROUND_NICENESS = 10
+
+
+def lower_thread_priority(niceness: int = BACKGROUND_NICENESS) -> None:
+    """Lower the calling thread's CPU priority, where the OS allows it; otherwise do nothing."""
+    # On Linux, niceness is per thread when given the thread's native id
+    with suppress(AttributeError, OSError):
+        os.setpriority(os.PRIO_PROCESS, threading.get_native_id(), niceness)
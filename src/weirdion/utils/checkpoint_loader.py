@@ -1,7 +1,196 @@
 """Checkpoint loading helpers."""
 
+import time
+from collections import deque
 from typing import Any
 
+from ..core.tracing import trace_span
+from .ckpt_conversion import get_conversion_cache
+from .mapped_load import LoadReport, account_weights, adopt_mapped_weights, mapped_load_enabled
+from .readahead import LoadSequencePredictor, advise_will_need, prefetch, release_page_cache
+from .resource_budget import BudgetedCache, estimate_size, file_version
+from .safetensors_map import is_safetensors, map_state_dict
+from .shared_tier import get_shared_tier
+from .single_flight import SingleFlight
+
+# Checkpoint name -> full path of the file last read for it, for page-cache release on eviction
+_checkpoint_paths: dict[str, str] = {}
+
+
+def _release_evicted(checkpoint: str, _outputs: Any) -> None:
+    path = _checkpoint_paths.pop(checkpoint, None)
+    if path is not None:
+        release_page_cache(path)
+
+
+# Loaded (model, clip, vae) by checkpoint name, within the shared resource budget
+checkpoint_cache = BudgetedCache("checkpoints", on_evict=_release_evicted)
+
+# Concurrent loads of the same checkpoint file share one read
+checkpoint_loads = SingleFlight()
+
+# Predicts the checkpoint loaded after each one, to prefetch it into the page cache
+checkpoint_sequence = LoadSequencePredictor()
+
+# Checkpoint loads remembered for get_load_reports()
+MAX_LOAD_REPORTS = 32
+
+load_reports: deque[LoadReport] = deque(maxlen=MAX_LOAD_REPORTS)
+
+
+def load_checkpoint(checkpoint: str) -> tuple[Any, Any, Any]:
+    """
+    Load a checkpoint's model, CLIP and VAE.
+
+    Reading the state dict and guessing the model config are separate steps
+    (and separate trace spans) when ComfyUI exposes them, so later stages can
+    intervene between the two. Results are kept in checkpoint_cache until the
+    file changes or the resource budget evicts them, and concurrent calls for
+    the same file wait for the first one instead of loading it again. Once
+    loaded, the checkpoint usually loaded next is prefetched into the page cache.
+    With the shared tier enabled, the state dict is mapped from the host-wide
+    copy other ComfyUI processes use. With WEIRDION_CONVERT_CKPT=1, pickle
+    checkpoints are converted to safetensors in the background on first use,
+    and read from the conversion afterwards. When weights stay on the CPU,
+    safetensors files are mapped rather than copied (see mapped_load), and
+    every load's mapped and copied bytes are recorded for get_load_reports().
+    """
+    try:
+        import comfy.sd
+        import comfy.utils
+        import folder_paths
+    except Exception as exc:  # pragma: no cover - ComfyUI runtime only
+        raise RuntimeError("ComfyUI runtime dependencies not available") from exc
+
+    with trace_span("checkpoint.resolve", "checkpoint", checkpoint=checkpoint):
+        ckpt_path = folder_paths.get_full_path("checkpoints", checkpoint)
+        version = file_version(ckpt_path) if ckpt_path else None
+
+    if version is None:
+        # Without a file stamp a cached entry could not be validated
+        outputs = checkpoint_loads.do(ckpt_path, lambda: _load_uncached(comfy, folder_paths, ckpt_path))
+    else:
+        outputs = checkpoint_cache.get(checkpoint, version)
+        if outputs is None:
+            outputs = checkpoint_loads.do(
+                (ckpt_path, version), lambda: _load_and_cache(comfy, folder_paths, checkpoint, ckpt_path, version)
+            )
+
+    _prefetch_next(folder_paths, checkpoint)
+    return outputs
+
+
+def _prefetch_next(folder_paths: Any, checkpoint: str) -> None:
+    predicted = checkpoint_sequence.record(checkpoint)
+    if predicted is None or predicted in checkpoint_cache:
+        return
+    path = folder_paths.get_full_path("checkpoints", predicted)
+    if path and not _is_loading(path):
+        prefetch(path)
+
+
+def _is_loading(path: str) -> bool:
+    # Single-flight keys are the path, or (path, version) for files with a stamp
+    return any(key == path or (isinstance(key, tuple) and key[0] == path) for key in checkpoint_loads.in_flight())
+
+
+def _load_and_cache(
+    comfy: Any, folder_paths: Any, checkpoint: str, ckpt_path: str, version: Any
+) -> tuple[Any, Any, Any]:
+    # A load that finished while this call waited for the single-flight slot already cached the result
+    if checkpoint in checkpoint_cache:
+        cached = checkpoint_cache.get(checkpoint, version)
+        if cached is not None:
+            return cached
+
+    start = time.perf_counter()
+    read_path = _path_for_load(ckpt_path)
+    outputs = _load_uncached(comfy, folder_paths, ckpt_path, read_path)
+    # The file actually read, which is the conversion once one exists
+    _checkpoint_paths[checkpoint] = read_path
+    checkpoint_cache.put(
+        checkpoint,
+        outputs,
+        size_bytes=estimate_size(outputs),
+        cost_seconds=time.perf_counter() - start,
+        version=version,
+    )
+    return outputs
+
+
+def _load_uncached(comfy: Any, folder_paths: Any, ckpt_path: str, read_path: str | None = None) -> tuple[Any, Any, Any]:
+    embedding_directory = folder_paths.get_folder_paths("embeddings")
+    if read_path is None:
+        read_path = _path_for_load(ckpt_path)
+    advise_will_need(read_path)
+    start = time.perf_counter()
+
+    if not hasattr(comfy.sd, "load_state_dict_guess_config"):
+        with trace_span("checkpoint.load", "checkpoint", path=read_path):
+            outputs = comfy.sd.load_checkpoint_guess_config(
+                read_path,
+                output_vae=True,
+                output_clip=True,
+                embedding_directory=embedding_directory,
+            )
+        outputs = outputs[0], outputs[1], outputs[2]
+        _record_load(LoadReport(read_path, mapped=False), outputs, None, start)
+        return outputs
+
+    map_weights = mapped_load_enabled()
+    tier = get_shared_tier()
+    mapped = tier is not None or (map_weights and is_safetensors(read_path))
+    with trace_span("checkpoint.read", "checkpoint", path=read_path, mapped=mapped):
+        if tier is not None:
+            state_dict, metadata = tier.load(read_path, lambda: _read_state_dict(comfy.utils, read_path))
+        elif mapped:
+            state_dict, metadata = map_state_dict(read_path)
+        else:
+            state_dict, metadata = _read_state_dict(comfy.utils, read_path)
+    # ComfyUI pops entries while building the models; keep the mapped tensors for adoption and accounting
+    weights = dict(state_dict) if mapped else None
+
+    with trace_span("checkpoint.config_guess", "checkpoint", path=read_path):
+        options: dict[str, Any] = {} if metadata is None else {"metadata": metadata}
+        outputs = comfy.sd.load_state_dict_guess_config(
+            state_dict,
+            output_vae=True,
+            output_clip=True,
+            embedding_directory=embedding_directory,
+            **options,
+        )
+    if outputs is None:
+        raise RuntimeError(f"Could not detect model type of: {ckpt_path}")
+    outputs = outputs[0], outputs[1], outputs[2]
+
+    report = LoadReport(read_path, mapped=mapped)
+    if weights is not None and map_weights:
+        with trace_span("checkpoint.adopt_mapped", "checkpoint", path=read_path) as span:
+            report.adopted_bytes = span["adopted_bytes"] = adopt_mapped_weights(outputs, weights)
+    _record_load(report, outputs, weights, start)
+    return outputs
+
+
+def _record_load(report: LoadReport, outputs: tuple[Any, Any, Any], weights: Any, start: float) -> None:
+    with trace_span("checkpoint.account", "checkpoint", path=report.path) as span:
+        report.mapped_bytes, report.copied_bytes, report.device_bytes = account_weights(outputs, weights)
+        report.seconds = time.perf_counter() - start
+        span.update(report.to_dict())
+    load_reports.append(report)
+
+
+def get_load_reports() -> list[dict[str, Any]]:
+    """Return the most recent checkpoint loads' mapped versus copied bytes, oldest first."""
+    return [report.to_dict() for report in list(load_reports)]
+
+
+def _path_for_load(ckpt_path: str) -> str:
+    """Return the safetensors conversion of a pickle checkpoint when there is one, else ckpt_path."""
+    conversions = get_conversion_cache()
+    if conversions is None:
+        return ckpt_path
+    return conversions.path_for_load(ckpt_path)
+
 
 def load_checkpoint_with_clip_skip(
     checkpoint: str,
@@ -11,26 +200,26 @@ def load_checkpoint_with_clip_skip(
 ) -> tuple[Any, Any, Any, str, str]:
     """Load a checkpoint, apply clip skip, and optional CLIP/VAE overrides."""
     try:
-        import comfy.sd
-        import folder_paths
         from nodes import CLIPSetLastLayer
     except Exception as exc:  # pragma: no cover - ComfyUI runtime only
         raise RuntimeError("ComfyUI runtime dependencies not available") from exc
 
-    ckpt_path = folder_paths.get_full_path("checkpoints", checkpoint)
-    outputs = comfy.sd.load_checkpoint_guess_config(
-        ckpt_path,
-        output_vae=True,
-        output_clip=True,
-        embedding_directory=folder_paths.get_folder_paths("embeddings"),
-    )
-
-    model, loaded_clip, loaded_vae = outputs[:3]
+    model, loaded_clip, loaded_vae = load_checkpoint(checkpoint)
 
     output_clip = opt_clip if opt_clip is not None else loaded_clip
     output_vae = opt_vae if opt_vae is not None else loaded_vae
 
     if output_clip is not None:
-        output_clip = CLIPSetLastLayer().set_last_layer(output_clip, clip_skip)[0]
+        with trace_span("checkpoint.clip_skip", "checkpoint", clip_skip=clip_skip):
+            output_clip = CLIPSetLastLayer().set_last_layer(output_clip, clip_skip)[0]
 
     return (model, output_clip, output_vae, checkpoint, str(clip_skip))
+
+
+def _read_state_dict(comfy_utils: Any, path: str) -> tuple[Any, Any]:
+    """Read a checkpoint file, with its safetensors metadata where ComfyUI returns it."""
+    try:
+        return comfy_utils.load_torch_file(path, return_metadata=True)
+    except TypeError:
+        # Older ComfyUI without return_metadata
+        return comfy_utils.load_torch_file(path), None
@@ -0,0 +1,321 @@
+"""
+Background conversion of legacy pickle checkpoints to safetensors.
+
+Pickle checkpoints (.ckpt, .pt, ...) are fully deserialized on every load.
+The first time one is loaded, the conversion cache writes an equivalent
+safetensors file from a low-priority background thread. Later loads read
+that copy instead, which is memory-mappable and needs no unpickling.
+
+Converted files are named by the SHA-256 of their source, so identical
+checkpoints under different names share one conversion. An index maps each
+source's path, size and mtime to that hash, so looking up a conversion
+costs one stat() instead of rehashing gigabytes. ComfyUI processes sharing
+the directory update the index under a lock on index.json.lock. The cache stays within a
+disk quota (WEIRDION_CONVERSION_CACHE_MB) by deleting the least recently
+used conversions first.
+
+Conversion is off unless WEIRDION_CONVERT_CKPT=1. Conversions are written to
+weirdion/conversions in ComfyUI's user directory, or to
+WEIRDION_CONVERSION_CACHE_DIR.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import json
+import os
+import threading
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any
+
+from ..core.tracing import trace_span
+from .background import lower_thread_priority
+from .profile_store import _interprocess_lock
+from .resource_budget import GIB, _env_megabytes, file_version
+from .safetensors_map import save_state_dict
+
+# Environment variables enabling conversion (1), moving the cache and limiting it in megabytes
+CONVERT_ENV = "WEIRDION_CONVERT_CKPT"
+CONVERSION_DIR_ENV = "WEIRDION_CONVERSION_CACHE_DIR"
+CONVERSION_QUOTA_ENV = "WEIRDION_CONVERSION_CACHE_MB"
+
+DEFAULT_QUOTA_BYTES = 32 * GIB
+
+# Checkpoint extensions ComfyUI loads through pickle
+LEGACY_EXTENSIONS = (".ckpt", ".pt", ".pth", ".bin", ".pkl")
+
+INDEX_FILE = "index.json"
+CONVERTED_SUFFIX = ".safetensors"
+
+# Read size while hashing a source
+HASH_CHUNK_BYTES = 16 * 1024**2
+
+# Metadata keys recording where a conversion came from
+SOURCE_METADATA_KEY = "weirdion.source"
+SOURCE_HASH_METADATA_KEY = "weirdion.source_sha256"
+
+
+def is_legacy_checkpoint(path: str) -> bool:
+    """Return True if path is a checkpoint format ComfyUI unpickles."""
+    return path.lower().endswith(LEGACY_EXTENSIONS)
+
+
+class ConversionCache:
+    """Safetensors copies of pickle checkpoints, keyed by source hash, within a disk quota."""
+
+    def __init__(self, directory: str | Path, quota_bytes: int = DEFAULT_QUOTA_BYTES) -> None:
+        self.directory = Path(directory)
+        self.quota_bytes = quota_bytes
+        self._lock = threading.Lock()
+        self._pending: set[str] = set()
+        self._executor: ThreadPoolExecutor | None = None
+        self.hits = 0
+        self.conversions = 0
+        self.failures = 0
+        self.evictions = 0
+
+    def path_for_load(self, source: str) -> str:
+        """
+        Return the path a loader should read for source.
+
+        That is the converted copy when one is current. Otherwise it is source
+        itself, and a background conversion is scheduled for legacy formats.
+        """
+        if not is_legacy_checkpoint(source):
+            return source
+        converted = self.converted_path(source)
+        if converted is not None:
+            return converted
+        self.schedule(source)
+        return source
+
+    def converted_path(self, source: str) -> str | None:
+        """Return the conversion of source's current contents, or None if there is none."""
+        stamp = file_version(source)
+        if stamp is None:
+            return None
+        with self._lock:
+            entry = self._read_index().get(os.path.realpath(source))
+        if entry is None or (entry["size"], entry["mtime_ns"]) != stamp:
+            return None
+        path = self._converted_file(entry["sha256"])
+        try:
+            # mtime is last use, for LRU eviction
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        self.hits += 1
+        return str(path)
+
+    def schedule(self, source: str) -> bool:
+        """Convert source in the background unless it is missing or already queued. Returns True if queued."""
+        if file_version(source) is None:
+            return False
+        key = os.path.realpath(source)
+        with self._lock:
+            if key in self._pending:
+                return False
+            self._pending.add(key)
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=1, thread_name_prefix="weirdion-convert", initializer=lower_thread_priority
+                )
+        self._executor.submit(self._convert_queued, source, key)
+        return True
+
+    def convert(self, source: str) -> str:
+        """
+        Convert source now, or index an existing conversion of identical contents.
+
+        Returns:
+            Path of the safetensors copy
+
+        Raises:
+            FileNotFoundError: If source does not exist
+            ValueError: If source is larger than the quota
+        """
+        stamp = file_version(source)
+        if stamp is None:
+            raise FileNotFoundError(f"Checkpoint not found: {source}")
+        if stamp[0] > self.quota_bytes:
+            raise ValueError(f"{source} is larger than the conversion cache quota")
+
+        with trace_span("checkpoint.convert.hash", "checkpoint", path=source):
+            digest = _sha256(source)
+        target = self._converted_file(digest)
+        if not target.exists():
+            # A pickle's size is close to its tensors' size; trim before writing, then again for the real size
+            self.evict(stamp[0])
+            self._write_conversion(source, digest, target)
+            self.conversions += 1
+            self.evict()
+
+        entry = {"sha256": digest, "size": stamp[0], "mtime_ns": stamp[1]}
+        self._update_index(lambda index: {**index, os.path.realpath(source): entry})
+        return str(target)
+
+    def evict(self, needed_bytes: int = 0) -> int:
+        """Delete least recently used conversions until needed_bytes more fit the quota."""
+        return self._evict_until(self.quota_bytes - needed_bytes)
+
+    def clear(self) -> int:
+        """Delete every conversion. Returns the number deleted."""
+        return self._evict_until(0)
+
+    def entries(self) -> list[dict[str, Any]]:
+        """Describe every conversion and the sources indexed to it."""
+        with self._lock:
+            index = self._read_index()
+        sources: dict[str, list[str]] = {}
+        for source, entry in index.items():
+            sources.setdefault(entry["sha256"], []).append(source)
+        return [
+            {
+                "sha256": path.name[: -len(CONVERTED_SUFFIX)],
+                "size_bytes": stat.st_size,
+                "last_used": stat.st_mtime,
+                "sources": sources.get(path.name[: -len(CONVERTED_SUFFIX)], []),
+            }
+            for path, stat in self._scan()
+        ]
+
+    def stats(self) -> dict[str, Any]:
+        """Return the cache's location, usage and counters."""
+        files = self._scan()
+        with self._lock:
+            pending = len(self._pending)
+        return {
+            "directory": str(self.directory),
+            "quota_bytes": self.quota_bytes,
+            "used_bytes": sum(stat.st_size for _path, stat in files),
+            "conversions_cached": len(files),
+            "pending": pending,
+            "hits": self.hits,
+            "conversions": self.conversions,
+            "failures": self.failures,
+            "evictions": self.evictions,
+        }
+
+    def _convert_queued(self, source: str, key: str) -> None:
+        try:
+            start_conversions = self.conversions
+            target = self.convert(source)
+            if self.conversions > start_conversions:
+                print(f"[weirdion] Converted {os.path.basename(source)} to safetensors: {target}")
+        except Exception as exc:
+            self.failures += 1
+            print(f"[weirdion] Warning: Could not convert {source} to safetensors: {exc}")
+        finally:
+            with self._lock:
+                self._pending.discard(key)
+
+    def _write_conversion(self, source: str, digest: str, target: Path) -> None:
+        import comfy.utils
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        partial = target.with_name(f"{target.name}.{os.getpid()}.partial")
+        try:
+            with trace_span("checkpoint.convert.read", "checkpoint", path=source):
+                state_dict = comfy.utils.load_torch_file(source, safe_load=True)
+            with trace_span("checkpoint.convert.write", "checkpoint", path=str(target)):
+                metadata = {"format": "pt", SOURCE_METADATA_KEY: source, SOURCE_HASH_METADATA_KEY: digest}
+                save_state_dict(state_dict, str(partial), metadata)
+            os.replace(partial, target)
+        finally:
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(partial)
+
+    def _evict_until(self, limit_bytes: int) -> int:
+        files = sorted(self._scan(), key=lambda item: item[1].st_mtime)
+        used = sum(stat.st_size for _path, stat in files)
+        removed: set[str] = set()
+        for path, stat in files:
+            if used <= limit_bytes:
+                break
+            with contextlib.suppress(FileNotFoundError):
+                path.unlink()
+            used -= stat.st_size
+            removed.add(path.name[: -len(CONVERTED_SUFFIX)])
+
+        if removed:
+            self._update_index(
+                lambda index: {source: entry for source, entry in index.items() if entry["sha256"] not in removed}
+            )
+            self.evictions += len(removed)
+        return len(removed)
+
+    def _scan(self) -> list[tuple[Path, os.stat_result]]:
+        files = []
+        with contextlib.suppress(FileNotFoundError):
+            for path in self.directory.iterdir():
+                if path.name.endswith(CONVERTED_SUFFIX):
+                    with contextlib.suppress(FileNotFoundError):
+                        files.append((path, path.stat()))
+        return files
+
+    def _converted_file(self, digest: str) -> Path:
+        return self.directory / f"{digest}{CONVERTED_SUFFIX}"
+
+    def _read_index(self) -> dict[str, dict[str, Any]]:
+        try:
+            with open(self.directory / INDEX_FILE, encoding="utf-8") as handle:
+                index = json.load(handle)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as exc:
+            print(f"[weirdion] Warning: Ignoring unreadable conversion index: {exc}")
+            return {}
+        return index if isinstance(index, dict) else {}
+
+    def _update_index(self, update: Callable[[dict[str, dict[str, Any]]], dict[str, dict[str, Any]]]) -> None:
+        """Replace the index with update(index), locked against other threads and other ComfyUI processes."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        with self._lock, _interprocess_lock(self.directory / INDEX_FILE):
+            self._write_index(update(self._read_index()))
+
+    def _write_index(self, index: dict[str, dict[str, Any]]) -> None:
+        path = self.directory / INDEX_FILE
+        temporary = path.with_name(f"{INDEX_FILE}.{os.getpid()}.tmp")
+        with open(temporary, "w", encoding="utf-8") as handle:
+            json.dump(index, handle, indent=2, sort_keys=True)
+        os.replace(temporary, path)
+
+
+def _sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    buffer = bytearray(HASH_CHUNK_BYTES)
+    view = memoryview(buffer)
+    with open(path, "rb", buffering=0) as handle:
+        while count := handle.readinto(buffer):
+            digest.update(view[:count])
+    return digest.hexdigest()
+
+
+def _default_directory() -> Path:
+    try:
+        import folder_paths
+
+        return Path(folder_paths.get_user_directory()) / "weirdion" / "conversions"
+    except Exception:
+        # Outside ComfyUI
+        return Path(__file__).resolve().parents[3] / ".cache" / "conversions"
+
+
+_cache: ConversionCache | None = None
+_cache_lock = threading.Lock()
+
+
+def get_conversion_cache() -> ConversionCache | None:
+    """Return the process-wide conversion cache, or None unless WEIRDION_CONVERT_CKPT=1."""
+    global _cache
+    if os.environ.get(CONVERT_ENV, "").strip().lower() not in ("1", "true", "yes", "on"):
+        return None
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                directory = os.environ.get(CONVERSION_DIR_ENV, "").strip() or _default_directory()
+                _cache = ConversionCache(directory, _env_megabytes(CONVERSION_QUOTA_ENV, DEFAULT_QUOTA_BYTES))
+    return _cache
@@ -0,0 +1,51 @@
+"""
+Queue-time input checks for VALIDATE_INPUTS.
+
+ComfyUI calls a node's VALIDATE_INPUTS classmethod when a prompt is queued,
+before anything executes, and rejects the prompt if it returns a string.
+These checks read only the cached model indexes and the profile snapshot,
+so they cost a few set lookups and touch no files. Each returns an error
+message, or None if the input is usable.
+"""
+
+from __future__ import annotations
+
+from .lora_parser import parse_lora_tags
+from .model_index import get_model_index
+from .profile_store import resolve_profile_name
+
+
+def checkpoint_error(checkpoint: str, placeholder: str) -> str | None:
+    """Return why checkpoint cannot be loaded, or None if it is a listed checkpoint."""
+    if not checkpoint or checkpoint == placeholder:
+        return "checkpoint is required"
+    if checkpoint not in get_model_index("checkpoints"):
+        return f"Checkpoint not found: '{checkpoint}'"
+    return None
+
+
+def profile_error(
+    profile_name: str,
+    *,
+    checkpoint_name: str | None = None,
+    allow_checkpoint_default: bool = False,
+) -> str | None:
+    """Return why a profile name does not resolve, or None if it does."""
+    try:
+        resolve_profile_name(
+            profile_name,
+            checkpoint_name=checkpoint_name,
+            allow_checkpoint_default=allow_checkpoint_default,
+        )
+    except ValueError as exc:
+        return str(exc)
+    return None
+
+
+def lora_tags_error(prompt: str) -> str | None:
+    """Return which LoRA tags in prompt match no LoRA file, or None if all of them do."""
+    index = get_model_index("loras")
+    missing = dict.fromkeys(tag.name for tag in parse_lora_tags(prompt) if index.resolve(tag.name) is None)
+    if not missing:
+        return None
+    return "LoRA not found: " + ", ".join(f"'{name}'" for name in missing)
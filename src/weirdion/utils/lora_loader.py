@@ -0,0 +1,104 @@
+"""LoRA loading helpers."""
+
+import time
+from typing import Any
+
+from ..core.tracing import trace_span
+from .model_index import get_model_index
+from .resource_budget import BudgetedCache, estimate_size, file_version
+from .shared_tier import get_shared_tier
+from .single_flight import SingleFlight
+
+# LoRA state dicts by file name, within the shared resource budget
+lora_cache = BudgetedCache("loras")
+
+# Concurrent loads of the same LoRA file share one read
+lora_loads = SingleFlight()
+
+
+def resolve_lora_name(name: str) -> str:
+    """Resolve a LoRA tag name to a listed file name if possible."""
+    with trace_span("lora.resolve", "lora", name=name) as span:
+        span["file"] = resolved = get_model_index("loras").resolve(name) or name
+    return resolved
+
+
+def apply_lora(model: Any, clip: Any, lora_name: str, strength_model: float, strength_clip: float) -> tuple[Any, Any]:
+    """
+    Load a LoRA file and patch it into model and clip.
+
+    Mirrors ComfyUI's LoraLoader, with reading the file and patching the
+    models as separate steps (and separate trace spans). State dicts are kept
+    in lora_cache, so reapplying a LoRA skips the read.
+
+    Args:
+        model: MODEL to patch
+        clip: CLIP to patch
+        lora_name: File name relative to the loras folder
+        strength_model: LoRA strength for the model
+        strength_clip: LoRA strength for the CLIP
+
+    Returns:
+        (patched model, patched clip)
+    """
+    if strength_model == 0 and strength_clip == 0:
+        return model, clip
+
+    try:
+        import comfy.sd
+        import comfy.utils
+        import folder_paths
+    except Exception as exc:  # pragma: no cover - ComfyUI runtime only
+        raise RuntimeError("ComfyUI runtime dependencies not available") from exc
+
+    lora_path = folder_paths.get_full_path("loras", lora_name)
+    if lora_path is None:
+        raise FileNotFoundError(f"LoRA not found: '{lora_name}'")
+
+    lora = load_lora_state_dict(comfy.utils, lora_name, lora_path)
+
+    with trace_span("lora.patch", "lora", lora=lora_name, strength_model=strength_model, strength_clip=strength_clip):
+        return comfy.sd.load_lora_for_models(model, clip, lora, strength_model, strength_clip)
+
+
+def load_lora_state_dict(comfy_utils: Any, lora_name: str, lora_path: str) -> Any:
+    """
+    Return a LoRA's state dict from lora_cache, reading the file on a miss.
+
+    Concurrent misses for the same file wait for the first read instead of
+    reading it again. With the shared tier enabled, the state dict is mapped
+    from the host-wide copy other ComfyUI processes use.
+    """
+    version = file_version(lora_path)
+    lora = lora_cache.get(lora_name, version) if version is not None else None
+    if lora is not None:
+        return lora
+    return lora_loads.do((lora_path, version), lambda: _read_and_cache(comfy_utils, lora_name, lora_path, version))
+
+
+def _read_and_cache(comfy_utils: Any, lora_name: str, lora_path: str, version: Any) -> Any:
+    # A read that finished while this call waited for the single-flight slot already cached the result
+    if lora_name in lora_cache:
+        lora = lora_cache.get(lora_name, version)
+        if lora is not None:
+            return lora
+
+    with trace_span("lora.load", "lora", path=lora_path):
+        start = time.perf_counter()
+        tier = get_shared_tier()
+        if tier is None:
+            lora = comfy_utils.load_torch_file(lora_path, safe_load=True)
+        else:
+            lora, _metadata = tier.load(
+                lora_path, lambda: (comfy_utils.load_torch_file(lora_path, safe_load=True), None)
+            )
+    if version is None:
+        return lora
+    lora_cache.put(
+        lora_name,
+        lora,
+        size_bytes=estimate_size(lora),
+        cost_seconds=time.perf_counter() - start,
+        version=version,
+    )
+    return lora
@@ -0,0 +1,189 @@
+"""
+Zero-copy checkpoint loads for weights that stay on the CPU.
+
+When ComfyUI keeps weights on the CPU (CPU inference, or NO_VRAM/LOW_VRAM
+offloading), a normal safetensors load allocates the model twice. ComfyUI
+reads the file into fresh tensors, then copies them into the model's
+parameters. In mapped mode the state dict is instead mapped from the page
+cache (see safetensors_map). After the model is built, every CPU parameter
+that still holds a copy of a mapped tensor is pointed back at the mapping,
+so the copy can be freed. A copy qualifies when the longest dotted suffix of
+its name that names exactly one mapped tensor leads to a tensor of the same
+shape, dtype and values. Weights ComfyUI converted, for example to another
+dtype, keep their copies.
+
+Every load is accounted: bytes of the resulting CPU weights backed by the
+mapping, bytes held in private copies, and bytes on other devices.
+
+WEIRDION_MMAP_LOAD=1 maps every safetensors load, 0 never maps, and the
+default (auto) maps only when ComfyUI keeps weights on the CPU.
+"""
+
+from __future__ import annotations
+
+import bisect
+import os
+from collections.abc import Iterable, Iterator, Mapping
+from dataclasses import asdict, dataclass
+from typing import Any
+
+from .resource_budget import _model_management
+
+# Environment variable choosing when loads are mapped: auto, 1 or 0
+MMAP_LOAD_ENV = "WEIRDION_MMAP_LOAD"
+
+# ComfyUI VRAM states in which weights live on the CPU
+OFFLOAD_VRAM_STATES = frozenset({"DISABLED", "NO_VRAM", "LOW_VRAM"})
+
+
+@dataclass
+class LoadReport:
+    """Where one checkpoint load's weights ended up."""
+
+    path: str
+    mapped: bool
+    # CPU weight bytes backed by the file mapping
+    mapped_bytes: int = 0
+    # CPU weight bytes in private allocations
+    copied_bytes: int = 0
+    # Weight bytes on other devices
+    device_bytes: int = 0
+    # Bytes of copies replaced by mapped tensors after the model was built
+    adopted_bytes: int = 0
+    seconds: float = 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return a JSON-compatible copy of the report."""
+        return asdict(self)
+
+
+def mapped_load_enabled() -> bool:
+    """Return True if safetensors loads should be memory-mapped in this process."""
+    mode = os.environ.get(MMAP_LOAD_ENV, "").strip().lower()
+    if mode in ("1", "true", "yes", "on"):
+        return True
+    if mode in ("0", "false", "no", "off"):
+        return False
+    return _weights_on_cpu()
+
+
+def adopt_mapped_weights(outputs: Iterable[Any], weights: Mapping[str, Any]) -> int:
+    """
+    Point CPU weights of the loaded models back at the mapped tensors they were copied from.
+
+    Args:
+        outputs: Loaded (model, clip, vae), any of which may be None
+        weights: The mapped state dict as it was before ComfyUI consumed it
+
+    Returns:
+        Bytes of private copies released
+    """
+    import torch
+
+    by_suffix = _index_by_suffix(weights)
+    ranges = _MappedRanges(weights.values())
+    adopted = 0
+    with torch.no_grad():
+        for name, tensor in _model_tensors(outputs):
+            if tensor.device.type != "cpu" or ranges.contains(tensor):
+                continue
+            source = _find_by_suffix(by_suffix, name)
+            if source is None or source.shape != tensor.shape or source.dtype != tensor.dtype:
+                continue
+            if not torch.equal(source, tensor):
+                continue
+            tensor.data = source
+            adopted += source.nbytes
+    return adopted
+
+
+def account_weights(outputs: Iterable[Any], weights: Mapping[str, Any] | None) -> tuple[int, int, int]:
+    """
+    Split the loaded models' weight bytes by where they live.
+
+    Returns:
+        (mapped CPU bytes, copied CPU bytes, bytes on other devices)
+    """
+    ranges = _MappedRanges(weights.values() if weights else ())
+    mapped = copied = device = 0
+    for _name, tensor in _model_tensors(outputs):
+        if tensor.device.type != "cpu":
+            device += tensor.nbytes
+        elif ranges.contains(tensor):
+            mapped += tensor.nbytes
+        else:
+            copied += tensor.nbytes
+    return mapped, copied, device
+
+
+class _MappedRanges:
+    """Address ranges of mapped tensors, for telling whether another tensor's data lies in one."""
+
+    def __init__(self, tensors: Iterable[Any]) -> None:
+        spans = sorted((tensor.data_ptr(), tensor.data_ptr() + tensor.nbytes) for tensor in tensors if tensor.nbytes)
+        self._starts = [start for start, _end in spans]
+        self._ends = [end for _start, end in spans]
+
+    def contains(self, tensor: Any) -> bool:
+        if not self._starts or not tensor.nbytes:
+            return False
+        start = tensor.data_ptr()
+        index = bisect.bisect_right(self._starts, start) - 1
+        return index >= 0 and start + tensor.nbytes <= self._ends[index]
+
+
+def _index_by_suffix(weights: Mapping[str, Any]) -> dict[str, Any]:
+    """Index tensors by every dotted suffix of their names that is unique to one tensor."""
+    index: dict[str, Any] = {}
+    ambiguous: set[str] = set()
+    for name, tensor in weights.items():
+        parts = name.split(".")
+        for start in range(len(parts)):
+            suffix = ".".join(parts[start:])
+            if suffix in index and index[suffix] is not tensor:
+                ambiguous.add(suffix)
+            index[suffix] = tensor
+    for suffix in ambiguous:
+        del index[suffix]
+    return index
+
+
+def _find_by_suffix(by_suffix: Mapping[str, Any], name: str) -> Any | None:
+    # Model and file names differ in their prefixes (model.diffusion_model. vs diffusion_model.)
+    parts = name.split(".")
+    for start in range(len(parts)):
+        tensor = by_suffix.get(".".join(parts[start:]))
+        if tensor is not None:
+            return tensor
+    return None
+
+
+def _model_tensors(outputs: Iterable[Any]) -> Iterator[tuple[str, Any]]:
+    """Yield (name, tensor) for each distinct parameter and buffer of the loaded models."""
+    seen: set[int] = set()
+    for output in outputs:
+        if output is None:
+            continue
+        patcher = getattr(output, "patcher", output)
+        module = getattr(patcher, "model", None)
+        state_dict = getattr(module, "state_dict", None)
+        if not callable(state_dict):
+            continue
+        for name, tensor in state_dict(keep_vars=True).items():
+            if tensor is None or id(tensor) in seen:
+                continue
+            seen.add(id(tensor))
+            yield name, tensor
+
+
+def _weights_on_cpu() -> bool:
+    model_management = _model_management()
+    if model_management is None:
+        return False
+    try:
+        if model_management.get_torch_device().type == "cpu":
+            return True
+    except Exception:
+        return False
+    state = getattr(getattr(model_management, "vram_state", None), "name", "")
+    return state in OFFLOAD_VRAM_STATES
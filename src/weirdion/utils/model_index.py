@@ -0,0 +1,177 @@
+"""
+Searchable indexes of ComfyUI model file listings.
+
+Each model kind gets a ModelIndex built from folder_paths.get_filename_list().
+Names are sorted by their case-folded form, so a prefix query is two binary
+searches and a substring query is one scan over precomputed keys. Indexes are
+cached per kind and rebuilt only when the listing changes. ComfyUI keeps each
+listing in folder_paths.filename_list_cache until the folder changes, so while
+that entry is the one an index was built from, the index is current without
+comparing names.
+"""
+
+from __future__ import annotations
+
+import bisect
+import threading
+from collections.abc import Iterable
+from pathlib import PurePosixPath
+
+from ..core.profiling import record_cache_event
+
+# Model folders that can be listed and searched
+MODEL_KINDS = ("checkpoints", "loras", "embeddings")
+
+# Sorts after every character, so query + _MAX_CHAR bounds all keys starting with query
+_MAX_CHAR = "\U0010ffff"
+
+_indexes: dict[str, ModelIndex] = {}
+_index_lock = threading.Lock()
+_revision = 0
+# Kind -> the folder_paths.filename_list_cache entry its index was built from
+_sources: dict[str, object] = {}
+
+
+class ModelIndex:
+    """Immutable, case-insensitive search index over one model listing."""
+
+    def __init__(self, names: Iterable[str], revision: int = 0) -> None:
+        """
+        Build the index.
+
+        Args:
+            names: File names relative to the model folder, in listing order
+            revision: Monotonic revision of this listing, for cache keys
+        """
+        self.names = tuple(names)
+        self.revision = revision
+
+        ordered = sorted(self.names, key=lambda name: (name.casefold(), name))
+        self.sorted_names = tuple(ordered)
+        self._keys = tuple(name.casefold() for name in ordered)
+
+        self._exact = frozenset(self.names)
+        # Lowercased name / name without extension / stem -> first listing position
+        self._by_name: dict[str, int] = {}
+        self._by_stem: dict[str, int] = {}
+        for position, name in enumerate(self.names):
+            path = PurePosixPath(name.replace("\\", "/"))
+            self._by_name.setdefault(name.lower(), position)
+            self._by_name.setdefault(path.with_suffix("").as_posix().lower(), position)
+            self._by_stem.setdefault(path.stem.lower(), position)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._exact
+
+    def search(self, query: str = "", *, offset: int = 0, limit: int | None = None) -> tuple[int, list[str]]:
+        """
+        Find names containing query, ignoring case.
+
+        Names starting with query come first, then the other matches, each
+        group in sorted order.
+
+        Args:
+            query: Text to look for; empty matches everything
+            offset: Number of matches to skip
+            limit: Maximum number of matches to return (None for all)
+
+        Returns:
+            (total number of matches, the requested page of names)
+        """
+        stop = None if limit is None else offset + limit
+        folded = query.casefold()
+        if not folded:
+            return len(self.sorted_names), list(self.sorted_names[offset:stop])
+
+        keys = self._keys
+        low = bisect.bisect_left(keys, folded)
+        high = bisect.bisect_left(keys, folded + _MAX_CHAR, low)
+        matches = list(range(low, high))
+        matches.extend(position for position in range(low) if folded in keys[position])
+        matches.extend(position for position in range(high, len(keys)) if folded in keys[position])
+        return len(matches), [self.sorted_names[position] for position in matches[offset:stop]]
+
+    def resolve(self, name: str) -> str | None:
+        """
+        Resolve a loosely written model name to a listed file name.
+
+        Tries an exact match, then a case-insensitive match with or without the
+        extension, then a case-insensitive match on the file stem alone.
+        """
+        if name in self._exact:
+            return name
+
+        lowered = name.lower()
+        position = self._by_name.get(lowered)
+        if position is None:
+            position = self._by_stem.get(lowered)
+        return None if position is None else self.names[position]
+
+
+def get_model_index(kind: str) -> ModelIndex:
+    """
+    Return the index for a model kind, rebuilding it if the listing changed.
+
+    Raises:
+        ValueError: If kind is not one of MODEL_KINDS.
+    """
+    global _revision
+    if kind not in MODEL_KINDS:
+        raise ValueError(f"Unknown model kind: '{kind}'")
+
+    listing = _list_models(kind)
+    # Read after listing: get_filename_list replaces the entry during the call that notices a change
+    source = _listing_source(kind)
+    index = _indexes.get(kind)
+    if index is not None and source is not None and _sources.get(kind) is source:
+        record_cache_event("model_index", hit=True)
+        return index
+
+    names = tuple(listing)
+    with _index_lock:
+        index = _indexes.get(kind)
+        hit = index is not None and index.names == names
+        if not hit:
+            _revision += 1
+            index = _indexes[kind] = ModelIndex(names, _revision)
+        # Remember the entry only if it holds this listing, not one replaced since
+        _sources[kind] = source if _holds_listing(source, names) else None
+        record_cache_event("model_index", hit=hit)
+        return index
+
+
+def get_model_revision(kind: str) -> int:
+    """Return the revision of a model kind's listing; it changes whenever files are added or removed."""
+    return get_model_index(kind).revision
+
+
+def _listing_source(kind: str) -> object | None:
+    """Return ComfyUI's cached listing entry for kind, which is replaced whenever the folder changes."""
+    try:
+        import folder_paths
+
+        return folder_paths.filename_list_cache.get(kind)
+    except Exception:
+        # Older ComfyUI without the cache, or outside ComfyUI
+        return None
+
+
+def _holds_listing(source: object | None, names: tuple[str, ...]) -> bool:
+    """Return whether a filename_list_cache entry, (names, folder mtimes, time), lists exactly names."""
+    try:
+        return tuple(source[0]) == names  # type: ignore[index]
+    except Exception:
+        return False
+
+
+def _list_models(kind: str) -> list[str]:
+    try:
+        import folder_paths
+
+        return folder_paths.get_filename_list(kind)
+    except Exception:
+        # Fallback if ComfyUI imports fail (e.g., during testing)
+        return []
@@ -0,0 +1,124 @@
+"""
+Profile schema validation.
+
+The schema is compiled once into flat lookup tables. Well-formed profiles are
+accepted by a fast path that checks exact types only; anything else falls
+through to a slow path that reports every problem with the profile at once.
+"""
+
+from typing import Any, Final
+
+# Required profile fields and the types isinstance() must accept for them
+PROFILE_FIELDS: Final[dict[str, type | tuple[type, ...]]] = {
+    "steps": int,
+    "cfg": (int, float),
+    "sampler": str,
+    "scheduler": str,
+    "denoise": (int, float),
+    "clip_skip": int,
+    "note": str,
+}
+
+# Optional profile fields that must be lists of strings when present; the warm
+# lists name checkpoints and LoRAs to preload at startup (see utils.warmup)
+PROFILE_STRING_LIST_FIELDS: Final[tuple[str, ...]] = ("checkpoints", "warm_checkpoints", "warm_loras")
+
+_MISSING = object()
+
+
+class ProfileValidationError(ValueError):
+    """Raised when one or more profiles fail validation; carries every error found."""
+
+    def __init__(self, errors: list[str]) -> None:
+        super().__init__("; ".join(errors))
+        self.errors = errors
+
+
+class ProfileValidator:
+    """Validator specialized for a fixed profile schema."""
+
+    def __init__(
+        self,
+        fields: dict[str, type | tuple[type, ...]],
+        string_list_fields: tuple[str, ...] = (),
+    ) -> None:
+        """Compile the schema into per-field lookup tables."""
+        self._fields = tuple(fields.items())
+        self._exact_types = tuple((key, _exact_types(expected)) for key, expected in fields.items())
+        self._string_list_fields = string_list_fields
+
+    def errors(self, profile: Any, name: str) -> list[str]:
+        """Return every validation error for a profile (empty if valid)."""
+        if type(profile) is dict and self._is_valid_fast(profile):
+            return []
+        return self._collect_errors(profile, name)
+
+    def validate(self, profile: Any, name: str) -> None:
+        """
+        Validate a single profile.
+
+        Raises:
+            ProfileValidationError: With all errors for the profile.
+        """
+        errors = self.errors(profile, name)
+        if errors:
+            raise ProfileValidationError(errors)
+
+    def _is_valid_fast(self, profile: dict[str, Any]) -> bool:
+        for key, exact_types in self._exact_types:
+            if type(profile.get(key, _MISSING)) not in exact_types:
+                return False
+        for key in self._string_list_fields:
+            value = profile.get(key, _MISSING)
+            if value is _MISSING:
+                continue
+            if type(value) is not list:
+                return False
+            for item in value:
+                if type(item) is not str:
+                    return False
+        return True
+
+    def _collect_errors(self, profile: Any, name: str) -> list[str]:
+        if not isinstance(profile, dict):
+            return [f"profile '{name}' must be an object"]
+
+        errors = []
+        for key, expected_type in self._fields:
+            if key not in profile:
+                errors.append(f"profile '{name}' missing '{key}'")
+            elif not isinstance(profile[key], expected_type):
+                errors.append(f"profile '{name}' field '{key}' has invalid type")
+
+        for key in self._string_list_fields:
+            value = profile.get(key, [])
+            if not isinstance(value, list) or not all(isinstance(item, str) for item in value):
+                errors.append(f"profile '{name}' field '{key}' must be a list of strings")
+        return errors
+
+
+def _exact_types(expected: type | tuple[type, ...]) -> frozenset[type]:
+    """Exact types that isinstance(value, expected) accepts for JSON-decoded values."""
+    types = set(expected) if isinstance(expected, tuple) else {expected}
+    if int in types:
+        types.add(bool)
+    return frozenset(types)
+
+
+# Compiled once at import
+_validator = ProfileValidator(PROFILE_FIELDS, PROFILE_STRING_LIST_FIELDS)
+
+
+def profile_errors(profile: Any, name: str) -> list[str]:
+    """Return every validation error for a profile against the profile schema."""
+    return _validator.errors(profile, name)
+
+
+def validate_profile(profile: Any, name: str) -> None:
+    """
+    Validate a profile against the profile schema.
+
+    Raises:
+        ProfileValidationError: With all errors for the profile.
+    """
+    _validator.validate(profile, name)
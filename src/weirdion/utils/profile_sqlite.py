@@ -0,0 +1,258 @@
+"""
+SQLite persistence for user profiles.
+
+An optional alternative to profiles.user.json for large, shared profile
+libraries. The database runs in WAL mode so readers in other processes are
+never blocked by a writer, every mutation is a single transaction touching
+only the rows it changes, and lookups by profile name and by checkpoint are
+served by indexes.
+
+Every transaction appends to a change log. Its latest revision is the stamp
+the profile store compares to detect writes from other processes, and the
+rows after a known revision tell it exactly which profiles and checkpoint
+defaults to re-read.
+"""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+from collections.abc import Iterator, Mapping
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any
+
+# Change log rows kept for incremental reloads; older readers fall back to a full load
+CHANGE_LOG_RETENTION = 10_000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS profiles (
+    name TEXT PRIMARY KEY,
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS profile_checkpoints (
+    checkpoint TEXT NOT NULL,
+    profile TEXT NOT NULL REFERENCES profiles(name) ON DELETE CASCADE,
+    PRIMARY KEY (checkpoint, profile)
+);
+CREATE INDEX IF NOT EXISTS profile_checkpoints_by_profile ON profile_checkpoints(profile);
+CREATE TABLE IF NOT EXISTS checkpoint_defaults (
+    checkpoint TEXT PRIMARY KEY,
+    profile TEXT NOT NULL REFERENCES profiles(name) ON DELETE CASCADE
+);
+CREATE INDEX IF NOT EXISTS checkpoint_defaults_by_profile ON checkpoint_defaults(profile);
+CREATE TABLE IF NOT EXISTS changes (
+    revision INTEGER PRIMARY KEY AUTOINCREMENT,
+    kind TEXT NOT NULL,
+    key TEXT
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+# Change log kinds
+_KIND_PROFILE = "profile"
+_KIND_CHECKPOINT_DEFAULT = "checkpoint_default"
+_KIND_ALL = "all"
+
+ProfileChanges = Mapping[str, Mapping[str, Any] | None]
+DefaultChanges = Mapping[str, str | None]
+
+
+class SQLiteProfileStore:
+    """Profile persistence backed by a WAL-mode SQLite database."""
+
+    def __init__(self, path: Path) -> None:
+        """Open (creating if needed) the database at path."""
+        self.path = path
+        self._local = threading.local()
+        self._connection().executescript(_SCHEMA)
+
+    def stamp(self) -> int:
+        """Return the latest change revision (0 for an empty log)."""
+        row = self._connection().execute("SELECT COALESCE(MAX(revision), 0) FROM changes").fetchone()
+        return int(row[0])
+
+    def get_meta(self, key: str) -> str | None:
+        """Read a value from the metadata table."""
+        row = self._connection().execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return None if row is None else str(row[0])
+
+    def set_meta(self, key: str, value: str) -> None:
+        """Write a value to the metadata table."""
+        with self._transaction(write=True) as conn:
+            conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+
+    def is_empty(self) -> bool:
+        """Return True if the database holds no profiles and no change history."""
+        conn = self._connection()
+        has_profiles = conn.execute("SELECT 1 FROM profiles LIMIT 1").fetchone() is not None
+        return not has_profiles and self.stamp() == 0
+
+    def load(self) -> tuple[int, dict[str, Any]]:
+        """
+        Load every profile and checkpoint default in one read transaction.
+
+        Returns:
+            (stamp, {"profiles": ..., "checkpoint_defaults": ...})
+        """
+        with self._transaction() as conn:
+            stamp = self._stamp_in(conn)
+            profiles = {name: json.loads(data) for name, data in conn.execute("SELECT name, data FROM profiles")}
+            defaults = dict(conn.execute("SELECT checkpoint, profile FROM checkpoint_defaults"))
+        return stamp, {"profiles": profiles, "checkpoint_defaults": defaults}
+
+    def changes_since(self, stamp: int) -> tuple[int, dict[str, Any], dict[str, str | None]] | None:
+        """
+        Read the profiles and checkpoint defaults changed after stamp.
+
+        Changed entries are re-read by primary key; deleted entries map to None.
+
+        Returns:
+            (new_stamp, profile_changes, default_changes), or None if the log no
+            longer reaches back to stamp or contains a full replace.
+        """
+        with self._transaction() as conn:
+            oldest = conn.execute("SELECT MIN(revision) FROM changes").fetchone()[0]
+            if oldest is not None and oldest > stamp + 1:
+                return None
+
+            rows = conn.execute("SELECT revision, kind, key FROM changes WHERE revision > ?", (stamp,)).fetchall()
+            if any(kind == _KIND_ALL for _revision, kind, _key in rows):
+                return None
+
+            profile_changes: dict[str, Any] = {}
+            default_changes: dict[str, str | None] = {}
+            for _revision, kind, key in rows:
+                if kind == _KIND_PROFILE and key not in profile_changes:
+                    profile_changes[key] = self._get_profile_in(conn, key)
+                elif kind == _KIND_CHECKPOINT_DEFAULT and key not in default_changes:
+                    default_changes[key] = self._get_checkpoint_default_in(conn, key)
+            new_stamp = rows[-1][0] if rows else stamp
+        return new_stamp, profile_changes, default_changes
+
+    def get_profile(self, name: str) -> dict[str, Any] | None:
+        """Look up one profile by name."""
+        return self._get_profile_in(self._connection(), name)
+
+    def get_checkpoint_default(self, checkpoint: str) -> str | None:
+        """Look up the default profile name for a checkpoint."""
+        return self._get_checkpoint_default_in(self._connection(), checkpoint)
+
+    def profiles_for_checkpoint(self, checkpoint: str) -> list[str]:
+        """Look up the names of all profiles listing a checkpoint."""
+        rows = self._connection().execute(
+            "SELECT profile FROM profile_checkpoints WHERE checkpoint = ? ORDER BY profile", (checkpoint,)
+        )
+        return [row[0] for row in rows]
+
+    def apply_changes(self, profile_changes: ProfileChanges, default_changes: DefaultChanges) -> tuple[int, int]:
+        """
+        Upsert or delete individual profiles and checkpoint defaults in one transaction.
+
+        Returns:
+            (stamp before the transaction, stamp after it)
+        """
+        with self._transaction(write=True) as conn:
+            before = self._stamp_in(conn)
+            for name, profile in profile_changes.items():
+                if profile is None:
+                    conn.execute("DELETE FROM profiles WHERE name = ?", (name,))
+                else:
+                    self._upsert_profile_in(conn, name, profile)
+                conn.execute("INSERT INTO changes (kind, key) VALUES (?, ?)", (_KIND_PROFILE, name))
+
+            for checkpoint, profile_name in default_changes.items():
+                if profile_name is None:
+                    conn.execute("DELETE FROM checkpoint_defaults WHERE checkpoint = ?", (checkpoint,))
+                else:
+                    conn.execute(
+                        "INSERT OR REPLACE INTO checkpoint_defaults (checkpoint, profile) VALUES (?, ?)",
+                        (checkpoint, profile_name),
+                    )
+                conn.execute("INSERT INTO changes (kind, key) VALUES (?, ?)", (_KIND_CHECKPOINT_DEFAULT, checkpoint))
+            after = self._finish_write(conn)
+        return before, after
+
+    def replace_all(self, profiles: Mapping[str, Mapping[str, Any]], defaults: Mapping[str, str]) -> int:
+        """
+        Replace every profile and checkpoint default in one transaction.
+
+        Returns:
+            The stamp after the transaction
+        """
+        with self._transaction(write=True) as conn:
+            conn.execute("DELETE FROM checkpoint_defaults")
+            conn.execute("DELETE FROM profile_checkpoints")
+            conn.execute("DELETE FROM profiles")
+            for name, profile in profiles.items():
+                self._upsert_profile_in(conn, name, profile)
+            conn.executemany(
+                "INSERT INTO checkpoint_defaults (checkpoint, profile) VALUES (?, ?)",
+                defaults.items(),
+            )
+            conn.execute("INSERT INTO changes (kind, key) VALUES (?, NULL)", (_KIND_ALL,))
+            return self._finish_write(conn)
+
+    def close(self) -> None:
+        """Close this thread's connection, if open."""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    def _connection(self) -> sqlite3.Connection:
+        conn: sqlite3.Connection | None = getattr(self._local, "conn", None)
+        if conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=10.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA foreign_keys=ON")
+            self._local.conn = conn
+        return conn
+
+    @contextmanager
+    def _transaction(self, *, write: bool = False) -> Iterator[sqlite3.Connection]:
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE" if write else "BEGIN")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    def _finish_write(self, conn: sqlite3.Connection) -> int:
+        after = self._stamp_in(conn)
+        conn.execute("DELETE FROM changes WHERE revision <= ?", (after - CHANGE_LOG_RETENTION,))
+        return after
+
+    @staticmethod
+    def _stamp_in(conn: sqlite3.Connection) -> int:
+        return int(conn.execute("SELECT COALESCE(MAX(revision), 0) FROM changes").fetchone()[0])
+
+    @staticmethod
+    def _get_profile_in(conn: sqlite3.Connection, name: str) -> dict[str, Any] | None:
+        row = conn.execute("SELECT data FROM profiles WHERE name = ?", (name,)).fetchone()
+        return None if row is None else json.loads(row[0])
+
+    @staticmethod
+    def _get_checkpoint_default_in(conn: sqlite3.Connection, checkpoint: str) -> str | None:
+        row = conn.execute("SELECT profile FROM checkpoint_defaults WHERE checkpoint = ?", (checkpoint,)).fetchone()
+        return None if row is None else str(row[0])
+
+    @staticmethod
+    def _upsert_profile_in(conn: sqlite3.Connection, name: str, profile: Mapping[str, Any]) -> None:
+        conn.execute(
+            "INSERT INTO profiles (name, data) VALUES (?, ?) ON CONFLICT(name) DO UPDATE SET data = excluded.data",
+            (name, json.dumps(profile)),
+        )
+        conn.execute("DELETE FROM profile_checkpoints WHERE profile = ?", (name,))
+        conn.executemany(
+            "INSERT OR IGNORE INTO profile_checkpoints (checkpoint, profile) VALUES (?, ?)",
+            ((checkpoint, name) for checkpoint in profile.get("checkpoints", ())),
+        )
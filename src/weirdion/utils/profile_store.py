@@ -2,14 +2,43 @@
 Profile storage for checkpoint parameter presets.
 
 Stores defaults in .config/profiles.default.json and user edits in
-.config/profiles.user.json.
+.config/profiles.user.json, or in .config/profiles.user.sqlite3 when
+WEIRDION_PROFILE_BACKEND=sqlite (see profile_sqlite).
+
+Both files are parsed and validated once into an immutable ProfileSnapshot,
+which is swapped atomically and only rebuilt when a file's mtime or size
+changes. Readers never take a lock; the snapshot revision is monotonic and
+suitable for cache keys.
+
+Saves publish a new snapshot immediately and coalesce the disk write into a
+short debounce window. Writes go to a temp file that is fsynced and renamed
+over the target while holding an inter-process lock, so readers in other
+threads or processes never observe a partially written file.
+
+Every snapshot that replaces an earlier one is announced to listeners
+registered with add_profile_listener() as a ProfileChange naming the entries
+that differ, whether it came from a save in this process or a reload of data
+written by another.
 """
 
 from __future__ import annotations
 
+import atexit
+import bisect
 import json
+import os
+import sys
+import tempfile
+import threading
+from collections.abc import Callable, Iterable, Iterator, Mapping
+from contextlib import contextmanager, suppress
+from dataclasses import dataclass, replace
 from pathlib import Path
-from typing import Any
+from types import MappingProxyType
+from typing import Any, TypeAlias
+
+from .profile_schema import ProfileValidationError, profile_errors, validate_profile
+from .profile_sqlite import SQLiteProfileStore
 
 DEFAULT_PROFILE_NAME = "Default"
 
@@ -24,6 +53,106 @@ DEFAULT_PROFILE = {
     "note": "",
 }
 
+# Saves arriving within this window are coalesced into a single disk write
+WRITE_DEBOUNCE_SECONDS = 0.25
+
+# Environment variable selecting the user profile backend: "json" (default) or "sqlite"
+PROFILE_BACKEND_ENV = "WEIRDION_PROFILE_BACKEND"
+
+# (st_mtime_ns, st_size) of a file, or None when it does not exist
+FileStamp: TypeAlias = tuple[int, int] | None
+
+# FileStamp for profiles.user.json, or the latest change revision for SQLite
+UserStamp: TypeAlias = FileStamp | int
+
+
+@dataclass(frozen=True)
+class ProfileSnapshot:
+    """Immutable, validated view of the default and user profile files."""
+
+    revision: int
+    default_profile: Mapping[str, Any]
+    profiles: Mapping[str, Mapping[str, Any]]
+    checkpoint_defaults: Mapping[str, str]
+    # Reverse index: checkpoint -> sorted names of the profiles whose 'checkpoints' list it
+    checkpoint_profiles: Mapping[str, tuple[str, ...]]
+    default_stamp: FileStamp = None
+    user_stamp: UserStamp = None
+
+    def profiles_for_checkpoint(self, checkpoint: str) -> tuple[str, ...]:
+        """Names of the profiles that list checkpoint, in sorted order."""
+        return self.checkpoint_profiles.get(checkpoint, ())
+
+    def profile(self, name: str) -> dict[str, Any] | None:
+        """Return a mutable, JSON-compatible copy of one profile, or None if it does not exist."""
+        profile = self.profiles.get(name)
+        return None if profile is None else _thaw(profile)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return a mutable, JSON-compatible copy of the snapshot contents."""
+        return {
+            "default_profile": _thaw(self.default_profile),
+            "profiles": _thaw(self.profiles),
+            "checkpoint_defaults": _thaw(self.checkpoint_defaults),
+        }
+
+    def checkpoint_view(self, checkpoint: str) -> dict[str, Any]:
+        """Return a JSON-compatible copy of only the profile data relevant to one checkpoint."""
+        return {
+            "checkpoint": checkpoint,
+            "checkpoint_default": self.checkpoint_defaults.get(checkpoint),
+            "default_profile": _thaw(self.default_profile),
+            "profiles": {name: _thaw(self.profiles[name]) for name in self.profiles_for_checkpoint(checkpoint)},
+        }
+
+
+@dataclass(frozen=True)
+class ProfileChange:
+    """The entries that differ between a snapshot and the one it replaced."""
+
+    snapshot: ProfileSnapshot
+    # Names of profiles added, changed or removed
+    profiles: tuple[str, ...]
+    # Checkpoints whose default mapping was added, changed or removed
+    checkpoint_defaults: tuple[str, ...]
+    default_profile_changed: bool = False
+
+    def to_dict(self) -> dict[str, Any]:
+        """
+        Return a JSON-compatible delta: the new revision plus the current value
+        of every changed entry, with None for removed ones.
+        """
+        snapshot = self.snapshot
+        delta: dict[str, Any] = {
+            "revision": snapshot.revision,
+            "profiles": {name: _thaw(snapshot.profiles.get(name)) for name in self.profiles},
+            "checkpoint_defaults": {key: snapshot.checkpoint_defaults.get(key) for key in self.checkpoint_defaults},
+        }
+        if self.default_profile_changed:
+            delta["default_profile"] = _thaw(snapshot.default_profile)
+        return delta
+
+
+ProfileListener: TypeAlias = Callable[[ProfileChange], None]
+
+_FROZEN_CONTAINERS = (MappingProxyType, tuple)
+_MISSING = object()
+
+_snapshot: ProfileSnapshot | None = None
+_revision = 0
+_reload_lock = threading.Lock()
+
+# Lock order: _write_lock before _reload_lock
+_write_lock = threading.Lock()
+_pending_write: ProfileSnapshot | None = None
+_pending_timer: threading.Timer | None = None
+
+_sqlite_store: SQLiteProfileStore | None = None
+_sqlite_init_lock = threading.Lock()
+_JSON_IMPORTED_KEY = "imported_from_json"
+
+_listeners: list[ProfileListener] = []
+
 
 def _repo_root() -> Path:
     return Path(__file__).resolve().parents[3]
@@ -41,60 +170,89 @@ def _user_profile_path() -> Path:
     return _config_dir() / "profiles.user.json"
 
 
+def _sqlite_profile_path() -> Path:
+    return _config_dir() / "profiles.user.sqlite3"
+
+
 def ensure_default_profile_file() -> None:
     """Ensure the default profile file exists and is valid."""
-    config_dir = _config_dir()
-    config_dir.mkdir(parents=True, exist_ok=True)
+    _load_default_file()
 
-    path = _default_profile_path()
-    if not path.exists():
-        _write_json(path, {"default_profile": DEFAULT_PROFILE})
-        return
 
-    try:
-        data = _read_json(path)
-        if not isinstance(data, dict) or "default_profile" not in data:
-            raise ValueError("Missing default_profile")
-        _validate_profile(data["default_profile"], DEFAULT_PROFILE_NAME)
-    except Exception:
-        _write_json(path, {"default_profile": DEFAULT_PROFILE})
+def get_profile_snapshot() -> ProfileSnapshot:
+    """
+    Return the current profile snapshot, reloading it if either file changed.
 
+    The fast path is two stat() calls and a tuple comparison; no lock is taken.
+    While a save is waiting to be flushed, the in-memory snapshot is
+    authoritative and the files are not checked.
 
-def load_default_profile() -> dict[str, Any]:
-    """Load the default profile, recreating it if missing."""
-    ensure_default_profile_file()
-    data = _read_json(_default_profile_path())
-    return data["default_profile"]
+    Raises:
+        ValueError: If profiles.user.json is invalid.
+    """
+    snapshot = _snapshot
+    if snapshot is not None and _pending_write is not None:
+        return snapshot
+    stamps = (_stat(_default_profile_path()), _user_stamp())
+    if snapshot is not None and (snapshot.default_stamp, snapshot.user_stamp) == stamps:
+        return snapshot
+    return _reload_snapshot()
 
 
-def load_user_profiles() -> dict[str, Any]:
-    """Load user profiles and checkpoint defaults."""
-    path = _user_profile_path()
-    if not path.exists():
-        return {"profiles": {}, "checkpoint_defaults": {}}
+def get_store_revision() -> int:
+    """Return the monotonic revision of the current profile snapshot."""
+    return get_profile_snapshot().revision
 
-    data = _read_json(path)
-    if not isinstance(data, dict):
-        raise ValueError("profiles.user.json must be an object")
 
-    profiles = data.get("profiles", {})
-    defaults = data.get("checkpoint_defaults", {})
+def invalidate_profile_snapshot() -> None:
+    """Flush pending writes and drop the cached snapshot so the next read reloads both files."""
+    flush_profile_writes()
+    global _snapshot
+    with _reload_lock:
+        _snapshot = None
 
-    if not isinstance(profiles, dict):
-        raise ValueError("profiles must be an object")
-    if not isinstance(defaults, dict):
-        raise ValueError("checkpoint_defaults must be an object")
 
-    for name, profile in profiles.items():
-        if name == DEFAULT_PROFILE_NAME:
-            raise ValueError("profiles may not include 'Default'")
-        _validate_profile(profile, name)
+def add_profile_listener(listener: ProfileListener) -> None:
+    """
+    Call listener with a ProfileChange whenever a new snapshot replaces the current one.
 
-    for checkpoint, profile_name in defaults.items():
-        if profile_name not in profiles:
-            raise ValueError(f"checkpoint default '{checkpoint}' points to missing profile '{profile_name}'")
+    Listeners run synchronously on the thread that published or reloaded the
+    snapshot, possibly while a save holds the store's write lock, so they must
+    return quickly and must not save profiles themselves. Adding the same
+    listener twice has no effect.
+    """
+    if listener not in _listeners:
+        _listeners.append(listener)
+
+
+def remove_profile_listener(listener: ProfileListener) -> None:
+    """Stop calling a listener added with add_profile_listener()."""
+    with suppress(ValueError):
+        _listeners.remove(listener)
 
-    return {"profiles": profiles, "checkpoint_defaults": defaults}
+
+def get_checkpoint_default(checkpoint: str) -> str | None:
+    """Return the name of the profile mapped as checkpoint's default, if any."""
+    return get_profile_snapshot().checkpoint_defaults.get(checkpoint)
+
+
+def get_profiles_for_checkpoint(checkpoint: str) -> tuple[str, ...]:
+    """Return the names of all profiles that list checkpoint, in sorted order."""
+    return get_profile_snapshot().profiles_for_checkpoint(checkpoint)
+
+
+def load_default_profile() -> dict[str, Any]:
+    """Load the default profile, recreating it if missing."""
+    return _thaw(get_profile_snapshot().default_profile)
+
+
+def load_user_profiles() -> dict[str, Any]:
+    """Load user profiles and checkpoint defaults."""
+    snapshot = get_profile_snapshot()
+    return {
+        "profiles": _thaw(snapshot.profiles),
+        "checkpoint_defaults": _thaw(snapshot.checkpoint_defaults),
+    }
 
 
 def resolve_profile(
@@ -104,27 +262,519 @@ def resolve_profile(
     allow_checkpoint_default: bool = False,
 ) -> tuple[str, dict[str, Any]]:
     """Resolve a profile name to profile data."""
-    default_profile = load_default_profile()
-    user_data = load_user_profiles()
-    profiles: dict[str, Any] = user_data["profiles"]
+    snapshot = get_profile_snapshot()
+    resolved_name = resolve_profile_name(
+        profile_name,
+        checkpoint_name=checkpoint_name,
+        allow_checkpoint_default=allow_checkpoint_default,
+        snapshot=snapshot,
+    )
+    if resolved_name == DEFAULT_PROFILE_NAME:
+        return (DEFAULT_PROFILE_NAME, _thaw(snapshot.default_profile))
+    return (resolved_name, _thaw(snapshot.profiles[resolved_name]))
+
+
+def resolve_profile_name(
+    profile_name: str,
+    *,
+    checkpoint_name: str | None = None,
+    allow_checkpoint_default: bool = False,
+    snapshot: ProfileSnapshot | None = None,
+) -> str:
+    """
+    Resolve a profile name as resolve_profile() does, without copying the profile.
+
+    Raises:
+        ValueError: If the resolved profile does not exist.
+    """
+    if snapshot is None:
+        snapshot = get_profile_snapshot()
 
     resolved_name = profile_name or DEFAULT_PROFILE_NAME
     if allow_checkpoint_default and resolved_name == DEFAULT_PROFILE_NAME and checkpoint_name:
-        mapped = user_data["checkpoint_defaults"].get(checkpoint_name)
+        mapped = snapshot.checkpoint_defaults.get(checkpoint_name)
         if mapped:
             resolved_name = mapped
 
-    if resolved_name == DEFAULT_PROFILE_NAME:
-        return (DEFAULT_PROFILE_NAME, default_profile)
-
-    if resolved_name not in profiles:
+    if resolved_name != DEFAULT_PROFILE_NAME and resolved_name not in snapshot.profiles:
         raise ValueError(f"Profile not found: '{resolved_name}'")
-
-    return (resolved_name, profiles[resolved_name])
+    return resolved_name
 
 
 def save_user_profiles(data: dict[str, Any]) -> None:
-    """Save user profiles to disk."""
+    """
+    Validate and save user profiles, replacing all existing ones.
+
+    The new snapshot is published immediately. With the JSON backend the disk
+    write is scheduled and coalesced with any other saves within
+    WRITE_DEBOUNCE_SECONDS; call flush_profile_writes() to force it. With the
+    SQLite backend it is committed before returning.
+    """
+    with _write_lock:
+        previous = _snapshot.profiles if _snapshot is not None else None
+        profiles, defaults = _prepare_user_data(data, previous)
+        index = _build_checkpoint_index(profiles)
+
+        backend = _sqlite_backend()
+        if backend is None:
+            _publish(profiles, defaults, index)
+            return
+        stamp = backend.replace_all(data.get("profiles", {}), data.get("checkpoint_defaults", {}))
+        _publish(profiles, defaults, index, persisted_stamps=(None, stamp))
+
+
+def patch_profile(name: str, changes: dict[str, Any]) -> dict[str, Any]:
+    """
+    Create a profile or merge field changes into an existing one.
+
+    Args:
+        name: Profile name (may not be 'Default')
+        changes: Profile fields to set; a new profile must supply every required field
+
+    Returns:
+        The full, validated profile as stored
+    """
+    if name == DEFAULT_PROFILE_NAME:
+        raise ValueError("profiles may not include 'Default'")
+    if not isinstance(changes, dict):
+        raise ValueError(f"profile '{name}' must be an object")
+
+    with _write_lock:
+        current = get_profile_snapshot()
+        existing = current.profiles.get(name)
+        merged = _thaw(existing) if existing is not None else {}
+        merged.update(changes)
+        _commit_changes(current, {name: merged}, {})
+    return merged
+
+
+def update_profiles(
+    profiles: Mapping[str, Any],
+    checkpoint_defaults: Mapping[str, str] | None = None,
+) -> int:
+    """
+    Create or replace several profiles and checkpoint defaults in one commit.
+
+    Unlike save_user_profiles(), entries that are not mentioned are kept.
+    Entries identical to the stored ones are skipped, so re-applying the same
+    data does not write or notify listeners.
+
+    Returns:
+        The store revision after the commit
+
+    Raises:
+        ProfileValidationError: With every error across the changed entries; nothing is committed.
+    """
+    checkpoint_defaults = checkpoint_defaults or {}
+    with _write_lock:
+        current = get_profile_snapshot()
+        profile_changes = {
+            name: profile
+            for name, profile in profiles.items()
+            if name not in current.profiles or not _matches_frozen(current.profiles[name], profile)
+        }
+        default_changes = {
+            checkpoint: profile_name
+            for checkpoint, profile_name in checkpoint_defaults.items()
+            if current.checkpoint_defaults.get(checkpoint) != profile_name
+        }
+        if not profile_changes and not default_changes:
+            return current.revision
+        return _commit_changes(current, profile_changes, default_changes).revision
+
+
+def delete_profile(name: str) -> bool:
+    """
+    Delete a profile and any checkpoint defaults that point to it.
+
+    Returns:
+        False if the profile did not exist
+    """
+    with _write_lock:
+        current = get_profile_snapshot()
+        if name not in current.profiles:
+            return False
+
+        orphaned = {checkpoint: None for checkpoint, value in current.checkpoint_defaults.items() if value == name}
+        _commit_changes(current, {name: None}, orphaned)
+    return True
+
+
+def set_checkpoint_default(checkpoint: str, profile_name: str) -> None:
+    """Map a checkpoint to the profile it should use by default."""
+    with _write_lock:
+        current = get_profile_snapshot()
+        if current.checkpoint_defaults.get(checkpoint) == profile_name:
+            return
+        _commit_changes(current, {}, {checkpoint: profile_name})
+
+
+def delete_checkpoint_default(checkpoint: str) -> bool:
+    """
+    Remove a checkpoint's default profile mapping.
+
+    Returns:
+        False if the checkpoint had no mapping
+    """
+    with _write_lock:
+        current = get_profile_snapshot()
+        if checkpoint not in current.checkpoint_defaults:
+            return False
+        _commit_changes(current, {}, {checkpoint: None})
+    return True
+
+
+def flush_profile_writes() -> None:
+    """Write any pending user profile save to disk now."""
+    global _snapshot, _pending_write, _pending_timer
+    with _write_lock:
+        if _pending_timer is not None:
+            _pending_timer.cancel()
+            _pending_timer = None
+        if _pending_write is None:
+            return
+
+        _config_dir().mkdir(parents=True, exist_ok=True)
+        path = _user_profile_path()
+        data = {
+            "profiles": _thaw(_pending_write.profiles),
+            "checkpoint_defaults": _thaw(_pending_write.checkpoint_defaults),
+        }
+        with _interprocess_lock(path):
+            _write_json(path, data)
+            stamp = _stat(path)
+
+        with _reload_lock:
+            if _snapshot is not None:
+                _snapshot = replace(_snapshot, user_stamp=stamp)
+        _pending_write = None
+
+
+atexit.register(flush_profile_writes)
+
+
+def _commit_changes(
+    current: ProfileSnapshot,
+    profile_changes: dict[str, dict[str, Any] | None],
+    default_changes: dict[str, str | None],
+) -> ProfileSnapshot:
+    """Validate, persist and publish changes to individual entries. Caller holds _write_lock."""
+    profiles, defaults, index = _apply_changes(current, profile_changes, default_changes)
+    changed = (tuple(profile_changes), tuple(default_changes))
+
+    backend = _sqlite_backend()
+    if backend is None:
+        return _publish(profiles, defaults, index, changed=changed)
+    stamps = backend.apply_changes(profile_changes, default_changes)
+    return _publish(profiles, defaults, index, persisted_stamps=stamps, changed=changed)
+
+
+def _publish(
+    profiles: Mapping[str, Mapping[str, Any]],
+    checkpoint_defaults: Mapping[str, str],
+    checkpoint_profiles: Mapping[str, tuple[str, ...]],
+    *,
+    persisted_stamps: tuple[int | None, int] | None = None,
+    changed: tuple[tuple[str, ...], tuple[str, ...]] | None = None,
+) -> ProfileSnapshot:
+    """
+    Swap in a snapshot with new user data. Caller holds _write_lock.
+
+    Without persisted_stamps the JSON write is scheduled. With them, the data
+    was already committed to SQLite as (stamp before, stamp after). The
+    snapshot adopts the post-commit stamp only if no other process committed
+    since it was loaded (or the commit replaced everything, before=None), so
+    their changes are still picked up on the next read.
+
+    changed names the (profiles, checkpoint defaults) the caller modified;
+    without it listeners are told about every entry that differs.
+    """
+    global _snapshot, _pending_write, _pending_timer
+    with _reload_lock:
+        previous = _snapshot
+        if _snapshot is not None:
+            default_profile, default_stamp = _snapshot.default_profile, _snapshot.default_stamp
+            user_stamp = _snapshot.user_stamp
+        else:
+            default_profile = _freeze(_load_default_file())
+            default_stamp = _stat(_default_profile_path())
+            user_stamp = _user_stamp()
+        if persisted_stamps is not None and persisted_stamps[0] in (None, user_stamp):
+            user_stamp = persisted_stamps[1]
+        _snapshot = _next_snapshot(
+            default_profile=default_profile,
+            profiles=profiles,
+            checkpoint_defaults=checkpoint_defaults,
+            checkpoint_profiles=checkpoint_profiles,
+            default_stamp=default_stamp,
+            user_stamp=user_stamp,
+        )
+        snapshot = _snapshot
+        if persisted_stamps is None:
+            # Set with the snapshot, so no reader sees it without the pending write and reloads over it
+            _pending_write = snapshot
+
+    if persisted_stamps is None and _pending_timer is None:
+        _pending_timer = threading.Timer(WRITE_DEBOUNCE_SECONDS, flush_profile_writes)
+        _pending_timer.daemon = True
+        _pending_timer.start()
+
+    if previous is not None:
+        _notify_listeners(previous, snapshot, changed)
+    return snapshot
+
+
+def _reload_snapshot() -> ProfileSnapshot:
+    global _snapshot
+    with _reload_lock:
+        previous = _snapshot
+        if previous is not None and _pending_write is not None:
+            # An unsaved local change is newer than anything on disk
+            return previous
+        stamps = (_stat(_default_profile_path()), _user_stamp())
+        if previous is not None and (previous.default_stamp, previous.user_stamp) == stamps:
+            return previous
+        snapshot = _snapshot = _build_snapshot(previous)
+
+    if previous is not None:
+        _notify_listeners(previous, snapshot, None)
+    return snapshot
+
+
+def _notify_listeners(
+    previous: ProfileSnapshot,
+    snapshot: ProfileSnapshot,
+    changed: tuple[tuple[str, ...], tuple[str, ...]] | None,
+) -> None:
+    """
+    Announce a snapshot swap to every listener.
+
+    Without changed, the entries are diffed by identity: unchanged profiles
+    keep their frozen object across snapshots, so only edited ones differ.
+    """
+    if not _listeners:
+        return
+
+    if changed is None:
+        old, new = previous.profiles, snapshot.profiles
+        profile_names = tuple(sorted(name for name in old.keys() | new.keys() if old.get(name) is not new.get(name)))
+        old, new = previous.checkpoint_defaults, snapshot.checkpoint_defaults
+        default_keys = tuple(sorted(key for key in old.keys() | new.keys() if old.get(key) != new.get(key)))
+    else:
+        profile_names, default_keys = changed
+
+    change = ProfileChange(
+        snapshot=snapshot,
+        profiles=profile_names,
+        checkpoint_defaults=default_keys,
+        default_profile_changed=previous.default_profile is not snapshot.default_profile,
+    )
+    for listener in tuple(_listeners):
+        try:
+            listener(change)
+        except Exception as e:
+            print(f"[weirdion] Warning: Profile change listener failed: {e}")
+
+
+def _build_snapshot(previous: ProfileSnapshot | None) -> ProfileSnapshot:
+    """Rebuild the snapshot, re-reading only the data whose stamp changed."""
+    default_path = _default_profile_path()
+    default_stamp = _stat(default_path)
+    if previous is not None and default_stamp is not None and previous.default_stamp == default_stamp:
+        default_profile = previous.default_profile
+    else:
+        default_profile = _freeze(_load_default_file())
+        default_stamp = _stat(default_path)
+
+    backend = _sqlite_backend()
+    user_stamp = _user_stamp()
+    unchanged = previous is not None and previous.user_stamp == user_stamp
+    delta = None
+    if not unchanged and previous is not None and backend is not None and isinstance(previous.user_stamp, int):
+        delta = backend.changes_since(previous.user_stamp)
+
+    if previous is not None and unchanged:
+        profiles = previous.profiles
+        defaults = previous.checkpoint_defaults
+        index = previous.checkpoint_profiles
+    elif previous is not None and delta is not None:
+        user_stamp, profile_changes, default_changes = delta
+        profiles, defaults, index = _apply_changes(previous, profile_changes, default_changes)
+    elif backend is not None:
+        user_stamp, data = backend.load()
+        profiles, defaults = _prepare_user_data(data, previous.profiles if previous is not None else None)
+        index = _build_checkpoint_index(profiles)
+    elif user_stamp is None:
+        profiles = MappingProxyType({})
+        defaults = MappingProxyType({})
+        index = MappingProxyType({})
+    else:
+        data = _read_json(_user_profile_path())
+        profiles, defaults = _prepare_user_data(data, previous.profiles if previous is not None else None)
+        index = _build_checkpoint_index(profiles)
+
+    return _next_snapshot(
+        default_profile=default_profile,
+        profiles=profiles,
+        checkpoint_defaults=defaults,
+        checkpoint_profiles=index,
+        default_stamp=default_stamp,
+        user_stamp=user_stamp,
+    )
+
+
+def _next_snapshot(**fields: Any) -> ProfileSnapshot:
+    global _revision
+    _revision += 1
+    return ProfileSnapshot(revision=_revision, **fields)
+
+
+def _user_stamp() -> UserStamp:
+    """Change stamp of the user profile data for the active backend."""
+    backend = _sqlite_backend()
+    if backend is not None:
+        return backend.stamp()
+    return _stat(_user_profile_path())
+
+
+def _sqlite_backend() -> SQLiteProfileStore | None:
+    """
+    Return the SQLite store if WEIRDION_PROFILE_BACKEND=sqlite, else None.
+
+    On first use an empty database imports profiles.user.json, once.
+    """
+    global _sqlite_store
+    if os.environ.get(PROFILE_BACKEND_ENV, "json").strip().lower() != "sqlite":
+        return None
+
+    path = _sqlite_profile_path()
+    store = _sqlite_store
+    if store is not None and store.path == path:
+        return store
+
+    with _sqlite_init_lock:
+        if _sqlite_store is None or _sqlite_store.path != path:
+            store = SQLiteProfileStore(path)
+            _import_json_once(store)
+            _sqlite_store = store
+        return _sqlite_store
+
+
+def _import_json_once(store: SQLiteProfileStore) -> None:
+    if store.get_meta(_JSON_IMPORTED_KEY) is not None:
+        return
+
+    json_path = _user_profile_path()
+    if store.is_empty() and json_path.exists():
+        data = _read_json(json_path)
+        _prepare_user_data(data, None)
+        store.replace_all(data.get("profiles", {}), data.get("checkpoint_defaults", {}))
+    store.set_meta(_JSON_IMPORTED_KEY, str(json_path))
+
+
+def _build_checkpoint_index(profiles: Mapping[str, Mapping[str, Any]]) -> Mapping[str, tuple[str, ...]]:
+    """Build the checkpoint -> profile names reverse index from scratch."""
+    index: dict[str, list[str]] = {}
+    for name in sorted(profiles):
+        for checkpoint in profiles[name].get("checkpoints", ()):
+            names = index.setdefault(checkpoint, [])
+            if not names or names[-1] != name:
+                names.append(name)
+    return MappingProxyType({checkpoint: tuple(names) for checkpoint, names in index.items()})
+
+
+def _reindex_profile(
+    index: dict[str, tuple[str, ...]],
+    name: str,
+    old_checkpoints: Iterable[str],
+    new_checkpoints: Iterable[str],
+) -> None:
+    """Update the reverse index in place with one profile's checkpoint list replaced."""
+    old, new = set(old_checkpoints), set(new_checkpoints)
+    for checkpoint in old - new:
+        remaining = tuple(other for other in index.get(checkpoint, ()) if other != name)
+        if remaining:
+            index[checkpoint] = remaining
+        else:
+            index.pop(checkpoint, None)
+    for checkpoint in new - old:
+        names = list(index.get(checkpoint, ()))
+        bisect.insort(names, name)
+        index[checkpoint] = tuple(names)
+
+
+def _apply_changes(
+    current: ProfileSnapshot,
+    profile_changes: Mapping[str, Mapping[str, Any] | None],
+    default_changes: Mapping[str, str | None],
+) -> tuple[Mapping[str, Mapping[str, Any]], Mapping[str, str], Mapping[str, tuple[str, ...]]]:
+    """
+    Apply per-entry changes (None meaning delete) on top of a snapshot.
+
+    Only the changed profiles are validated and reindexed.
+
+    Raises:
+        ProfileValidationError: With every error across the changes.
+    """
+    errors: list[str] = []
+    profiles = current.profiles
+    index = current.checkpoint_profiles
+    if profile_changes:
+        profiles = dict(current.profiles)
+        index = dict(current.checkpoint_profiles)
+        for name, profile in profile_changes.items():
+            old = profiles.get(name)
+            old_checkpoints = old.get("checkpoints", ()) if old is not None else ()
+            if profile is None:
+                profiles.pop(name, None)
+                _reindex_profile(index, name, old_checkpoints, ())
+                continue
+            if name == DEFAULT_PROFILE_NAME:
+                errors.append("profiles may not include 'Default'")
+                continue
+            profile_problems = profile_errors(profile, name)
+            if profile_problems:
+                errors.extend(profile_problems)
+                continue
+            frozen = _freeze(profile)
+            profiles[name] = frozen
+            _reindex_profile(index, name, old_checkpoints, frozen.get("checkpoints", ()))
+        profiles = MappingProxyType(profiles)
+        index = MappingProxyType(index)
+
+    defaults = current.checkpoint_defaults
+    if default_changes:
+        defaults = dict(current.checkpoint_defaults)
+        for checkpoint, profile_name in default_changes.items():
+            if profile_name is None:
+                defaults.pop(checkpoint, None)
+            else:
+                defaults[checkpoint] = profile_name
+        defaults = MappingProxyType(defaults)
+
+    removed = {name for name, profile in profile_changes.items() if profile is None}
+    for checkpoint, profile_name in defaults.items():
+        if (checkpoint in default_changes or profile_name in removed) and profile_name not in profiles:
+            errors.append(f"checkpoint default '{checkpoint}' points to missing profile '{profile_name}'")
+
+    if errors:
+        raise ProfileValidationError(errors)
+    return profiles, defaults, index
+
+
+def _prepare_user_data(
+    data: dict[str, Any],
+    previous: Mapping[str, Mapping[str, Any]] | None,
+) -> tuple[Mapping[str, Mapping[str, Any]], Mapping[str, str]]:
+    """
+    Validate user data and freeze it for a snapshot.
+
+    Profiles identical to their counterpart in previous are neither validated
+    nor frozen again; the existing frozen profile is reused.
+
+    Raises:
+        ProfileValidationError: With every error across all changed profiles.
+    """
     profiles = data.get("profiles", {})
     defaults = data.get("checkpoint_defaults", {})
 
@@ -132,43 +782,50 @@ def save_user_profiles(data: dict[str, Any]) -> None:
         raise ValueError("profiles must be an object")
     if not isinstance(defaults, dict):
         raise ValueError("checkpoint_defaults must be an object")
+    if DEFAULT_PROFILE_NAME in profiles:
+        raise ValueError("profiles may not include 'Default'")
 
+    errors: list[str] = []
+    frozen_profiles: dict[str, Mapping[str, Any]] = {}
     for name, profile in profiles.items():
-        if name == DEFAULT_PROFILE_NAME:
-            raise ValueError("profiles may not include 'Default'")
-        _validate_profile(profile, name)
+        existing = previous.get(name) if previous is not None else None
+        if existing is not None and _matches_frozen(existing, profile):
+            frozen_profiles[name] = existing
+            continue
+        profile_problems = profile_errors(profile, name)
+        if profile_problems:
+            errors.extend(profile_problems)
+        else:
+            frozen_profiles[name] = _freeze(profile)
 
     for checkpoint, profile_name in defaults.items():
         if profile_name not in profiles:
-            raise ValueError(f"checkpoint default '{checkpoint}' points to missing profile '{profile_name}'")
+            errors.append(f"checkpoint default '{checkpoint}' points to missing profile '{profile_name}'")
 
-    _config_dir().mkdir(parents=True, exist_ok=True)
-    _write_json(_user_profile_path(), {"profiles": profiles, "checkpoint_defaults": defaults})
+    if errors:
+        raise ProfileValidationError(errors)
+    return MappingProxyType(frozen_profiles), _freeze(defaults)
 
 
-def _validate_profile(profile: dict[str, Any], name: str) -> None:
-    if not isinstance(profile, dict):
-        raise ValueError(f"profile '{name}' must be an object")
-
-    required = {
-        "steps": int,
-        "cfg": (int, float),
-        "sampler": str,
-        "scheduler": str,
-        "denoise": (int, float),
-        "clip_skip": int,
-        "note": str,
-    }
+def _load_default_file() -> dict[str, Any]:
+    """Read and validate the default profile file, recreating it if missing or invalid."""
+    config_dir = _config_dir()
+    config_dir.mkdir(parents=True, exist_ok=True)
 
-    for key, expected_type in required.items():
-        if key not in profile:
-            raise ValueError(f"profile '{name}' missing '{key}'")
-        if not isinstance(profile[key], expected_type):
-            raise ValueError(f"profile '{name}' field '{key}' has invalid type")
+    path = _default_profile_path()
+    if not path.exists():
+        _write_json(path, {"default_profile": DEFAULT_PROFILE})
+        return dict(DEFAULT_PROFILE)
 
-    checkpoints = profile.get("checkpoints", [])
-    if not isinstance(checkpoints, list) or not all(isinstance(c, str) for c in checkpoints):
-        raise ValueError(f"profile '{name}' field 'checkpoints' must be a list of strings")
+    try:
+        data = _read_json(path)
+        if "default_profile" not in data:
+            raise ValueError("Missing default_profile")
+        validate_profile(data["default_profile"], DEFAULT_PROFILE_NAME)
+        return data["default_profile"]
+    except Exception:
+        _write_json(path, {"default_profile": DEFAULT_PROFILE})
+        return dict(DEFAULT_PROFILE)
 
 
 def _read_json(path: Path) -> dict[str, Any]:
@@ -180,5 +837,84 @@ def _read_json(path: Path) -> dict[str, Any]:
 
 
 def _write_json(path: Path, data: dict[str, Any]) -> None:
-    with path.open("w", encoding="utf-8") as handle:
-        json.dump(data, handle, indent=2)
+    """Atomically replace path with data: write a temp file, fsync, then rename."""
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as handle:
+            json.dump(data, handle, indent=2)
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(tmp_name, path)
+    except BaseException:
+        with suppress(FileNotFoundError):
+            os.unlink(tmp_name)
+        raise
+
+
+@contextmanager
+def _interprocess_lock(path: Path) -> Iterator[None]:
+    """Hold an exclusive advisory lock on a sidecar .lock file for path."""
+    lock_path = path.with_name(path.name + ".lock")
+    with lock_path.open("a+b") as handle:
+        if sys.platform == "win32":
+            import msvcrt
+
+            handle.seek(0)
+            msvcrt.locking(handle.fileno(), msvcrt.LK_LOCK, 1)
+            try:
+                yield
+            finally:
+                handle.seek(0)
+                msvcrt.locking(handle.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            import fcntl
+
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+
+
+def _stat(path: Path) -> FileStamp:
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def _freeze(value: Any) -> Any:
+    """Recursively convert JSON data into read-only mappings and tuples."""
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+def _matches_frozen(frozen: Any, raw: Any) -> bool:
+    """Return True if raw JSON data is identical, including types, to frozen snapshot data."""
+    if type(frozen) is MappingProxyType:
+        if type(raw) is not dict or len(raw) != len(frozen):
+            return False
+        for key, value in frozen.items():
+            other = raw.get(key, _MISSING)
+            if type(value) in _FROZEN_CONTAINERS:
+                if not _matches_frozen(value, other):
+                    return False
+            elif type(value) is not type(other) or value != other:
+                return False
+        return True
+    if type(frozen) is tuple:
+        return type(raw) is list and len(raw) == len(frozen) and all(map(_matches_frozen, frozen, raw))
+    return type(frozen) is type(raw) and frozen == raw
+
+
+def _thaw(value: Any) -> Any:
+    """Recursively convert frozen snapshot data back into JSON-compatible dicts and lists."""
+    if isinstance(value, Mapping):
+        return {key: _thaw(item) for key, item in value.items()}
+    if isinstance(value, tuple):
+        return [_thaw(item) for item in value]
+    return value
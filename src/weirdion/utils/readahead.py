@@ -0,0 +1,162 @@
+"""
+Page-cache hints for checkpoint files.
+
+Before a checkpoint is read, the kernel is told the whole file will be
+needed (POSIX_FADV_WILLNEED), which starts the I/O at once. The checkpoint
+most likely to be loaded next is read into the page cache by a background
+thread, and a checkpoint evicted from the cache has its pages dropped
+(POSIX_FADV_DONTNEED) so a 7 GB file nobody uses no longer crowds out the
+page cache. Both act on the file's pages, whichever descriptor reads them.
+POSIX_FADV_SEQUENTIAL only widens readahead for the descriptor it is given,
+so it is applied to the prefetch thread's own reads and not to the loader's,
+which ComfyUI opens itself.
+
+The next checkpoint is predicted from the order checkpoints were loaded in
+this process: the most frequent successor of the one just loaded.
+
+WILLNEED alone starts only a few megabytes of readahead on many kernels and
+block devices, so the prefetch thread reads the file through rather than
+relying on the hint. A file is prefetched at most once at a time.
+
+Hints are advisory and only available where os.posix_fadvise exists (Linux
+and most Unixes); elsewhere, or with WEIRDION_FADVISE=0, every call is a no-op.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+# Environment variable disabling page-cache hints when set to 0
+FADVISE_ENV = "WEIRDION_FADVISE"
+
+# Checkpoints remembered for next-load prediction
+MAX_TRACKED_CHECKPOINTS = 256
+
+# Read size of the prefetch thread
+PREFETCH_CHUNK_BYTES = 16 * 1024**2
+
+_supported = hasattr(os, "posix_fadvise")
+_prefetch_executor: ThreadPoolExecutor | None = None
+_prefetch_lock = threading.Lock()
+# Real paths queued for or being read by the prefetch thread
+_prefetching: set[str] = set()
+
+
+def is_enabled() -> bool:
+    """Return True if page-cache hints are supported here and not disabled."""
+    return _supported and os.environ.get(FADVISE_ENV, "").strip() != "0"
+
+
+def advise_will_need(path: str) -> bool:
+    """Tell the kernel all of path is about to be read. Returns True if the hint was given."""
+    return _advise(path, ("POSIX_FADV_WILLNEED",))
+
+
+def release_page_cache(path: str) -> bool:
+    """Ask the kernel to drop path's clean cached pages. Returns True if the hint was given."""
+    return _advise(path, ("POSIX_FADV_DONTNEED",))
+
+
+def prefetch(path: str) -> bool:
+    """
+    Start reading path into the page cache from a background thread.
+
+    Returns:
+        True if a prefetch was scheduled, False if disabled or path is already queued
+    """
+    if not is_enabled():
+        return False
+    key = os.path.realpath(path)
+    with _prefetch_lock:
+        if key in _prefetching:
+            return False
+        _prefetching.add(key)
+    _get_prefetch_executor().submit(_read_through, path, key)
+    return True
+
+
+def is_prefetching(path: str) -> bool:
+    """Return True if path is queued for or being read by the prefetch thread."""
+    with _prefetch_lock:
+        return os.path.realpath(path) in _prefetching
+
+
+class LoadSequencePredictor:
+    """Predicts the next file to be loaded from the order files were loaded so far."""
+
+    def __init__(self, max_tracked: int = MAX_TRACKED_CHECKPOINTS) -> None:
+        self.max_tracked = max_tracked
+        self._successors: dict[str, Counter[str]] = {}
+        self._previous: str | None = None
+        self._lock = threading.Lock()
+
+    def record(self, name: str) -> str | None:
+        """
+        Record that name was loaded and return the most frequent file loaded after it before.
+
+        Returns:
+            The predicted next name, or None if name has no history
+        """
+        with self._lock:
+            previous, self._previous = self._previous, name
+            if previous is not None and previous != name:
+                successors = self._successors.pop(previous, None) or Counter()
+                successors[name] += 1
+                # Reinsert so the dict stays in least recently updated order
+                self._successors[previous] = successors
+                while len(self._successors) > self.max_tracked:
+                    del self._successors[next(iter(self._successors))]
+
+            successors = self._successors.get(name)
+            if not successors:
+                return None
+            predicted, _count = successors.most_common(1)[0]
+            return predicted
+
+
+def _advise(path: str, advice_names: tuple[str, ...]) -> bool:
+    if not is_enabled():
+        return False
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return False
+    try:
+        return _advise_fd(fd, advice_names)
+    finally:
+        os.close(fd)
+
+
+def _advise_fd(fd: int, advice_names: tuple[str, ...]) -> bool:
+    try:
+        for advice_name in advice_names:
+            os.posix_fadvise(fd, 0, 0, getattr(os, advice_name))
+        return True
+    except OSError:
+        return False
+
+
+def _read_through(path: str, key: str) -> None:
+    buffer = bytearray(PREFETCH_CHUNK_BYTES)
+    try:
+        with open(path, "rb", buffering=0) as handle:
+            _advise_fd(handle.fileno(), ("POSIX_FADV_SEQUENTIAL", "POSIX_FADV_WILLNEED"))
+            while handle.readinto(buffer):
+                pass
+    except OSError as exc:
+        print(f"[weirdion] Warning: Could not prefetch {path}: {exc}")
+    finally:
+        with _prefetch_lock:
+            _prefetching.discard(key)
+
+
+def _get_prefetch_executor() -> ThreadPoolExecutor:
+    global _prefetch_executor
+    if _prefetch_executor is None:
+        with _prefetch_lock:
+            if _prefetch_executor is None:
+                _prefetch_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="weirdion-readahead")
+    return _prefetch_executor
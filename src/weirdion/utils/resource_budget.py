@@ -0,0 +1,503 @@
+"""
+Shared memory budget for weirdion caches.
+
+Every cache that holds model data (checkpoints, LoRA state dicts, and any
+later conditioning or CLIP caches) is a BudgetedCache registered with the
+process-wide ResourceBudget. The budget enforces one RAM limit across all
+of them. VRAM is left to ComfyUI, which moves cached models off the GPU
+itself when it needs the memory.
+
+Eviction is cost-aware (GreedyDual-Size). Each entry's priority is the
+budget's inflation clock plus its rebuild cost per gigabyte, refreshed on
+every hit. The lowest priority is evicted first, and the clock rises to it.
+Entries that are cheap to rebuild for their size go first, and entries that
+are not used age out.
+
+The budget also yields memory to ComfyUI. When free RAM falls below a
+floor, or comfy.model_management frees RAM for a model load and is still
+short, the budget evicts entries until the shortfall is covered. The second
+case wraps comfy.model_management.free_memory for the whole process, unless
+WEIRDION_CACHE_HOOK=0. WEIRDION_CACHE_RAM_MB=0 turns the caches off.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from collections.abc import Callable, Hashable, Iterator, Mapping
+from dataclasses import dataclass
+from typing import Any
+
+from ..core.profiling import record_cache_event
+
+GIB = 1024**3
+MIB = 1024**2
+
+# Environment variables overriding the budget limits, in megabytes
+RAM_LIMIT_ENV = "WEIRDION_CACHE_RAM_MB"
+MIN_FREE_RAM_ENV = "WEIRDION_CACHE_MIN_FREE_RAM_MB"
+
+# Environment variable disabling the comfy.model_management.free_memory hook (0)
+MEMORY_HOOK_ENV = "WEIRDION_CACHE_HOOK"
+
+DEFAULT_RAM_LIMIT_BYTES = 8 * GIB
+DEFAULT_MIN_FREE_RAM_BYTES = 2 * GIB
+
+EvictCallback = Callable[[str, Any], None]
+
+
+@dataclass
+class CacheEntry:
+    """One resident cache value and its accounting."""
+
+    key: str
+    value: Any
+    size_bytes: int
+    cost_seconds: float
+    version: Hashable
+    created: float
+    last_access: float
+    hits: int = 0
+    pinned: bool = False
+    priority: float = 0.0
+
+    def info(self, now: float | None = None) -> dict[str, Any]:
+        """Return a JSON-compatible description of the entry, without its value."""
+        now = time.time() if now is None else now
+        return {
+            "key": self.key,
+            "size_bytes": self.size_bytes,
+            "cost_seconds": self.cost_seconds,
+            "age_seconds": now - self.created,
+            "idle_seconds": now - self.last_access,
+            "hits": self.hits,
+            "pinned": self.pinned,
+        }
+
+
+class BudgetedCache:
+    """A named key-value cache whose memory is accounted to a ResourceBudget."""
+
+    def __init__(
+        self,
+        name: str,
+        budget: ResourceBudget | None = None,
+        *,
+        on_evict: EvictCallback | None = None,
+    ) -> None:
+        """
+        Create the cache and register it with budget (the shared budget by default).
+
+        Args:
+            name: Unique cache name, e.g. "checkpoints"
+            budget: Budget to account entries to
+            on_evict: Called with (key, value) after an entry is evicted or replaced
+        """
+        self.name = name
+        self.on_evict = on_evict
+        self.hits = 0
+        self.misses = 0
+        self._entries: dict[str, CacheEntry] = {}
+        # Pinned keys, kept while not resident so a later load is pinned too
+        self._pins: set[str] = set()
+        self.budget = budget if budget is not None else get_resource_budget()
+        self.budget.register(self)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._entries
+
+    def get(self, key: str, version: Hashable = None) -> Any | None:
+        """
+        Return the cached value for key, or None on a miss.
+
+        An entry stored under a different version (e.g. an older file
+        modification time) is evicted and counts as a miss.
+        """
+        evicted = None
+        with self.budget.lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.version != version:
+                evicted = self._entries.pop(key)
+                entry = None
+            if entry is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                entry.hits += 1
+                entry.last_access = time.time()
+                entry.priority = self.budget.priority_for(entry)
+
+        if evicted is not None:
+            self._evicted(evicted)
+        record_cache_event(self.name, hit=entry is not None)
+        return None if entry is None else entry.value
+
+    def put(
+        self,
+        key: str,
+        value: Any,
+        *,
+        size_bytes: int,
+        cost_seconds: float = 0.0,
+        version: Hashable = None,
+    ) -> bool:
+        """
+        Store a value, evicting other entries as needed to stay within the budget.
+
+        Args:
+            key: Entry key, e.g. a checkpoint file name
+            value: Value to cache
+            size_bytes: RAM held by the value
+            cost_seconds: Time it took to build the value; costlier entries are kept longer
+            version: Stamp that get() must match, e.g. the file's size and mtime
+
+        Returns:
+            True if the value was stored, False if it can never fit in the budget.
+        """
+        if not self.budget.fits(size_bytes):
+            return False
+
+        now = time.time()
+        entry = CacheEntry(
+            key=key,
+            value=value,
+            size_bytes=max(0, size_bytes),
+            cost_seconds=max(0.0, cost_seconds),
+            version=version,
+            created=now,
+            last_access=now,
+        )
+        with self.budget.lock:
+            replaced = self._entries.pop(key, None)
+            entry.pinned = key in self._pins
+            entry.priority = self.budget.priority_for(entry)
+            self._entries[key] = entry
+
+        if replaced is not None:
+            self._evicted(replaced)
+        self.budget.enforce()
+        self.budget.relieve_memory_pressure()
+        return key in self._entries
+
+    def evict(self, key: str) -> bool:
+        """Remove one entry, pinned or not. Returns True if it was resident."""
+        with self.budget.lock:
+            entry = self._entries.pop(key, None)
+        if entry is None:
+            return False
+        self._evicted(entry)
+        return True
+
+    def clear(self, *, include_pinned: bool = True) -> int:
+        """Remove every entry (optionally sparing pinned ones). Returns the number removed."""
+        with self.budget.lock:
+            removed = [entry for entry in self._entries.values() if include_pinned or not entry.pinned]
+            for entry in removed:
+                del self._entries[entry.key]
+        for entry in removed:
+            self._evicted(entry)
+        return len(removed)
+
+    def pin(self, key: str, pinned: bool = True) -> bool:
+        """
+        Protect a key from budget eviction (or release it).
+
+        A key that is not resident yet is pinned as soon as it is stored.
+
+        Returns:
+            True if the key is resident
+        """
+        with self.budget.lock:
+            if pinned:
+                self._pins.add(key)
+            else:
+                self._pins.discard(key)
+            entry = self._entries.get(key)
+            if entry is None:
+                return False
+            entry.pinned = pinned
+            return True
+
+    def entries(self) -> list[dict[str, Any]]:
+        """Describe every resident entry, most recently used first."""
+        now = time.time()
+        with self.budget.lock:
+            entries = sorted(self._entries.values(), key=lambda entry: entry.last_access, reverse=True)
+            return [entry.info(now) for entry in entries]
+
+    def stats(self) -> dict[str, Any]:
+        """Return this cache's totals and hit counts."""
+        with self.budget.lock:
+            return {
+                "name": self.name,
+                "entries": len(self._entries),
+                "size_bytes": sum(entry.size_bytes for entry in self._entries.values()),
+                "hits": self.hits,
+                "misses": self.misses,
+                "pins": sorted(self._pins),
+            }
+
+    def _iter_entries(self) -> Iterator[CacheEntry]:
+        return iter(self._entries.values())
+
+    def _remove_for_budget(self, entry: CacheEntry) -> None:
+        """Remove an entry chosen by the budget; the budget lock is held."""
+        del self._entries[entry.key]
+
+    def _evicted(self, entry: CacheEntry) -> None:
+        if self.on_evict is None:
+            return
+        try:
+            self.on_evict(entry.key, entry.value)
+        except Exception as exc:
+            print(f"[weirdion] Warning: Eviction callback for cache '{self.name}' failed: {exc}")
+
+
+class ResourceBudget:
+    """Global RAM limit shared by every registered BudgetedCache."""
+
+    def __init__(
+        self,
+        ram_limit_bytes: int = DEFAULT_RAM_LIMIT_BYTES,
+        min_free_ram_bytes: int = DEFAULT_MIN_FREE_RAM_BYTES,
+    ) -> None:
+        """
+        Create a budget.
+
+        Args:
+            ram_limit_bytes: Most RAM all caches together may hold (0 to cache nothing)
+            min_free_ram_bytes: Evict when ComfyUI reports less free RAM than this
+        """
+        self.ram_limit_bytes = ram_limit_bytes
+        self.min_free_ram_bytes = min_free_ram_bytes
+        self.lock = threading.RLock()
+        self.evictions = 0
+        self._clock = 0.0
+        self._caches: dict[str, BudgetedCache] = {}
+
+    def register(self, cache: BudgetedCache) -> None:
+        """Account a cache's entries to this budget; names must be unique."""
+        with self.lock:
+            existing = self._caches.get(cache.name)
+            if existing is not None and existing is not cache:
+                raise ValueError(f"Cache '{cache.name}' is already registered")
+            self._caches[cache.name] = cache
+
+    def unregister(self, name: str) -> None:
+        """Stop accounting a cache (its entries are left as they are)."""
+        with self.lock:
+            self._caches.pop(name, None)
+
+    def caches(self) -> Mapping[str, BudgetedCache]:
+        """Return the registered caches by name."""
+        with self.lock:
+            return dict(self._caches)
+
+    def usage(self) -> int:
+        """Return the RAM bytes held by all registered caches."""
+        with self.lock:
+            return sum(entry.size_bytes for cache in self._caches.values() for entry in cache._iter_entries())
+
+    def fits(self, size_bytes: int) -> bool:
+        """Return True if an entry of this size could ever be held within the limit."""
+        return self.ram_limit_bytes > 0 and size_bytes <= self.ram_limit_bytes
+
+    def priority_for(self, entry: CacheEntry) -> float:
+        """GreedyDual-Size priority: the inflation clock plus rebuild seconds per GiB."""
+        return self._clock + entry.cost_seconds * GIB / max(entry.size_bytes, 1)
+
+    def enforce(self) -> int:
+        """Evict unpinned entries until usage is within the limit. Returns bytes released."""
+        return self.release(max(self.usage() - self.ram_limit_bytes, 0))
+
+    def release(self, ram_bytes: int) -> int:
+        """
+        Evict unpinned entries, lowest priority first, until ram_bytes are freed.
+
+        Returns:
+            Bytes released
+        """
+        evicted: list[tuple[BudgetedCache, CacheEntry]] = []
+        with self.lock:
+            candidates = sorted(
+                (
+                    (entry.priority, entry.last_access, cache, entry)
+                    for cache in self._caches.values()
+                    for entry in cache._iter_entries()
+                    if not entry.pinned
+                ),
+                key=lambda item: (item[0], item[1]),
+            )
+            for priority, _last_access, cache, entry in candidates:
+                if ram_bytes <= 0:
+                    break
+                if entry.size_bytes == 0:
+                    continue
+                cache._remove_for_budget(entry)
+                self._clock = max(self._clock, priority)
+                ram_bytes -= entry.size_bytes
+                evicted.append((cache, entry))
+            self.evictions += len(evicted)
+
+        for cache, entry in evicted:
+            cache._evicted(entry)
+        return sum(entry.size_bytes for _cache, entry in evicted)
+
+    def relieve_memory_pressure(self) -> int:
+        """Evict entries if ComfyUI reports less free RAM than min_free_ram_bytes. Returns bytes released."""
+        free_ram = _free_memory("cpu")
+        if free_ram is None or free_ram >= self.min_free_ram_bytes:
+            return 0
+        return self.release(self.min_free_ram_bytes - free_ram)
+
+    def on_comfy_free_memory(self, memory_required: int, device: Any) -> int:
+        """
+        Release RAM after comfy.model_management.free_memory() if ComfyUI is still short.
+
+        Only CPU requests are relieved; ComfyUI frees VRAM by unloading models itself.
+
+        Returns:
+            Bytes released
+        """
+        if getattr(device, "type", str(device)) != "cpu":
+            return 0
+        free = _free_memory(device)
+        if free is None:
+            return 0
+        shortfall = memory_required + self.min_free_ram_bytes - free
+        return self.release(shortfall) if shortfall > 0 else 0
+
+    def stats(self) -> dict[str, Any]:
+        """Return the limits, current usage and per-cache totals."""
+        return {
+            "ram_limit_bytes": self.ram_limit_bytes,
+            "min_free_ram_bytes": self.min_free_ram_bytes,
+            "ram_bytes": self.usage(),
+            "evictions": self.evictions,
+            "caches": [cache.stats() for cache in self.caches().values()],
+        }
+
+
+def estimate_size(value: Any) -> int:
+    """
+    Estimate the bytes held by a cached value.
+
+    Understands tensors (nbytes, or element_size() * nelement()), ComfyUI model
+    patchers (model_size()), objects wrapping a patcher (CLIP, VAE), mappings
+    and sequences of those. Anything else counts as zero.
+    """
+    if value is None:
+        return 0
+    nbytes = getattr(value, "nbytes", None)
+    if isinstance(nbytes, int):
+        return nbytes
+    if hasattr(value, "element_size") and hasattr(value, "nelement"):
+        return int(value.element_size() * value.nelement())
+    model_size = getattr(value, "model_size", None)
+    if callable(model_size):
+        return int(model_size())
+    patcher = getattr(value, "patcher", None)
+    if patcher is not None:
+        return estimate_size(patcher)
+    if isinstance(value, Mapping):
+        return sum(estimate_size(item) for item in value.values())
+    if isinstance(value, (list, tuple)):
+        return sum(estimate_size(item) for item in value)
+    return 0
+
+
+def file_version(path: str) -> tuple[int, int] | None:
+    """Return a (size, mtime_ns) stamp that changes when a file is replaced, or None if it is missing."""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_size, stat.st_mtime_ns
+
+
+_budget: ResourceBudget | None = None
+_budget_lock = threading.Lock()
+_hook_installed = False
+
+
+def get_resource_budget() -> ResourceBudget:
+    """Return the process-wide budget, configured from the environment on first use."""
+    global _budget
+    if _budget is None:
+        with _budget_lock:
+            if _budget is None:
+                _budget = ResourceBudget(
+                    ram_limit_bytes=_env_megabytes(RAM_LIMIT_ENV, DEFAULT_RAM_LIMIT_BYTES),
+                    min_free_ram_bytes=_env_megabytes(MIN_FREE_RAM_ENV, DEFAULT_MIN_FREE_RAM_BYTES),
+                )
+                if os.environ.get(MEMORY_HOOK_ENV, "").strip() != "0":
+                    install_memory_pressure_hook()
+    return _budget
+
+
+def install_memory_pressure_hook() -> bool:
+    """
+    Make comfy.model_management.free_memory() release weirdion caches when ComfyUI is still short.
+
+    Returns:
+        True if the hook is installed (now or earlier), False without ComfyUI.
+    """
+    global _hook_installed
+    if _hook_installed:
+        return True
+    model_management = _model_management()
+    original = getattr(model_management, "free_memory", None)
+    if original is None:
+        return False
+
+    def free_memory(memory_required: Any, device: Any, *args: Any, **kwargs: Any) -> Any:
+        result = original(memory_required, device, *args, **kwargs)
+        try:
+            get_resource_budget().on_comfy_free_memory(int(memory_required), device)
+        except Exception as exc:
+            print(f"[weirdion] Warning: Failed to release cache memory: {exc}")
+        return result
+
+    free_memory.__wrapped__ = original  # type: ignore[attr-defined]
+    model_management.free_memory = free_memory
+    _hook_installed = True
+    return True
+
+
+def _model_management() -> Any:
+    try:
+        import comfy.model_management
+
+        return comfy.model_management
+    except Exception:
+        # Fallback if ComfyUI imports fail (e.g., during testing)
+        return None
+
+
+def _free_memory(device: Any) -> int | None:
+    model_management = _model_management()
+    if model_management is None:
+        return None
+    try:
+        if isinstance(device, str):
+            import torch
+
+            device = torch.device(device)
+        return int(model_management.get_free_memory(device))
+    except Exception:
+        return None
+
+
+def _env_megabytes(name: str, default: Any) -> Any:
+    value = os.environ.get(name, "").strip()
+    if not value:
+        return default
+    try:
+        return int(float(value) * MIB)
+    except ValueError:
+        print(f"[weirdion] Warning: Ignoring invalid {name}='{value}'")
+        return default
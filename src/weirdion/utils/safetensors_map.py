@@ -0,0 +1,147 @@
+"""
+Memory-mapped safetensors reading.
+
+map_state_dict() returns a file's tensors as views into a private mapping of
+it (MAP_PRIVATE), instead of copying them into fresh allocations. The pages
+come straight from the page cache, or from shared memory for files on
+/dev/shm, and stay shared with every other mapping of the file until a
+tensor is written to, when only the written pages are copied.
+
+Only the safetensors layout is parsed here: an 8-byte little-endian header
+length, a JSON header of name -> {dtype, shape, data_offsets}, and the data.
+"""
+
+from __future__ import annotations
+
+import json
+import mmap
+import os
+import struct
+import weakref
+from collections.abc import Callable
+from typing import Any
+
+# Largest header accepted, as in the safetensors library
+MAX_HEADER_BYTES = 100 * 1024**2
+
+# safetensors dtype -> torch dtype attribute
+SAFETENSORS_DTYPES = {
+    "F64": "float64",
+    "F32": "float32",
+    "F16": "float16",
+    "BF16": "bfloat16",
+    "F8_E4M3": "float8_e4m3fn",
+    "F8_E5M2": "float8_e5m2",
+    "I64": "int64",
+    "I32": "int32",
+    "I16": "int16",
+    "I8": "int8",
+    "U8": "uint8",
+    "BOOL": "bool",
+}
+
+
+def is_safetensors(path: str) -> bool:
+    """Return True if path has a safetensors extension."""
+    return path.lower().endswith((".safetensors", ".sft"))
+
+
+def read_header(path: str) -> tuple[dict[str, Any], int]:
+    """
+    Read a safetensors file's header.
+
+    Returns:
+        (header, offset of the data section); the header includes "__metadata__" if present
+
+    Raises:
+        ValueError: If the file is not a well-formed safetensors file
+    """
+    with open(path, "rb") as handle:
+        prefix = handle.read(8)
+        if len(prefix) != 8:
+            raise ValueError(f"Not a safetensors file: {path}")
+        (length,) = struct.unpack("<Q", prefix)
+        if length > MAX_HEADER_BYTES:
+            raise ValueError(f"safetensors header too large ({length} bytes): {path}")
+        raw = handle.read(length)
+    if len(raw) != length:
+        raise ValueError(f"Truncated safetensors header: {path}")
+    try:
+        header = json.loads(raw)
+    except ValueError as exc:
+        raise ValueError(f"Invalid safetensors header in {path}: {exc}") from exc
+    if not isinstance(header, dict):
+        raise ValueError(f"Invalid safetensors header in {path}")
+    return header, 8 + length
+
+
+def map_state_dict(
+    path: str, *, on_unmap: Callable[[], None] | None = None
+) -> tuple[dict[str, Any], dict[str, str] | None]:
+    """
+    Map a safetensors file's tensors without copying them.
+
+    Args:
+        path: safetensors file to map
+        on_unmap: Called once the last tensor backed by the mapping is freed
+
+    Returns:
+        (state dict of CPU tensors backed by the mapping, the file's metadata or None)
+
+    Raises:
+        ValueError: If the file is malformed or uses an unsupported dtype
+    """
+    import torch
+
+    header, data_start = read_header(path)
+    metadata = header.pop("__metadata__", None)
+    size = os.path.getsize(path)
+
+    with open(path, "rb") as handle:
+        # Tensors keep the mapping alive; it is unmapped when the last one is freed
+        mapping = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_COPY)
+
+    state_dict: dict[str, Any] = {}
+    for name, info in header.items():
+        dtype_name = SAFETENSORS_DTYPES.get(info.get("dtype"))
+        dtype = getattr(torch, dtype_name, None) if dtype_name else None
+        if dtype is None:
+            raise ValueError(f"Unsupported dtype {info.get('dtype')!r} for '{name}' in {path}")
+        begin, end = info["data_offsets"]
+        shape = info["shape"]
+        if end > begin:
+            if data_start + end > size:
+                raise ValueError(f"Tensor '{name}' runs past the end of {path}")
+            count = (end - begin) // torch.empty((), dtype=dtype).element_size()
+            tensor = torch.frombuffer(mapping, dtype=dtype, count=count, offset=data_start + begin)
+            state_dict[name] = tensor.reshape(shape)
+        else:
+            state_dict[name] = torch.empty(shape, dtype=dtype)
+
+    if on_unmap is not None:
+        weakref.finalize(mapping, on_unmap)
+    return state_dict, metadata
+
+
+def save_state_dict(state_dict: dict[str, Any], path: str, metadata: dict[str, str] | None = None) -> None:
+    """
+    Write the tensors of a state dict to path in safetensors format.
+
+    Tensors sharing storage (tied weights) are written as separate copies,
+    since safetensors cannot express aliasing. Non-tensor values are dropped.
+    """
+    from safetensors.torch import save_file
+
+    tensors = {}
+    storages: set[int] = set()
+    for name, value in state_dict.items():
+        if not hasattr(value, "untyped_storage"):
+            continue
+        tensor = value.detach().cpu().contiguous()
+        storage = tensor.untyped_storage().data_ptr()
+        if storage in storages:
+            tensor = tensor.clone()
+            storage = tensor.untyped_storage().data_ptr()
+        storages.add(storage)
+        tensors[name] = tensor
+    save_file(tensors, path, metadata=metadata)
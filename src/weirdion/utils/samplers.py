@@ -0,0 +1,27 @@
+"""
+Sampler and scheduler names from ComfyUI.
+
+Custom node packs may append to comfy.samplers.KSampler's lists after our
+nodes are imported, so callers should read them when needed rather than
+capture them once.
+"""
+
+# Used when ComfyUI is not importable (e.g., during testing)
+FALLBACK_SAMPLERS = ["euler_ancestral"]
+FALLBACK_SCHEDULERS = ["karras"]
+
+
+def get_sampler_scheduler_types() -> tuple[list[str], list[str]]:
+    """Return ComfyUI's current (samplers, schedulers) lists."""
+    try:
+        import comfy.samplers
+
+        return (comfy.samplers.KSampler.SAMPLERS, comfy.samplers.KSampler.SCHEDULERS)
+    except Exception:
+        return (FALLBACK_SAMPLERS, FALLBACK_SCHEDULERS)
+
+
+def get_sampler_scheduler_key() -> tuple[tuple[str, ...], tuple[str, ...]]:
+    """Hashable snapshot of the sampler and scheduler lists, for cache keys."""
+    samplers, schedulers = get_sampler_scheduler_types()
+    return (tuple(samplers), tuple(schedulers))
@@ -0,0 +1,360 @@
+"""
+Host-wide shared memory tier for checkpoint and LoRA state dicts.
+
+Hosts that run one ComfyUI process per GPU otherwise hold one private copy
+of every popular checkpoint per process. With WEIRDION_SHARED_TIER_DIR set,
+normally to a directory on /dev/shm, the first process to read a file
+writes its state dict there once as safetensors. Every process, the first
+included, then maps that copy read-only (see safetensors_map) instead of
+keeping its own.
+
+Entries are keyed by the source file's path, size and mtime, so replacing a
+file creates a new entry. A process mapping an entry holds a reference file
+in <key>.refs/, locked with flock(), until its last tensor from the entry is
+freed. A reference is live while its lock is held. The kernel drops the lock
+when the process exits, so references left by exited processes are ignored.
+This needs no pid checks, so it also works for processes in different PID
+namespaces (containers) sharing the directory. Whenever an entry is added
+past the quota (WEIRDION_SHARED_TIER_MB), that process deletes the least
+recently attached entries without live references. Deleting a file that a
+process still maps is harmless, because the memory is only freed when the
+last mapping goes.
+
+Processes coordinate with flock() on files in the tier directory, so the
+tier is only available where fcntl exists.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import os
+import re
+import secrets
+import shutil
+import threading
+from collections.abc import Callable, Iterator
+from typing import Any
+
+from ..core.tracing import trace_span
+from .resource_budget import GIB, MIB, _env_megabytes, estimate_size, file_version
+from .safetensors_map import map_state_dict, read_header, save_state_dict
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None  # type: ignore[assignment]
+
+# Environment variables enabling the tier and limiting its size in megabytes
+SHARED_TIER_DIR_ENV = "WEIRDION_SHARED_TIER_DIR"
+SHARED_TIER_QUOTA_ENV = "WEIRDION_SHARED_TIER_MB"
+
+DEFAULT_QUOTA_BYTES = 16 * GIB
+
+ENTRY_SUFFIX = ".safetensors"
+REFS_SUFFIX = ".refs"
+
+# Metadata key recording which file an entry was made from
+SOURCE_METADATA_KEY = "weirdion.source"
+
+StateDictReader = Callable[[], tuple[dict[str, Any], dict[str, str] | None]]
+
+
+class SharedTier:
+    """State dicts materialized once per host in a shared directory and mapped by every process."""
+
+    def __init__(self, directory: str, quota_bytes: int = DEFAULT_QUOTA_BYTES) -> None:
+        self.directory = directory
+        self.quota_bytes = quota_bytes
+        os.makedirs(directory, exist_ok=True)
+        # Live mappings per key in this process, and the locked reference file held for each key
+        self._mapped: dict[str, int] = {}
+        self._ref_files: dict[str, Any] = {}
+        self._lock = threading.Lock()
+        self.attaches = 0
+        self.materializations = 0
+        self.evictions = 0
+
+    def key_for(self, path: str) -> str | None:
+        """Return the entry key for the current contents of path, or None if it is missing."""
+        version = file_version(path)
+        if version is None:
+            return None
+        source = os.path.realpath(path)
+        digest = hashlib.sha256(f"{source}\0{version[0]}\0{version[1]}".encode()).hexdigest()[:24]
+        stem = re.sub(r"[^A-Za-z0-9._-]", "_", os.path.splitext(os.path.basename(source))[0])[:64]
+        return f"{stem}-{digest}"
+
+    def load(self, path: str, read: StateDictReader) -> tuple[dict[str, Any], dict[str, str] | None]:
+        """
+        Return path's state dict mapped from the tier, materializing it with read() on a miss.
+
+        Only one process reads a given file; others wait for it and map its
+        copy. If the state dict cannot be added to the tier, read()'s private
+        copy is returned instead.
+
+        Returns:
+            (state dict, metadata)
+        """
+        key = self.key_for(path)
+        if key is None:
+            return read()
+
+        attached = self._attach(key)
+        if attached is not None:
+            return attached
+
+        with self._flock(f"{key}.lock"):
+            # Another process may have materialized it while this one waited for the lock
+            attached = self._attach(key)
+            if attached is not None:
+                return attached
+            state_dict, metadata = read()
+            try:
+                self._materialize(key, path, state_dict, metadata)
+            except Exception as exc:
+                print(f"[weirdion] Warning: Could not add {path} to the shared tier: {exc}")
+                return state_dict, metadata
+
+        attached = self._attach(key)
+        return attached if attached is not None else (state_dict, metadata)
+
+    def evict(self, needed_bytes: int = 0) -> int:
+        """Delete unreferenced entries, least recently attached first, until needed_bytes fit the quota."""
+        return self._evict_until(self.quota_bytes - needed_bytes)
+
+    def clear(self) -> int:
+        """Delete every entry no live process references. Returns the number deleted."""
+        return self._evict_until(0)
+
+    def entries(self) -> list[dict[str, Any]]:
+        """Describe every entry in the tier directory."""
+        items = []
+        for key, path, stat in self._scan():
+            try:
+                header, _offset = read_header(path)
+                source = (header.get("__metadata__") or {}).get(SOURCE_METADATA_KEY)
+            except (OSError, ValueError):
+                source = None
+            with self._lock:
+                mapped_here = self._mapped.get(key, 0)
+            items.append(
+                {
+                    "key": key,
+                    "source": source,
+                    "size_bytes": stat.st_size,
+                    "last_attached": stat.st_mtime,
+                    "refs": self._live_refs(key),
+                    "mapped_here": mapped_here,
+                }
+            )
+        return items
+
+    def stats(self) -> dict[str, Any]:
+        """Return the tier's location, usage and counters."""
+        entries = list(self._scan())
+        return {
+            "directory": self.directory,
+            "quota_bytes": self.quota_bytes,
+            "used_bytes": sum(stat.st_size for _key, _path, stat in entries),
+            "entries": len(entries),
+            "attaches": self.attaches,
+            "materializations": self.materializations,
+            "evictions": self.evictions,
+        }
+
+    def _attach(self, key: str) -> tuple[dict[str, Any], dict[str, str] | None] | None:
+        path = self._entry_path(key)
+        if not os.path.exists(path):
+            return None
+
+        try:
+            # Reference first, so a concurrent eviction sees this process before it maps
+            self._add_ref(key)
+        except FileNotFoundError:
+            # Evicted by another process since the check above
+            return None
+        except OSError as exc:
+            print(f"[weirdion] Warning: Could not reference shared tier entry {key}: {exc}")
+            return None
+        try:
+            with trace_span("shared_tier.attach", "checkpoint", key=key):
+                state_dict, metadata = map_state_dict(path, on_unmap=lambda: self._drop_ref(key))
+        except FileNotFoundError:
+            self._drop_ref(key)
+            return None
+        except (OSError, ValueError) as exc:
+            self._drop_ref(key)
+            print(f"[weirdion] Warning: Could not map shared tier entry {key}: {exc}")
+            return None
+
+        with contextlib.suppress(OSError):
+            # Entry mtime is its last attach time, for LRU eviction across processes
+            os.utime(path)
+        self.attaches += 1
+        metadata = {name: value for name, value in (metadata or {}).items() if name != SOURCE_METADATA_KEY}
+        return state_dict, metadata or None
+
+    def _materialize(self, key: str, source: str, state_dict: dict[str, Any], metadata: dict[str, str] | None) -> None:
+        size = estimate_size(state_dict)
+        if size > self.quota_bytes:
+            raise ValueError(f"{size // MIB} MB is over the {self.quota_bytes // MIB} MB quota")
+        self.evict(size)
+        free = shutil.disk_usage(self.directory).free
+        if size > free:
+            raise ValueError(f"{size // MIB} MB does not fit in {free // MIB} MB free")
+
+        path = self._entry_path(key)
+        partial = f"{path}.{os.getpid()}.partial"
+        try:
+            with trace_span("shared_tier.materialize", "checkpoint", key=key, size_bytes=size):
+                save_state_dict(state_dict, partial, {**(metadata or {}), SOURCE_METADATA_KEY: source})
+            os.replace(partial, path)
+        finally:
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(partial)
+        self.materializations += 1
+
+    def _evict_until(self, limit_bytes: int) -> int:
+        removed = 0
+        with self._flock(".tier.lock"):
+            entries = sorted(self._scan(), key=lambda item: item[2].st_mtime)
+            used = sum(stat.st_size for _key, _path, stat in entries)
+            for key, path, stat in entries:
+                if used <= limit_bytes:
+                    break
+                if self._live_refs(key):
+                    continue
+                with contextlib.suppress(FileNotFoundError):
+                    os.remove(path)
+                shutil.rmtree(self._refs_dir(key), ignore_errors=True)
+                used -= stat.st_size
+                removed += 1
+        self.evictions += removed
+        return removed
+
+    def _scan(self) -> Iterator[tuple[str, str, os.stat_result]]:
+        with os.scandir(self.directory) as entries:
+            for entry in entries:
+                if entry.name.endswith(ENTRY_SUFFIX) and entry.is_file():
+                    with contextlib.suppress(FileNotFoundError):
+                        yield entry.name[: -len(ENTRY_SUFFIX)], entry.path, entry.stat()
+
+    def _live_refs(self, key: str) -> list[int]:
+        """
+        Return the pids of the processes referencing key, removing references whose lock is not held.
+
+        Pids are as seen in each referencing process's own PID namespace.
+        """
+        live = []
+        try:
+            names = os.listdir(self._refs_dir(key))
+        except FileNotFoundError:
+            return live
+        for name in names:
+            pid, _, token = name.partition("-")
+            if not pid.isdigit() or not token:
+                continue
+            path = os.path.join(self._refs_dir(key), name)
+            try:
+                with open(path, "rb") as handle:
+                    try:
+                        fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    except BlockingIOError:
+                        live.append(int(pid))
+                        continue
+                    # Nobody holds it: the process that made it has exited
+                    os.remove(path)
+            except FileNotFoundError:
+                continue
+        return live
+
+    def _add_ref(self, key: str) -> None:
+        with self._lock:
+            count = self._mapped.get(key, 0)
+            if count == 0:
+                self._ref_files[key] = self._publish_ref(key)
+            # Counted only once published, so a failed attempt leaves nothing behind
+            self._mapped[key] = count + 1
+
+    def _publish_ref(self, key: str) -> tuple[Any, str]:
+        """Create this process's locked reference file for key. Returns the open handle and file name."""
+        refs_dir = self._refs_dir(key)
+        os.makedirs(refs_dir, exist_ok=True)
+        name = _ref_name()
+        partial = os.path.join(refs_dir, f".{name}.partial")
+        handle = open(partial, "w")  # noqa: SIM115 - held until the reference is dropped
+        try:
+            fcntl.flock(handle, fcntl.LOCK_SH)
+            # Published only once locked, so no reader can take it for a dead reference
+            os.replace(partial, os.path.join(refs_dir, name))
+        except BaseException:
+            handle.close()
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(partial)
+            raise
+        return handle, name
+
+    def _drop_ref(self, key: str) -> None:
+        with self._lock:
+            count = self._mapped.get(key, 0) - 1
+            if count > 0:
+                self._mapped[key] = count
+                return
+            self._mapped.pop(key, None)
+            ref = self._ref_files.pop(key, None)
+            if ref is None:
+                return
+            handle, name = ref
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(os.path.join(self._refs_dir(key), name))
+            handle.close()
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.directory, key + ENTRY_SUFFIX)
+
+    def _refs_dir(self, key: str) -> str:
+        return os.path.join(self.directory, key + REFS_SUFFIX)
+
+    @contextlib.contextmanager
+    def _flock(self, name: str) -> Iterator[None]:
+        with open(os.path.join(self.directory, name), "a") as handle:
+            fcntl.flock(handle, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(handle, fcntl.LOCK_UN)
+
+
+_ref_token: tuple[int, str] | None = None
+
+
+def _ref_name() -> str:
+    """Return this process's reference file name: its pid and a random token, unique across PID namespaces."""
+    global _ref_token
+    pid = os.getpid()
+    # A forked child gets its own token
+    if _ref_token is None or _ref_token[0] != pid:
+        _ref_token = (pid, secrets.token_hex(8))
+    return f"{pid}-{_ref_token[1]}"
+
+
+_tier: SharedTier | None = None
+_tier_lock = threading.Lock()
+
+
+def get_shared_tier() -> SharedTier | None:
+    """Return the process-wide shared tier, or None unless WEIRDION_SHARED_TIER_DIR is set."""
+    global _tier
+    directory = os.environ.get(SHARED_TIER_DIR_ENV, "").strip()
+    if not directory or fcntl is None:
+        return None
+    if _tier is None or _tier.directory != directory:
+        with _tier_lock:
+            if _tier is None or _tier.directory != directory:
+                try:
+                    _tier = SharedTier(directory, _env_megabytes(SHARED_TIER_QUOTA_ENV, DEFAULT_QUOTA_BYTES))
+                except OSError as exc:
+                    print(f"[weirdion] Warning: Shared tier unavailable at {directory}: {exc}")
+                    return None
+    return _tier
@@ -0,0 +1,75 @@
+"""
+Single-flight deduplication of concurrent identical calls.
+
+When several threads ask for the same key while a call for it is running,
+only the first runs the function; the others block until it finishes and
+receive the same result, or the same exception. Nothing is remembered once
+the call completes, so pair it with a cache for later requests.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections.abc import Callable, Hashable
+from typing import Any
+
+
+class _Call:
+    """One in-flight call and the outcome its waiters will share."""
+
+    __slots__ = ("done", "result", "error", "waiters")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException | None = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Runs at most one call per key at a time and shares its outcome with concurrent callers."""
+
+    def __init__(self) -> None:
+        self._calls: dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+        # Calls that were answered by another thread's in-flight call
+        self.shared = 0
+
+    def do(self, key: Hashable, func: Callable[[], Any]) -> Any:
+        """
+        Call func, unless a call for key is already running; then wait for and return its result.
+
+        Raises:
+            Whatever func raised, in the calling thread and in every waiter.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                call.waiters += 1
+                self.shared += 1
+                leader = False
+            else:
+                call = self._calls[key] = _Call()
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = func()
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+    def in_flight(self) -> list[Hashable]:
+        """Return the keys with a call currently running."""
+        with self._lock:
+            return list(self._calls)
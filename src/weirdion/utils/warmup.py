@@ -0,0 +1,219 @@
+"""
+Background warm-up of profile-declared checkpoints and LoRAs.
+
+Profiles may list "warm_checkpoints" and "warm_loras". After the server
+starts, start_warmup() loads those into the budgeted checkpoint and LoRA
+caches from one low-priority daemon thread, so the first job after a restart
+does not pay a cold load. Warm-up never evicts: an item whose file would push
+the caches past the RAM budget is skipped.
+
+get_warmup_report() describes progress; the report's status becomes "ready"
+once every item has been handled, and the on_ready callback fires then.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import asdict, dataclass, field
+from typing import Any
+
+from .background import lower_thread_priority
+from .profile_store import ProfileSnapshot, get_profile_snapshot
+from .resource_budget import get_resource_budget
+
+# Environment variable disabling warm-up when set to 0
+WARMUP_ENV = "WEIRDION_WARMUP"
+
+# Seconds to wait after start_warmup() before loading, so ComfyUI finishes starting first
+WARMUP_DELAY_SECONDS = 5.0
+
+# Profile fields naming what to warm
+WARM_CHECKPOINTS_FIELD = "warm_checkpoints"
+WARM_LORAS_FIELD = "warm_loras"
+
+
+@dataclass
+class WarmupItem:
+    """Warm-up state of one checkpoint or LoRA."""
+
+    kind: str
+    name: str
+    # pending, loaded, skipped or failed
+    status: str = "pending"
+    seconds: float = 0.0
+    detail: str = ""
+
+
+@dataclass
+class WarmupReport:
+    """Progress of the current warm-up run."""
+
+    # idle, disabled, running or ready
+    status: str = "idle"
+    started: float | None = None
+    finished: float | None = None
+    items: list[WarmupItem] = field(default_factory=list)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return a JSON-compatible copy of the report."""
+        data = asdict(self)
+        data["counts"] = {
+            status: sum(item.status == status for item in self.items)
+            for status in ("pending", "loaded", "skipped", "failed")
+        }
+        return data
+
+
+ReadyCallback = Callable[[dict[str, Any]], None]
+
+_report = WarmupReport()
+_report_lock = threading.Lock()
+_thread: threading.Thread | None = None
+
+
+def collect_warm_list(snapshot: ProfileSnapshot) -> tuple[tuple[str, ...], tuple[str, ...]]:
+    """Return the (checkpoints, loras) named by every profile's warm lists, without duplicates."""
+    checkpoints: dict[str, None] = {}
+    loras: dict[str, None] = {}
+    for name in sorted(snapshot.profiles):
+        profile = snapshot.profiles[name]
+        checkpoints.update(dict.fromkeys(profile.get(WARM_CHECKPOINTS_FIELD, ())))
+        loras.update(dict.fromkeys(profile.get(WARM_LORAS_FIELD, ())))
+    return tuple(checkpoints), tuple(loras)
+
+
+def get_warmup_report() -> dict[str, Any]:
+    """Return a JSON-compatible copy of the warm-up report."""
+    with _report_lock:
+        return _report.to_dict()
+
+
+def start_warmup(*, delay: float = WARMUP_DELAY_SECONDS, on_ready: ReadyCallback | None = None) -> bool:
+    """
+    Start warming the profile warm lists in a background thread.
+
+    Args:
+        delay: Seconds to wait before the first load
+        on_ready: Called with the final report once warm-up completes
+
+    Returns:
+        True if a warm-up thread was started, False if disabled or already running.
+    """
+    global _report, _thread
+    if os.environ.get(WARMUP_ENV, "").strip() == "0":
+        with _report_lock:
+            _report = WarmupReport(status="disabled")
+        return False
+
+    with _report_lock:
+        if _thread is not None and _thread.is_alive():
+            return False
+        _report = WarmupReport(status="running", started=time.time())
+        _thread = threading.Thread(
+            target=_run,
+            args=(delay, on_ready),
+            name="weirdion-warmup",
+            daemon=True,
+        )
+        _thread.start()
+    return True
+
+
+def wait_for_warmup(timeout: float | None = None) -> bool:
+    """Block until the current warm-up finishes. Returns True if it did within timeout."""
+    thread = _thread
+    if thread is not None:
+        thread.join(timeout)
+    return thread is None or not thread.is_alive()
+
+
+def _run(delay: float, on_ready: ReadyCallback | None) -> None:
+    lower_thread_priority()
+    if delay > 0:
+        time.sleep(delay)
+
+    try:
+        checkpoints, loras = collect_warm_list(get_profile_snapshot())
+    except Exception as exc:
+        print(f"[weirdion] Warning: Warm-up could not read profiles: {exc}")
+        checkpoints, loras = (), ()
+
+    items = [WarmupItem("checkpoint", name) for name in checkpoints] + [WarmupItem("lora", name) for name in loras]
+    with _report_lock:
+        _report.items = items
+
+    for item in items:
+        _warm(item)
+        # Let the executor and route threads in between loads
+        time.sleep(0)
+
+    with _report_lock:
+        _report.status = "ready"
+        _report.finished = time.time()
+        report = _report.to_dict()
+
+    counts = report["counts"]
+    print(
+        f"[weirdion] Warm-up ready: {counts['loaded']} loaded, {counts['skipped']} skipped, "
+        f"{counts['failed']} failed in {report['finished'] - report['started']:.1f}s"
+    )
+    if on_ready is not None:
+        try:
+            on_ready(report)
+        except Exception as exc:
+            print(f"[weirdion] Warning: Warm-up ready callback failed: {exc}")
+
+
+def _warm(item: WarmupItem) -> None:
+    start = time.perf_counter()
+    try:
+        path = _resolve_path(item.kind, item.name)
+        if path is None:
+            status, detail = "skipped", "not found"
+        elif not _fits_budget(os.path.getsize(path)):
+            status, detail = "skipped", "over memory budget"
+        else:
+            if item.kind == "checkpoint":
+                _load_checkpoint(item.name)
+            else:
+                _load_lora(item.name, path)
+            status, detail = "loaded", ""
+    except Exception as exc:
+        status, detail = "failed", str(exc)
+
+    with _report_lock:
+        item.status = status
+        item.detail = detail
+        item.seconds = time.perf_counter() - start
+
+
+def _fits_budget(size_bytes: int) -> bool:
+    budget = get_resource_budget()
+    return budget.usage() + size_bytes <= budget.ram_limit_bytes
+
+
+def _resolve_path(kind: str, name: str) -> str | None:
+    import folder_paths
+
+    if kind == "lora":
+        from .lora_loader import resolve_lora_name
+
+        name = resolve_lora_name(name)
+    return folder_paths.get_full_path("checkpoints" if kind == "checkpoint" else "loras", name)
+
+
+def _load_checkpoint(name: str) -> None:
+    from .checkpoint_loader import load_checkpoint
+
+    load_checkpoint(name)
+
+
+def _load_lora(name: str, path: str) -> None:
+    import comfy.utils
+
+    from .lora_loader import load_lora_state_dict, resolve_lora_name
+
+    load_lora_state_dict(comfy.utils, resolve_lora_name(name), path)
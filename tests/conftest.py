@@ -17,3 +17,43 @@ def sample_multiline_text() -> str:
     return """Line 1
 Line 2
 Line 3"""
+
+
+@pytest.fixture
+def profile_config_dir(tmp_path, monkeypatch):
+    """Point the profile store at an isolated config directory."""
+    from weirdion.utils import profile_store
+
+    config_dir = tmp_path / ".config"
+    monkeypatch.setattr(profile_store, "_config_dir", lambda: config_dir)
+    profile_store.invalidate_profile_snapshot()
+    yield config_dir
+    profile_store.flush_profile_writes()
+    profile_store.invalidate_profile_snapshot()
+
+
+@pytest.fixture
+def model_listings(monkeypatch):
+    """
+    Serve model listings from a dict, kind -> file names, with empty index caches.
+
+    Like folder_paths.get_filename_list, listing a kind replaces its
+    filename_list_cache entry when the names changed.
+    """
+    from weirdion.utils import model_index
+
+    listings: dict[str, list[str]] = {}
+    cache: dict[str, tuple] = {}
+
+    def get_filename_list(kind):
+        names = listings.get(kind, [])
+        entry = cache.get(kind)
+        if entry is None or entry[0] != names:
+            entry = cache[kind] = (list(names), {}, 0.0)
+        return list(entry[0])
+
+    monkeypatch.setattr(model_index, "_list_models", get_filename_list)
+    monkeypatch.setattr(model_index, "_listing_source", cache.get)
+    monkeypatch.setattr(model_index, "_indexes", {})
+    monkeypatch.setattr(model_index, "_sources", {})
+    return listings
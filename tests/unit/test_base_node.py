@@ -0,0 +1,145 @@
+"""Tests for shared BaseNode behaviour."""
+
+from weirdion.core import UtilityNode
+from weirdion.nodes.loaders import LoadProfileInputParametersNode
+from weirdion.types import ComfyType, InputSpec, NodeOutput
+from weirdion.utils.profile_store import patch_profile
+
+
+def _counting_node(dependency):
+    class CountingNode(UtilityNode):
+        builds = 0
+        INPUT_SPEC_DEPENDENCIES = (dependency,)
+
+        @classmethod
+        def get_input_spec(cls) -> InputSpec:
+            cls.builds += 1
+            return {"required": {"text": ("STRING", {"default": str(dependency())})}}
+
+        @classmethod
+        def get_return_types(cls) -> tuple[ComfyType, ...]:
+            return ("STRING",)
+
+        def process(self, text: str) -> NodeOutput:
+            return (text,)
+
+    return CountingNode
+
+
+def test_input_types_is_cached_until_dependency_changes() -> None:
+    """Test that INPUT_TYPES reuses the spec until a declared dependency changes."""
+    revision = [1]
+    node = _counting_node(lambda: revision[0])
+
+    first = node.INPUT_TYPES()
+    assert node.INPUT_TYPES() is first
+    assert node.builds == 1
+
+    revision[0] = 2
+    assert node.INPUT_TYPES()["required"]["text"][1]["default"] == "2"
+    assert node.builds == 2
+
+
+def test_invalidate_input_spec_forces_rebuild() -> None:
+    """Test that explicit invalidation rebuilds the spec on the next call."""
+    node = _counting_node(lambda: 1)
+
+    node.INPUT_TYPES()
+    node.invalidate_input_spec()
+    node.INPUT_TYPES()
+    assert node.builds == 2
+
+
+def test_failing_dependency_builds_uncached() -> None:
+    """Test that a dependency that raises never serves a stale cached spec."""
+
+    def broken():
+        raise OSError("unreadable")
+
+    node = _counting_node(lambda: 1)
+    node.INPUT_SPEC_DEPENDENCIES = (broken,)
+
+    node.INPUT_TYPES()
+    node.INPUT_TYPES()
+    assert node.builds == 2
+    assert "_input_spec_cache" not in node.__dict__
+
+
+def test_profile_node_spec_follows_profile_store(profile_config_dir) -> None:
+    """Test that a new profile shows up in the cached spec of a profile node."""
+    profile = {
+        "steps": 20,
+        "cfg": 7.0,
+        "sampler": "euler",
+        "scheduler": "normal",
+        "denoise": 1.0,
+        "clip_skip": -1,
+        "note": "",
+        "checkpoints": [],
+    }
+    before = LoadProfileInputParametersNode.INPUT_TYPES()
+    assert LoadProfileInputParametersNode.INPUT_TYPES() is before
+
+    patch_profile("Fast", profile)
+    assert "Fast" in LoadProfileInputParametersNode.INPUT_TYPES()["required"]["profile"][0]
+
+
+def test_return_types_are_computed_on_first_access() -> None:
+    """Test that defining a node does not evaluate its return types."""
+    calls = []
+
+    class LazyNode(UtilityNode):
+        @classmethod
+        def get_input_spec(cls) -> InputSpec:
+            return {"required": {}}
+
+        @classmethod
+        def get_return_types(cls) -> tuple[ComfyType, ...]:
+            calls.append("types")
+            return ("STRING",)
+
+        def process(self) -> NodeOutput:
+            return ("",)
+
+    assert calls == []
+    assert LazyNode.RETURN_TYPES == ("STRING",)
+    assert LazyNode.RETURN_TYPES == ("STRING",)
+    assert calls == ["types"]
+    assert not hasattr(LazyNode, "RETURN_NAMES")
+
+
+def test_return_types_follow_dependencies_and_refresh() -> None:
+    """Test that RETURN_TYPES picks up later changes to its dependencies or after a refresh."""
+    samplers = ["euler"]
+
+    class SamplerNode(UtilityNode):
+        RETURN_TYPES_DEPENDENCIES = (lambda: len(samplers),)
+
+        @classmethod
+        def get_input_spec(cls) -> InputSpec:
+            return {"required": {}}
+
+        @classmethod
+        def get_return_types(cls) -> tuple[ComfyType, ...]:
+            return (tuple(samplers),)
+
+        @classmethod
+        def get_return_names(cls) -> tuple[str, ...]:
+            return ("sampler",)
+
+        def process(self) -> NodeOutput:
+            return ("euler",)
+
+    assert SamplerNode.RETURN_TYPES == (("euler",),)
+    samplers.append("custom")
+    assert SamplerNode.RETURN_TYPES == (("euler", "custom"),)
+    assert SamplerNode.RETURN_NAMES == ("sampler",)
+
+    first = SamplerNode.RETURN_TYPES
+    SamplerNode.refresh_return_types()
+    assert SamplerNode.RETURN_TYPES is not first
+
+
+def test_abstract_base_has_no_return_types() -> None:
+    """Test that base classes without get_return_types expose no RETURN_TYPES."""
+    assert not hasattr(UtilityNode, "RETURN_TYPES")
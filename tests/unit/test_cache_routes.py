@@ -0,0 +1,92 @@
+"""Tests for the cache administration HTTP routes."""
+
+import asyncio
+import sys
+import types
+
+import pytest
+
+from weirdion.server import register_cache_routes
+from weirdion.utils.checkpoint_loader import checkpoint_cache
+from weirdion.utils.lora_loader import lora_cache
+
+web = pytest.importorskip("aiohttp.web")
+test_utils = pytest.importorskip("aiohttp.test_utils")
+
+
+@pytest.fixture
+def app(monkeypatch):
+    """Register the cache routes on a fake PromptServer, with one checkpoint and two LoRAs cached."""
+    routes = web.RouteTableDef()
+    server_module = types.ModuleType("server")
+    server_module.PromptServer = types.SimpleNamespace(instance=types.SimpleNamespace(routes=routes))
+    monkeypatch.setitem(sys.modules, "server", server_module)
+    for cache in (checkpoint_cache, lora_cache):
+        monkeypatch.setattr(cache, "_entries", {})
+        monkeypatch.setattr(cache, "_pins", set())
+
+    checkpoint_cache.put("sdxl/base.safetensors", object(), size_bytes=1000, cost_seconds=5.0)
+    lora_cache.put("style.safetensors", object(), size_bytes=10)
+    lora_cache.put("detail.safetensors", object(), size_bytes=20)
+
+    register_cache_routes()
+    application = web.Application()
+    application.add_routes(routes)
+    return application
+
+
+def _request(app, *requests):
+    """Send each (method, path) in one client session; return [(status, json)]."""
+
+    async def runner():
+        async with test_utils.TestClient(test_utils.TestServer(app)) as client:
+            results = []
+            for method, path in requests:
+                response = await client.request(method, path)
+                results.append((response.status, await response.json()))
+            return results
+
+    return asyncio.run(runner())
+
+
+def test_cache_listing_reports_entries(app) -> None:
+    """Test that the listing reports the budget and every resident entry."""
+    ((status, data),) = _request(app, ("GET", "/weirdion/cache"))
+
+    assert status == 200
+    caches = {cache["name"]: cache for cache in data["caches"]}
+    assert caches["checkpoints"]["size_bytes"] == 1000
+    (entry,) = caches["checkpoints"]["items"]
+    assert entry["key"] == "sdxl/base.safetensors"
+    assert {"size_bytes", "age_seconds", "hits", "pinned"} <= set(entry)
+    assert {item["key"] for item in caches["loras"]["items"]} == {"style.safetensors", "detail.safetensors"}
+
+
+def test_pin_evict_and_flush(app) -> None:
+    """Test pinning keys with slashes, evicting one entry and flushing a cache around its pins."""
+    results = _request(
+        app,
+        ("PUT", "/weirdion/cache/checkpoints/pins/sdxl/base.safetensors"),
+        ("PUT", "/weirdion/cache/loras/pins/style.safetensors"),
+        ("DELETE", "/weirdion/cache/checkpoints/entries/missing.safetensors"),
+        ("DELETE", "/weirdion/cache/loras"),
+        ("DELETE", "/weirdion/cache/checkpoints/pins/sdxl/base.safetensors"),
+        ("DELETE", "/weirdion/cache/checkpoints/entries/sdxl/base.safetensors"),
+        ("GET", "/weirdion/cache/nope"),
+    )
+    statuses = [status for status, _data in results]
+    assert statuses == [200, 200, 404, 200, 200, 200, 404]
+    assert results[0][1]["resident"] is True
+    assert results[3][1]["removed"] == {"loras": 1}
+    assert list(lora_cache._entries) == ["style.safetensors"]
+    assert len(checkpoint_cache) == 0
+
+
+def test_flush_all_including_pinned(app) -> None:
+    """Test that ?include_pinned=true flushes pinned entries too."""
+    lora_cache.pin("style.safetensors")
+    ((status, data),) = _request(app, ("DELETE", "/weirdion/cache?include_pinned=true"))
+
+    assert status == 200
+    assert data["removed"]["loras"] == 2
+    assert data["removed"]["checkpoints"] == 1
@@ -0,0 +1,163 @@
+"""Tests for converting pickle checkpoints to safetensors."""
+
+import os
+import sys
+import threading
+import types
+
+import pytest
+
+from weirdion.utils import checkpoint_loader, ckpt_conversion
+from weirdion.utils.ckpt_conversion import ConversionCache
+
+
+@pytest.fixture
+def fake_comfy(monkeypatch):
+    """Read "pickles" as their raw bytes and write conversions as the same bytes."""
+    reads = []
+
+    def load_torch_file(path, safe_load=False):
+        reads.append(path)
+        with open(path, "rb") as handle:
+            return {"weight": handle.read()}
+
+    def save_state_dict(state_dict, path, metadata=None):
+        with open(path, "wb") as handle:
+            handle.write(state_dict["weight"])
+
+    comfy = types.ModuleType("comfy")
+    comfy.utils = types.SimpleNamespace(load_torch_file=load_torch_file)
+    monkeypatch.setitem(sys.modules, "comfy", comfy)
+    monkeypatch.setitem(sys.modules, "comfy.utils", comfy.utils)
+    monkeypatch.setattr(ckpt_conversion, "save_state_dict", save_state_dict)
+    return reads
+
+
+def _checkpoint(tmp_path, name, content=b"weights"):
+    path = tmp_path / "checkpoints" / name
+    path.parent.mkdir(exist_ok=True)
+    path.write_bytes(content)
+    return str(path)
+
+
+def test_conversion_is_found_by_later_loads(tmp_path, fake_comfy) -> None:
+    """Test that a converted checkpoint is used until its source changes."""
+    cache = ConversionCache(tmp_path / "conversions")
+    source = _checkpoint(tmp_path, "model.ckpt")
+
+    assert cache.converted_path(source) is None
+    converted = cache.convert(source)
+
+    assert converted.endswith(".safetensors")
+    assert cache.path_for_load(source) == converted
+    assert fake_comfy == [source]
+
+    with open(source, "ab") as handle:
+        handle.write(b" retrained")
+    assert cache.converted_path(source) is None
+
+
+def test_identical_sources_share_one_conversion(tmp_path, fake_comfy) -> None:
+    """Test that conversions are keyed by content hash, not by name."""
+    cache = ConversionCache(tmp_path / "conversions")
+    first = cache.convert(_checkpoint(tmp_path, "model.ckpt"))
+    second = cache.convert(_checkpoint(tmp_path, "copy-of-model.pt"))
+
+    assert first == second
+    assert cache.conversions == 1
+    assert len(cache.entries()[0]["sources"]) == 2
+
+
+def test_quota_evicts_least_recently_used(tmp_path, fake_comfy) -> None:
+    """Test that the conversion cache stays within its disk quota, oldest use first."""
+    cache = ConversionCache(tmp_path / "conversions", quota_bytes=25)
+    sources = [_checkpoint(tmp_path, f"model-{index}.ckpt", bytes([index]) * 10) for index in range(3)]
+    for index, source in enumerate(sources[:2]):
+        os.utime(cache.convert(source), (index, index))
+    # Using model-0 makes model-1 the least recently used
+    assert cache.path_for_load(sources[0]) != sources[0]
+
+    cache.convert(sources[2])
+
+    assert cache.converted_path(sources[1]) is None
+    assert cache.converted_path(sources[0]) is not None
+    assert cache.converted_path(sources[2]) is not None
+    assert cache.evictions == 1
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="uses fcntl")
+def test_index_updates_wait_for_other_processes(tmp_path, fake_comfy) -> None:
+    """Test that the index is updated only while no other process holds its lock file."""
+    import fcntl
+
+    cache = ConversionCache(tmp_path / "conversions")
+    source = _checkpoint(tmp_path, "model.ckpt")
+    cache.directory.mkdir(parents=True)
+    with open(cache.directory / "index.json.lock", "a+b") as other_process:
+        fcntl.flock(other_process.fileno(), fcntl.LOCK_EX)
+        converting = threading.Thread(target=cache.convert, args=(source,))
+        converting.start()
+        converting.join(timeout=0.2)
+        assert converting.is_alive()
+        assert not (cache.directory / "index.json").exists()
+        fcntl.flock(other_process.fileno(), fcntl.LOCK_UN)
+    converting.join()
+
+    assert cache.converted_path(source) is not None
+
+
+def test_first_load_schedules_a_background_conversion(tmp_path, fake_comfy) -> None:
+    """Test that loading an unconverted pickle reads it directly and converts it in the background."""
+    cache = ConversionCache(tmp_path / "conversions")
+    source = _checkpoint(tmp_path, "model.ckpt")
+    safetensors = _checkpoint(tmp_path, "model.safetensors")
+
+    assert cache.path_for_load(safetensors) == safetensors
+    assert cache.path_for_load(source) == source
+
+    cache._executor.shutdown(wait=True)
+    assert cache.stats()["conversions_cached"] == 1
+    assert cache.path_for_load(source).startswith(str(tmp_path / "conversions"))
+
+
+def test_loader_reads_conversions_only_when_enabled(tmp_path, fake_comfy, monkeypatch) -> None:
+    """Test that the checkpoint loader reads the conversion only with WEIRDION_CONVERT_CKPT=1."""
+    cache = ConversionCache(tmp_path / "conversions")
+    source = _checkpoint(tmp_path, "model.ckpt")
+    converted = cache.convert(source)
+    monkeypatch.setattr(ckpt_conversion, "_cache", cache)
+
+    monkeypatch.delenv(ckpt_conversion.CONVERT_ENV, raising=False)
+    assert checkpoint_loader._path_for_load(source) == source
+
+    monkeypatch.setenv(ckpt_conversion.CONVERT_ENV, "1")
+    assert checkpoint_loader._path_for_load(source) == converted
+
+    monkeypatch.setenv(ckpt_conversion.CONVERT_ENV, "0")
+    assert checkpoint_loader._path_for_load(source) == source
+
+
+def test_evicting_a_converted_checkpoint_releases_the_conversion(tmp_path, fake_comfy, monkeypatch) -> None:
+    """Test that a checkpoint loaded from its conversion drops the conversion's pages on eviction."""
+    cache = ConversionCache(tmp_path / "conversions")
+    source = _checkpoint(tmp_path, "model.ckpt")
+    converted = cache.convert(source)
+    monkeypatch.setattr(ckpt_conversion, "_cache", cache)
+    monkeypatch.setenv(ckpt_conversion.CONVERT_ENV, "1")
+    read = []
+    released = []
+    monkeypatch.setattr(checkpoint_loader, "_load_uncached", lambda *args: read.append(args[-1]) or (1, 2, 3))
+    monkeypatch.setattr(checkpoint_loader, "release_page_cache", released.append)
+
+    checkpoint_loader._load_and_cache(None, None, "model.ckpt", source, None)
+    checkpoint_loader.checkpoint_cache.evict("model.ckpt")
+
+    assert read == released == [converted]
+
+
+def test_default_directory_is_in_comfyui_user_directory(tmp_path, monkeypatch) -> None:
+    """Test that conversions default to weirdion/conversions in ComfyUI's user directory."""
+    folder_paths = types.SimpleNamespace(get_user_directory=lambda: str(tmp_path / "user"))
+    monkeypatch.setitem(sys.modules, "folder_paths", folder_paths)
+
+    assert ckpt_conversion._default_directory() == tmp_path / "user" / "weirdion" / "conversions"
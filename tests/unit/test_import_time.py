@@ -0,0 +1,50 @@
+"""Import-time budget for the package entry point."""
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+SRC_DIR = Path(__file__).resolve().parents[2] / "src"
+
+# Generous wall-clock ceiling for `import weirdion` in a fresh interpreter
+IMPORT_BUDGET_SECONDS = 0.5
+
+_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import weirdion
+elapsed = time.perf_counter() - start
+node_count = len(weirdion.NODE_CLASS_MAPPINGS)
+print(json.dumps({"elapsed": elapsed, "modules": sorted(sys.modules), "nodes": node_count}))
+"""
+
+
+def _probe() -> dict:
+    result = subprocess.run(
+        [sys.executable, "-c", _PROBE],
+        capture_output=True,
+        check=True,
+        text=True,
+        env={**os.environ, "PYTHONPATH": str(SRC_DIR)},
+    )
+    return json.loads(result.stdout)
+
+
+def test_import_does_not_load_node_modules() -> None:
+    """Test that importing the package declares every node without importing any node module."""
+    probe = _probe()
+
+    node_modules = [
+        name
+        for name in probe["modules"]
+        if name.startswith(("weirdion.nodes.loaders.", "weirdion.nodes.prompting.", "comfy", "folder_paths"))
+    ]
+    assert node_modules == []
+    assert probe["nodes"] == 6
+
+
+def test_import_stays_within_budget() -> None:
+    """Test that importing the package stays well under the startup budget."""
+    assert _probe()["elapsed"] < IMPORT_BUDGET_SECONDS
@@ -32,3 +32,31 @@ def test_load_checkpoint_return_names() -> None:
 def test_load_checkpoint_category() -> None:
     """Test that node is in correct category."""
     assert LoadCheckpointNode.CATEGORY == "weirdion/loaders"
+
+
+def test_validate_inputs_accepts_listed_checkpoint(model_listings) -> None:
+    """Test that a listed checkpoint passes queue-time validation."""
+    model_listings["checkpoints"] = ["model.safetensors"]
+
+    assert LoadCheckpointNode.VALIDATE_INPUTS(checkpoint="model.safetensors") is True
+
+
+def test_validate_inputs_rejects_missing_checkpoint(model_listings) -> None:
+    """Test that an unlisted checkpoint or the placeholder is rejected at queue time."""
+    model_listings["checkpoints"] = ["model.safetensors"]
+
+    assert (
+        LoadCheckpointNode.VALIDATE_INPUTS(checkpoint="gone.safetensors") == "Checkpoint not found: 'gone.safetensors'"
+    )
+    assert LoadCheckpointNode.VALIDATE_INPUTS(checkpoint="Select Checkpoint") == "checkpoint is required"
+    assert LoadCheckpointNode.VALIDATE_INPUTS() is True
+
+
+def test_validate_inputs_accepts_checkpoint_added_after_index_was_built(model_listings) -> None:
+    """Test that a checkpoint added since the last lookup passes validation on the first queue."""
+    model_listings["checkpoints"] = ["model.safetensors"]
+    for _ in range(2):
+        assert LoadCheckpointNode.VALIDATE_INPUTS(checkpoint="model.safetensors") is True
+
+    model_listings["checkpoints"] = ["model.safetensors", "new.safetensors"]
+    assert LoadCheckpointNode.VALIDATE_INPUTS(checkpoint="new.safetensors") is True
@@ -33,3 +33,22 @@ def test_load_checkpoint_with_clip_skip_return_names() -> None:
 def test_load_checkpoint_with_clip_skip_category() -> None:
     """Test that node is in correct category."""
     assert LoadCheckpointWithClipSkipNode.CATEGORY == "weirdion/loaders"
+
+
+def test_validate_inputs_accepts_listed_checkpoint(model_listings) -> None:
+    """Test that a listed checkpoint passes queue-time validation."""
+    model_listings["checkpoints"] = ["model.safetensors"]
+
+    assert LoadCheckpointWithClipSkipNode.VALIDATE_INPUTS(checkpoint="model.safetensors") is True
+
+
+def test_validate_inputs_rejects_missing_checkpoint(model_listings) -> None:
+    """Test that an unlisted checkpoint or the placeholder is rejected at queue time."""
+    model_listings["checkpoints"] = ["model.safetensors"]
+
+    assert (
+        LoadCheckpointWithClipSkipNode.VALIDATE_INPUTS(checkpoint="gone.safetensors")
+        == "Checkpoint not found: 'gone.safetensors'"
+    )
+    assert LoadCheckpointWithClipSkipNode.VALIDATE_INPUTS(checkpoint="Select Checkpoint") == "checkpoint is required"
+    assert LoadCheckpointWithClipSkipNode.VALIDATE_INPUTS() is True
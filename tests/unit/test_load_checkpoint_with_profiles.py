@@ -1,6 +1,7 @@
 """Tests for LoadCheckpointWithProfilesNode."""
 
 from weirdion.nodes.loaders import LoadCheckpointWithProfilesNode
+from weirdion.utils.profile_store import DEFAULT_PROFILE_NAME, save_user_profiles
 
 
 def test_load_checkpoint_with_profiles_input_spec() -> None:
@@ -64,3 +65,50 @@ def test_load_checkpoint_with_profiles_return_names() -> None:
 def test_load_checkpoint_with_profiles_category() -> None:
     """Test that node is in correct category."""
     assert LoadCheckpointWithProfilesNode.CATEGORY == "weirdion/loaders"
+
+
+def _save_profiles(checkpoint_defaults=None) -> None:
+    profile = {
+        "steps": 20,
+        "cfg": 7.0,
+        "sampler": "euler",
+        "scheduler": "normal",
+        "denoise": 1.0,
+        "clip_skip": -1,
+        "note": "",
+        "checkpoints": ["model.safetensors"],
+    }
+    save_user_profiles({"profiles": {"Fast": profile}, "checkpoint_defaults": checkpoint_defaults or {}})
+
+
+def test_validate_inputs_accepts_checkpoint_and_profile(model_listings, profile_config_dir) -> None:
+    """Test that a listed checkpoint with an existing or unsaved profile passes validation."""
+    model_listings["checkpoints"] = ["model.safetensors"]
+    _save_profiles()
+
+    validate = LoadCheckpointWithProfilesNode.VALIDATE_INPUTS
+    assert validate(checkpoint="model.safetensors", profile="Fast") is True
+    assert validate(checkpoint="model.safetensors", profile="Fast (unsaved)") is True
+    assert validate(checkpoint="model.safetensors", profile=DEFAULT_PROFILE_NAME) is True
+
+
+def test_validate_inputs_rejects_missing_checkpoint_or_profile(model_listings, profile_config_dir) -> None:
+    """Test that a missing checkpoint or deleted profile is rejected at queue time."""
+    model_listings["checkpoints"] = ["model.safetensors"]
+    _save_profiles()
+
+    validate = LoadCheckpointWithProfilesNode.VALIDATE_INPUTS
+    assert validate(checkpoint="gone.safetensors", profile="Fast") == "Checkpoint not found: 'gone.safetensors'"
+    assert validate(checkpoint="Select Checkpoint", profile="Fast") == "checkpoint is required"
+    assert validate(checkpoint="model.safetensors", profile="Deleted") == "Profile not found: 'Deleted'"
+
+
+def test_validate_inputs_follows_checkpoint_default(model_listings, profile_config_dir) -> None:
+    """Test that the default profile is checked through the checkpoint's mapped default."""
+    model_listings["checkpoints"] = ["model.safetensors"]
+    _save_profiles({"model.safetensors": "Fast"})
+
+    validate = LoadCheckpointWithProfilesNode.VALIDATE_INPUTS
+    assert validate(checkpoint="model.safetensors", profile=DEFAULT_PROFILE_NAME) is True
+    # A linked checkpoint is unknown at queue time, so only the profile is checked
+    assert validate(profile="Fast") is True
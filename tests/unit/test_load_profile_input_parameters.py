@@ -1,6 +1,7 @@
 """Tests for LoadProfileInputParametersNode."""
 
 from weirdion.nodes.loaders import LoadProfileInputParametersNode
+from weirdion.utils.profile_store import DEFAULT_PROFILE_NAME
 
 
 def test_load_profile_input_parameters_input_spec() -> None:
@@ -50,3 +51,12 @@ def test_load_profile_input_parameters_return_names() -> None:
 def test_load_profile_input_parameters_category() -> None:
     """Test that node is in correct category."""
     assert LoadProfileInputParametersNode.CATEGORY == "weirdion/loaders"
+
+
+def test_validate_inputs_checks_profile_exists(profile_config_dir) -> None:
+    """Test that an unknown profile is rejected at queue time and the default passes."""
+    validate = LoadProfileInputParametersNode.VALIDATE_INPUTS
+
+    assert validate(profile=DEFAULT_PROFILE_NAME) is True
+    assert validate(profile="Deleted") == "Profile not found: 'Deleted'"
+    assert validate(profile="Deleted (unsaved)") == "Profile not found: 'Deleted'"
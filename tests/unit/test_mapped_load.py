@@ -0,0 +1,131 @@
+"""Tests for zero-copy checkpoint loads and their mapped/copied accounting."""
+
+import sys
+import types
+
+import pytest
+
+from weirdion.utils import mapped_load
+from weirdion.utils.mapped_load import account_weights, mapped_load_enabled
+
+
+class FakeTensor:
+    """Just enough of a tensor for address-range accounting."""
+
+    def __init__(self, address, nbytes, device="cpu"):
+        self.address = address
+        self.nbytes = nbytes
+        self.device = types.SimpleNamespace(type=device)
+
+    def data_ptr(self):
+        return self.address
+
+
+def _model(tensors):
+    module = types.SimpleNamespace(state_dict=lambda keep_vars=False: tensors)
+    return types.SimpleNamespace(model=module)
+
+
+def test_account_weights_splits_mapped_copied_and_device_bytes() -> None:
+    """Test that weights inside a mapped tensor's range count as mapped, other CPU weights as copied."""
+    mapped_weight = FakeTensor(1000, 400)
+    weights = {"model.diffusion_model.weight": mapped_weight, "first_stage_model.bias": FakeTensor(5000, 100)}
+    shared = FakeTensor(1000, 200)
+    model = _model({"diffusion_model.weight": FakeTensor(1100, 300), "diffusion_model.tied": shared})
+    clip = types.SimpleNamespace(patcher=_model({"clip_l.weight": FakeTensor(9000, 50), "clip_l.tied": shared}))
+    vae = types.SimpleNamespace(patcher=_model({"decoder.weight": FakeTensor(1, 70, device="cuda")}))
+
+    mapped, copied, device = account_weights((model, clip, vae), weights)
+
+    assert (mapped, copied, device) == (500, 50, 70)
+
+
+def test_account_weights_without_mapping_counts_everything_copied() -> None:
+    """Test that a load that mapped nothing reports all CPU weights as copied."""
+    model = _model({"weight": FakeTensor(1000, 400)})
+
+    assert account_weights((model, None, "not a model"), None) == (0, 400, 0)
+
+
+def test_suffix_index_drops_ambiguous_names() -> None:
+    """Test that only suffixes naming one tensor are used to match model weights to file weights."""
+    first, second = object(), object()
+    index = mapped_load._index_by_suffix(
+        {"conditioner.embedders.0.proj.weight": first, "conditioner.embedders.1.proj.weight": second}
+    )
+
+    assert mapped_load._find_by_suffix(index, "clip.0.proj.weight") is first
+    assert mapped_load._find_by_suffix(index, "clip.proj.weight") is None
+
+
+def test_mapped_load_mode(monkeypatch) -> None:
+    """Test that loads are mapped when forced, or automatically when ComfyUI keeps weights on the CPU."""
+    model_management = types.ModuleType("comfy.model_management")
+    model_management.get_torch_device = lambda: types.SimpleNamespace(type="cuda")
+    model_management.vram_state = types.SimpleNamespace(name="NORMAL_VRAM")
+    comfy = types.ModuleType("comfy")
+    comfy.model_management = model_management
+    monkeypatch.setitem(sys.modules, "comfy", comfy)
+    monkeypatch.setitem(sys.modules, "comfy.model_management", model_management)
+    monkeypatch.delenv(mapped_load.MMAP_LOAD_ENV, raising=False)
+
+    assert not mapped_load_enabled()
+    model_management.vram_state = types.SimpleNamespace(name="NO_VRAM")
+    assert mapped_load_enabled()
+    monkeypatch.setenv(mapped_load.MMAP_LOAD_ENV, "0")
+    assert not mapped_load_enabled()
+    model_management.vram_state = types.SimpleNamespace(name="HIGH_VRAM")
+    monkeypatch.setenv(mapped_load.MMAP_LOAD_ENV, "1")
+    assert mapped_load_enabled()
+
+
+def test_adopt_mapped_weights_replaces_identical_copies() -> None:
+    """Test that CPU weights equal to a mapped tensor are pointed at it, and converted ones are kept."""
+    torch = pytest.importorskip("torch")
+    mapped = {
+        "model.diffusion_model.weight": torch.arange(4, dtype=torch.float32),
+        "model.diffusion_model.bias": torch.ones(2, dtype=torch.float32),
+    }
+    module = torch.nn.Module()
+    module.weight = torch.nn.Parameter(mapped["model.diffusion_model.weight"].clone())
+    module.bias = torch.nn.Parameter(mapped["model.diffusion_model.bias"].half())
+    model = types.SimpleNamespace(model=module)
+
+    adopted = mapped_load.adopt_mapped_weights((model,), mapped)
+
+    assert adopted == 16
+    assert module.weight.data_ptr() == mapped["model.diffusion_model.weight"].data_ptr()
+    assert account_weights((model,), mapped) == (16, 4, 0)
+
+
+def test_checkpoint_loads_report_mapped_and_copied_bytes(monkeypatch, tmp_path) -> None:
+    """Test that a mapped checkpoint load maps the file, adopts copies and records a load report."""
+    from weirdion.utils import checkpoint_loader
+
+    weights = {"model.diffusion_model.weight": FakeTensor(1000, 400), "vae.weight": FakeTensor(2000, 100)}
+    outputs = (_model({"diffusion_model.weight": FakeTensor(1000, 400)}), None, _model({"w": FakeTensor(50, 30)}))
+    consumed = []
+
+    def guess_config(state_dict, **kwargs):
+        consumed.append(dict(state_dict))
+        state_dict.clear()
+        return (*outputs, None)
+
+    comfy = types.ModuleType("comfy")
+    comfy.sd = types.SimpleNamespace(load_state_dict_guess_config=guess_config)
+    comfy.utils = types.SimpleNamespace()
+    folder_paths = types.SimpleNamespace(get_folder_paths=lambda kind: [])
+    monkeypatch.setenv(mapped_load.MMAP_LOAD_ENV, "1")
+    monkeypatch.setattr(checkpoint_loader, "get_shared_tier", lambda: None)
+    monkeypatch.setattr(checkpoint_loader, "map_state_dict", lambda path: (dict(weights), None))
+    adopted = []
+    monkeypatch.setattr(checkpoint_loader, "adopt_mapped_weights", lambda outputs, mapped: adopted.append(mapped) or 0)
+
+    path = str(tmp_path / "model.safetensors")
+    assert checkpoint_loader._load_uncached(comfy, folder_paths, path) == outputs
+
+    assert consumed == adopted == [weights]
+    report = checkpoint_loader.get_load_reports()[-1]
+    assert report["path"] == path
+    assert report["mapped"] is True
+    assert (report["mapped_bytes"], report["copied_bytes"], report["device_bytes"]) == (400, 30, 0)
@@ -0,0 +1,131 @@
+"""Tests for the model listing search index."""
+
+import pytest
+
+from weirdion.utils import model_index
+from weirdion.utils.model_index import ModelIndex, get_model_index
+
+NAMES = [
+    "sdxl/PonyV6.safetensors",
+    "anime/ponytail.safetensors",
+    "Realistic.ckpt",
+    "pony_style.safetensors",
+    "detail.pt",
+]
+
+
+def test_search_without_query_lists_everything_sorted() -> None:
+    """Test that an empty query pages through all names in case-insensitive order."""
+    index = ModelIndex(NAMES)
+
+    total, items = index.search()
+    assert total == 5
+    assert items == ["anime/ponytail.safetensors", "detail.pt", "pony_style.safetensors", "Realistic.ckpt", NAMES[0]]
+
+
+def test_search_puts_prefix_matches_first() -> None:
+    """Test that names starting with the query come before other substring matches."""
+    index = ModelIndex(NAMES)
+
+    total, items = index.search("PONY")
+    assert total == 3
+    assert items == ["pony_style.safetensors", "anime/ponytail.safetensors", "sdxl/PonyV6.safetensors"]
+
+
+def test_search_paginates() -> None:
+    """Test that offset and limit select a page while total counts every match."""
+    index = ModelIndex(NAMES)
+
+    assert index.search("pony", offset=1, limit=1) == (3, ["anime/ponytail.safetensors"])
+    assert index.search("pony", offset=5, limit=10) == (3, [])
+
+
+def test_resolve_matches_loosely_written_names() -> None:
+    """Test exact, case-insensitive, extensionless and stem-only resolution."""
+    index = ModelIndex(NAMES)
+
+    assert index.resolve("detail.pt") == "detail.pt"
+    assert index.resolve("realistic.CKPT") == "Realistic.ckpt"
+    assert index.resolve("sdxl/ponyv6") == "sdxl/PonyV6.safetensors"
+    assert index.resolve("ponytail") == "anime/ponytail.safetensors"
+    assert index.resolve("missing") is None
+
+
+def test_get_model_index_rebuilds_only_when_listing_changes(monkeypatch) -> None:
+    """Test that the cached index is reused until the folder listing changes."""
+    listing = ["a.safetensors"]
+    monkeypatch.setattr(model_index, "_list_models", lambda kind: list(listing))
+    monkeypatch.setattr(model_index, "_indexes", {})
+
+    first = get_model_index("loras")
+    assert get_model_index("loras") is first
+
+    listing.append("b.safetensors")
+    second = get_model_index("loras")
+    assert second is not first
+    assert second.revision > first.revision
+    assert len(second) == 2
+
+
+def test_get_model_index_skips_comparison_while_comfy_cache_entry_is_unchanged(monkeypatch) -> None:
+    """Test that names are only compared when ComfyUI's cached listing entry is replaced."""
+    listing = ["a.safetensors"]
+    comparisons = []
+    entry = {"loras": (listing, {}, 0.0)}
+
+    class Names(list):
+        def __iter__(self):
+            comparisons.append(True)
+            return super().__iter__()
+
+    monkeypatch.setattr(model_index, "_list_models", lambda kind: Names(listing))
+    monkeypatch.setattr(model_index, "_listing_source", lambda kind: entry.get(kind))
+    monkeypatch.setattr(model_index, "_indexes", {})
+    monkeypatch.setattr(model_index, "_sources", {})
+
+    first = get_model_index("loras")
+    comparisons.clear()
+    assert get_model_index("loras") is first
+    assert get_model_index("loras") is first
+    assert comparisons == []
+
+    # A rebuilt entry with the same names keeps the index and its revision
+    entry["loras"] = (list(listing), {}, 1.0)
+    assert get_model_index("loras") is first
+    assert comparisons
+
+    listing.append("b.safetensors")
+    entry["loras"] = (list(listing), {}, 2.0)
+    second = get_model_index("loras")
+    assert len(second) == 2
+    assert second.revision > first.revision
+
+
+def test_get_model_index_sees_a_change_on_the_call_that_lists_it(monkeypatch) -> None:
+    """Test that a cache entry replaced during the listing call rebuilds the index on that call."""
+    files = ["a.safetensors"]
+    cache: dict[str, tuple] = {}
+
+    def get_filename_list(kind):
+        # Like folder_paths.get_filename_list: replace the entry when the folder changed
+        entry = cache.get(kind)
+        if entry is None or entry[0] != files:
+            entry = cache[kind] = (list(files), {}, 0.0)
+        return list(entry[0])
+
+    monkeypatch.setattr(model_index, "_list_models", get_filename_list)
+    monkeypatch.setattr(model_index, "_listing_source", cache.get)
+    monkeypatch.setattr(model_index, "_indexes", {})
+    monkeypatch.setattr(model_index, "_sources", {})
+
+    first = get_model_index("loras")
+    assert get_model_index("loras") is first
+
+    files.append("b.safetensors")
+    assert get_model_index("loras").names == ("a.safetensors", "b.safetensors")
+
+
+def test_get_model_index_rejects_unknown_kind() -> None:
+    """Test that only known model folders can be indexed."""
+    with pytest.raises(ValueError, match="Unknown model kind"):
+        get_model_index("vae_approx")
@@ -0,0 +1,76 @@
+"""Tests for the model listing HTTP routes."""
+
+import asyncio
+import sys
+import types
+
+import pytest
+
+from weirdion.server import model_routes, register_model_routes
+from weirdion.utils import model_index
+
+web = pytest.importorskip("aiohttp.web")
+test_utils = pytest.importorskip("aiohttp.test_utils")
+
+
+@pytest.fixture
+def app(monkeypatch):
+    """Register the model routes on a fake PromptServer with a fixed LoRA listing."""
+    routes = web.RouteTableDef()
+    server_module = types.ModuleType("server")
+    server_module.PromptServer = types.SimpleNamespace(instance=types.SimpleNamespace(routes=routes))
+    monkeypatch.setitem(sys.modules, "server", server_module)
+
+    listing = [f"style_{i:03d}.safetensors" for i in range(120)] + ["detail.safetensors"]
+    monkeypatch.setattr(model_index, "_list_models", lambda kind: listing if kind == "loras" else [])
+    monkeypatch.setattr(model_index, "_indexes", {})
+
+    register_model_routes()
+    application = web.Application()
+    application.add_routes(routes)
+    return application
+
+
+def _get(app, *requests):
+    """GET each (path, params) pair in one client session; return [(status, json)]."""
+
+    async def runner():
+        async with test_utils.TestClient(test_utils.TestServer(app)) as client:
+            results = []
+            for path, params in requests:
+                response = await client.get(path, params=params)
+                results.append((response.status, await response.json()))
+            return results
+
+    return asyncio.run(runner())
+
+
+def test_models_route_paginates_search_results(app) -> None:
+    """Test that the route returns one page of matches with the total count."""
+    ((status, data),) = _get(app, ("/weirdion/models/loras", {"q": "STYLE_1", "offset": "5", "limit": "10"}))
+
+    assert status == 200
+    assert data["total"] == 20
+    assert data["items"] == [f"style_{i:03d}.safetensors" for i in range(105, 115)]
+
+
+def test_models_route_caps_page_size(app, monkeypatch) -> None:
+    """Test that an oversized limit is clamped to the maximum page size."""
+    monkeypatch.setattr(model_routes, "MAX_PAGE_SIZE", 100)
+    ((status, data),) = _get(app, ("/weirdion/models/loras", {"limit": "100000"}))
+
+    assert status == 200
+    assert data["total"] == 121
+    assert data["limit"] == 100
+    assert len(data["items"]) == 100
+
+
+def test_models_route_rejects_bad_input(app) -> None:
+    """Test that unknown kinds and malformed pagination are client errors."""
+    results = _get(
+        app,
+        ("/weirdion/models/unknown", {}),
+        ("/weirdion/models/loras", {"offset": "-1"}),
+        ("/weirdion/models/loras", {"limit": "ten"}),
+    )
+    assert [status for status, _data in results] == [400, 400, 400]
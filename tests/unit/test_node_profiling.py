@@ -0,0 +1,162 @@
+"""Tests for per-node execution profiling."""
+
+import asyncio
+import sys
+import tracemalloc
+import types
+
+import pytest
+
+from weirdion.core import BaseNode, profiling
+from weirdion.core.profiling import (
+    disable_node_profiling,
+    enable_node_profiling,
+    get_node_stats,
+    record_cache_event,
+    reset_node_stats,
+)
+
+
+class _EchoNode(BaseNode):
+    @classmethod
+    def get_input_spec(cls):
+        return {"required": {"text": ("STRING", {})}}
+
+    @classmethod
+    def get_return_types(cls):
+        return ("STRING",)
+
+    def process(self, text: str):
+        record_cache_event("echo", hit=text == "cached")
+        if text == "boom":
+            raise RuntimeError("boom")
+        return (text * 1000,)
+
+
+class _LoudEchoNode(_EchoNode):
+    def process(self, text: str):
+        return super().process(text.upper())
+
+
+@pytest.fixture(autouse=True)
+def profiling_state():
+    """Start each test with profiling off and no statistics."""
+    disable_node_profiling()
+    reset_node_stats()
+    yield
+    disable_node_profiling()
+    reset_node_stats()
+
+
+def test_disabled_profiling_records_nothing() -> None:
+    """Test that nodes run normally and record nothing while profiling is off."""
+    assert _EchoNode().process("a") == ("a" * 1000,)
+    assert get_node_stats()["nodes"] == {}
+
+
+def test_profiling_records_calls_errors_and_cache_events() -> None:
+    """Test that timings, failures and cache events are aggregated per node class."""
+    enable_node_profiling()
+    node = _EchoNode()
+    node.process("cached")
+    node.process("fresh")
+    with pytest.raises(RuntimeError):
+        node.process("boom")
+
+    stats = get_node_stats()["nodes"]["_EchoNode"]
+    assert stats["calls"] == 3
+    assert stats["errors"] == 1
+    assert stats["wall_seconds_total"] >= stats["wall_seconds_max"] > 0
+    assert stats["cache_events"]["echo"] == {"hits": 1, "misses": 2, "hit_rate": 1 / 3}
+    assert stats["memory_samples"] == 0
+
+
+def test_super_process_is_measured_once() -> None:
+    """Test that a subclass calling super().process() counts as one call of the subclass."""
+    enable_node_profiling()
+    assert _LoudEchoNode().process("cached") == ("CACHED" * 1000,)
+
+    nodes = get_node_stats()["nodes"]
+    assert list(nodes) == ["_LoudEchoNode"]
+    assert nodes["_LoudEchoNode"]["calls"] == 1
+    assert nodes["_LoudEchoNode"]["cache_events"]["echo"]["misses"] == 1
+
+
+def test_memory_tracing_is_sampled() -> None:
+    """Test that allocation peaks are measured on one call in every N."""
+    enable_node_profiling(trace_memory=True, memory_sample_every=2)
+    node = _EchoNode()
+    for _ in range(5):
+        node.process("x")
+
+    stats = get_node_stats()["nodes"]["_EchoNode"]
+    assert stats["calls"] == 5
+    assert stats["memory_samples"] == 3
+    assert stats["peak_alloc_bytes_max"] >= 1000
+
+
+def test_tracemalloc_is_stopped_when_memory_tracing_ends() -> None:
+    """Test that tracemalloc started by profiling stops when profiling or memory tracing is turned off."""
+    node = _EchoNode()
+    enable_node_profiling(trace_memory=True)
+    node.process("x")
+    assert tracemalloc.is_tracing()
+    disable_node_profiling()
+    assert not tracemalloc.is_tracing()
+
+    enable_node_profiling(trace_memory=True)
+    node.process("x")
+    enable_node_profiling(trace_memory=False)
+    assert not tracemalloc.is_tracing()
+
+
+def test_tracemalloc_started_elsewhere_keeps_running() -> None:
+    """Test that disabling profiling leaves tracemalloc alone if something else started it."""
+    tracemalloc.start()
+    try:
+        enable_node_profiling(trace_memory=True)
+        _EchoNode().process("x")
+        disable_node_profiling()
+        assert tracemalloc.is_tracing()
+    finally:
+        tracemalloc.stop()
+
+
+def test_cache_events_outside_nodes_are_ignored() -> None:
+    """Test that cache events reported outside a profiled process() are dropped."""
+    enable_node_profiling()
+    record_cache_event("echo", hit=True)
+    assert get_node_stats()["nodes"] == {}
+
+
+def test_stats_routes(monkeypatch) -> None:
+    """Test that the stats routes toggle profiling, report and reset statistics."""
+    web = pytest.importorskip("aiohttp.web")
+    test_utils = pytest.importorskip("aiohttp.test_utils")
+    from weirdion.server import register_stats_routes
+
+    routes = web.RouteTableDef()
+    server_module = types.ModuleType("server")
+    server_module.PromptServer = types.SimpleNamespace(instance=types.SimpleNamespace(routes=routes))
+    monkeypatch.setitem(sys.modules, "server", server_module)
+    register_stats_routes()
+    app = web.Application()
+    app.add_routes(routes)
+
+    async def scenario():
+        async with test_utils.TestClient(test_utils.TestServer(app)) as client:
+            bad = await client.post("/weirdion/stats/nodes", json={"enabled": "yes"})
+            enabled = await client.post("/weirdion/stats/nodes", json={"enabled": True, "trace_memory": True})
+            _EchoNode().process("x")
+            stats = await (await client.get("/weirdion/stats/nodes")).json()
+            reset = await (await client.delete("/weirdion/stats/nodes")).json()
+            return bad.status, enabled.status, stats, reset
+
+    bad_status, enabled_status, stats, reset = asyncio.run(scenario())
+    assert bad_status == 400
+    assert enabled_status == 200
+    assert stats["enabled"] is True
+    assert stats["trace_memory"] is True
+    assert stats["nodes"]["_EchoNode"]["calls"] == 1
+    assert reset["nodes"] == {}
+    assert profiling.is_node_profiling_enabled()
@@ -0,0 +1,322 @@
+"""Tests for the profile manager HTTP routes."""
+
+import asyncio
+import json
+import sys
+import threading
+import time
+import types
+from urllib.parse import quote
+
+import pytest
+
+from weirdion.server import profile_routes, register_profile_routes
+from weirdion.utils import profile_store
+
+web = pytest.importorskip("aiohttp.web")
+test_utils = pytest.importorskip("aiohttp.test_utils")
+
+PROFILE = {
+    "steps": 20,
+    "cfg": 7.0,
+    "sampler": "euler",
+    "scheduler": "normal",
+    "denoise": 1.0,
+    "clip_skip": -1,
+    "note": "",
+    "checkpoints": [],
+}
+
+
+@pytest.fixture
+def prompt_server(profile_config_dir, monkeypatch):
+    """A fake PromptServer instance that records websocket messages in .sent."""
+    sent = []
+    instance = types.SimpleNamespace(
+        routes=web.RouteTableDef(),
+        sent=sent,
+        send_sync=lambda event, data, sid=None: sent.append((event, data)),
+    )
+    server_module = types.ModuleType("server")
+    server_module.PromptServer = types.SimpleNamespace(instance=instance)
+    monkeypatch.setitem(sys.modules, "server", server_module)
+    yield instance
+    profile_store.remove_profile_listener(profile_routes._push_profile_change)
+
+
+@pytest.fixture
+def app(prompt_server):
+    """Register the profile routes on the fake PromptServer."""
+    register_profile_routes()
+    application = web.Application()
+    application.add_routes(prompt_server.routes)
+    return application
+
+
+def _run(app, scenario):
+    async def runner():
+        async with test_utils.TestClient(test_utils.TestServer(app)) as client:
+            return await scenario(client)
+
+    return asyncio.run(runner())
+
+
+def test_get_profiles_supports_if_none_match(app) -> None:
+    """Test that an unchanged store answers a conditional GET with 304."""
+
+    async def scenario(client):
+        first = await client.get("/weirdion/profiles")
+        etag = first.headers["ETag"]
+        second = await client.get("/weirdion/profiles", headers={"If-None-Match": etag})
+        return first.status, second.status, second.headers["ETag"] == etag
+
+    assert _run(app, scenario) == (200, 304, True)
+
+
+def test_patch_profile_changes_etag(app) -> None:
+    """Test that a PATCH creates a profile and invalidates the ETag."""
+
+    async def scenario(client):
+        etag = (await client.get("/weirdion/profiles")).headers["ETag"]
+        patched = await client.patch("/weirdion/profiles/Fast", json=PROFILE)
+        again = await client.get("/weirdion/profiles", headers={"If-None-Match": etag})
+        return patched.status, again.status, (await again.json())["profiles"]["Fast"]["steps"]
+
+    assert _run(app, scenario) == (200, 200, 20)
+
+
+def test_patch_merges_partial_changes(app) -> None:
+    """Test that PATCH only needs the changed fields for an existing profile."""
+
+    async def scenario(client):
+        await client.patch("/weirdion/profiles/Fast", json=PROFILE)
+        response = await client.patch("/weirdion/profiles/Fast", json={"steps": 8})
+        return (await response.json())["profile"]
+
+    profile = _run(app, scenario)
+    assert profile["steps"] == 8
+    assert profile["sampler"] == "euler"
+
+
+def test_save_after_switching_profiles_keeps_checkpoint_toggles(app) -> None:
+    """Test that checkpoint toggles on one profile survive saving another, as the manager UI saves them."""
+
+    async def scenario(client):
+        await client.patch("/weirdion/profiles/A", json=PROFILE)
+        await client.patch("/weirdion/profiles/B", json=PROFILE)
+        # Toggle a checkpoint on A, switch to B and save: B's form, then A's pending checkpoints
+        await client.patch("/weirdion/profiles/B", json={**PROFILE, "steps": 12})
+        await client.patch("/weirdion/profiles/A", json={"checkpoints": ["model.safetensors"]})
+        return (await (await client.get("/weirdion/profiles")).json())["profiles"]
+
+    profiles = _run(app, scenario)
+    assert profiles["A"]["checkpoints"] == ["model.safetensors"]
+    assert profiles["A"]["steps"] == PROFILE["steps"]
+    assert profiles["B"]["steps"] == 12
+
+
+def test_checkpoint_default_routes(app) -> None:
+    """Test setting and deleting a checkpoint default with a nested checkpoint path."""
+    checkpoint = quote("sdxl/model.safetensors", safe="")
+
+    async def scenario(client):
+        await client.patch("/weirdion/profiles/Fast", json=PROFILE)
+        set_response = await client.patch(f"/weirdion/checkpoint-defaults/{checkpoint}", json={"profile": "Fast"})
+        defaults = (await (await client.get("/weirdion/profiles")).json())["checkpoint_defaults"]
+        deleted = await client.delete(f"/weirdion/checkpoint-defaults/{checkpoint}")
+        missing = await client.delete(f"/weirdion/checkpoint-defaults/{checkpoint}")
+        return set_response.status, defaults, deleted.status, missing.status
+
+    assert _run(app, scenario) == (200, {"sdxl/model.safetensors": "Fast"}, 200, 404)
+
+
+def test_delete_profile_cascades_checkpoint_defaults(app) -> None:
+    """Test that deleting a profile removes checkpoint defaults pointing at it."""
+
+    async def scenario(client):
+        await client.patch("/weirdion/profiles/Fast", json=PROFILE)
+        await client.patch("/weirdion/checkpoint-defaults/model.safetensors", json={"profile": "Fast"})
+        deleted = await client.delete("/weirdion/profiles/Fast")
+        data = await (await client.get("/weirdion/profiles")).json()
+        return deleted.status, data["profiles"], data["checkpoint_defaults"]
+
+    assert _run(app, scenario) == (200, {}, {})
+
+
+def test_patch_default_profile_rejected(app) -> None:
+    """Test that the read-only Default profile cannot be patched."""
+
+    async def scenario(client):
+        return (await client.patch("/weirdion/profiles/Default", json=PROFILE)).status
+
+    assert _run(app, scenario) == 400
+
+
+def test_get_profiles_filtered_by_checkpoint(app) -> None:
+    """Test that ?checkpoint= returns only the profiles indexed under that checkpoint."""
+
+    async def scenario(client):
+        await client.patch("/weirdion/profiles/Fast", json=dict(PROFILE, checkpoints=["a.safetensors"]))
+        await client.patch("/weirdion/profiles/Slow", json=dict(PROFILE, checkpoints=["b.safetensors"]))
+        await client.patch("/weirdion/checkpoint-defaults/a.safetensors", json={"profile": "Fast"})
+        response = await client.get("/weirdion/profiles", params={"checkpoint": "a.safetensors"})
+        return await response.json()
+
+    data = _run(app, scenario)
+    assert data["checkpoint_default"] == "Fast"
+    assert list(data["profiles"]) == ["Fast"]
+
+
+def test_changes_are_pushed_as_deltas(app, prompt_server) -> None:
+    """Test that each mutation pushes the new revision and only the changed entries."""
+
+    async def scenario(client):
+        revision = (await (await client.get("/weirdion/profiles")).json())["revision"]
+        await client.patch("/weirdion/profiles/Fast", json={**PROFILE, "checkpoints": ["a.safetensors"]})
+        await client.patch("/weirdion/checkpoint-defaults/a.safetensors", json={"profile": "Fast"})
+        await client.delete("/weirdion/profiles/Fast")
+        return revision
+
+    revision = _run(app, scenario)
+    events = [event for event, _data in prompt_server.sent]
+    deltas = [data for _event, data in prompt_server.sent]
+    assert events == [profile_routes.PROFILES_CHANGED_EVENT] * 3
+    assert [delta["revision"] for delta in deltas] == [revision + 1, revision + 2, revision + 3]
+    assert deltas[0]["profiles"]["Fast"]["checkpoints"] == ["a.safetensors"]
+    assert deltas[0]["checkpoint_defaults"] == {}
+    assert deltas[1] == {"revision": revision + 2, "profiles": {}, "checkpoint_defaults": {"a.safetensors": "Fast"}}
+    assert deltas[2]["profiles"] == {"Fast": None}
+    assert deltas[2]["checkpoint_defaults"] == {"a.safetensors": None}
+
+
+def test_large_changes_are_pushed_without_contents(app, prompt_server) -> None:
+    """Test that a bulk save pushes a full-refresh marker instead of every profile."""
+    profile_store.get_profile_snapshot()
+    profiles = {f"P{i}": PROFILE for i in range(profile_routes.MAX_DELTA_PROFILES + 1)}
+
+    async def scenario(client):
+        response = await client.post("/weirdion/profiles", json={"profiles": profiles})
+        return response.status
+
+    assert _run(app, scenario) == 200
+    ((_event, data),) = prompt_server.sent
+    assert data["full"] is True
+    assert "profiles" not in data
+
+
+def test_concurrent_gets_share_one_listing(app, monkeypatch) -> None:
+    """Test that identical concurrent GETs run the blocking work once, off the event loop."""
+    calls = []
+
+    def slow_listing():
+        calls.append(threading.current_thread().name)
+        time.sleep(0.1)
+        return ["a.safetensors"]
+
+    monkeypatch.setattr(profile_routes, "_get_checkpoints", slow_listing)
+
+    async def scenario(client):
+        responses = await asyncio.gather(*(client.get("/weirdion/profiles") for _ in range(5)))
+        bodies = [await response.json() for response in responses]
+        return bodies, responses[0].headers["Server-Timing"]
+
+    bodies, server_timing = _run(app, scenario)
+    assert len(calls) == 1
+    assert calls[0].startswith("weirdion-routes")
+    assert all(body["checkpoints"] == ["a.safetensors"] for body in bodies)
+    assert server_timing.startswith("handler;dur=")
+
+
+def test_get_after_mutation_is_not_coalesced_with_stale_read(app, monkeypatch) -> None:
+    """Test that a GET issued after a PATCH sees the change even if an older GET is still running."""
+
+    def slow_listing():
+        time.sleep(0.2)
+        return []
+
+    monkeypatch.setattr(profile_routes, "_get_checkpoints", slow_listing)
+
+    async def scenario(client):
+        stale = asyncio.ensure_future(client.get("/weirdion/profiles"))
+        await asyncio.sleep(0.05)
+        await client.patch("/weirdion/profiles/Fast", json=PROFILE)
+        fresh = await (await client.get("/weirdion/profiles")).json()
+        await stale
+        return fresh["profiles"]
+
+    assert "Fast" in _run(app, scenario)
+
+
+def test_export_streams_ndjson_records(app) -> None:
+    """Test that export writes a header, then profiles, then checkpoint defaults, one per line."""
+    profile_store.update_profiles(
+        {"Fast": PROFILE, "Slow": dict(PROFILE, steps=40)},
+        {"a.safetensors": "Slow"},
+    )
+
+    async def scenario(client):
+        response = await client.get("/weirdion/profiles/export")
+        return response.status, response.headers["Content-Type"], await response.text()
+
+    status, content_type, text = _run(app, scenario)
+    records = [json.loads(line) for line in text.splitlines()]
+    assert (status, content_type) == (200, "application/x-ndjson")
+    assert [record["type"] for record in records] == ["header", "profile", "profile", "checkpoint_default"]
+    assert records[2] == {"type": "profile", "name": "Slow", "profile": dict(PROFILE, steps=40)}
+    assert records[3] == {"type": "checkpoint_default", "checkpoint": "a.safetensors", "profile": "Slow"}
+
+
+def test_export_reports_invalid_profiles_as_json(app, profile_config_dir) -> None:
+    """Test that export answers an unreadable profiles file with a JSON 400, like the other routes."""
+    profile_config_dir.mkdir(parents=True, exist_ok=True)
+    (profile_config_dir / "profiles.user.json").write_text("{not json", encoding="utf-8")
+    profile_store.invalidate_profile_snapshot()
+
+    async def scenario(client):
+        response = await client.get("/weirdion/profiles/export")
+        return response.status, await response.json()
+
+    status, body = _run(app, scenario)
+    assert status == 400
+    assert "error" in body
+
+
+def test_import_commits_in_batches_and_reports_bad_lines(app, monkeypatch) -> None:
+    """Test that import commits each full batch and stops at the first invalid record."""
+    monkeypatch.setattr(profile_routes, "IMPORT_BATCH_SIZE", 2)
+    lines = [
+        {"type": "header", "format": profile_routes.EXPORT_FORMAT, "version": profile_routes.EXPORT_VERSION},
+        {"type": "profile", "name": "Fast", "profile": PROFILE},
+        {"type": "profile", "name": "Slow", "profile": PROFILE},
+        {"type": "checkpoint_default", "checkpoint": "a.safetensors", "profile": "Slow"},
+        {"type": "profile", "name": "Broken", "profile": {"steps": "many"}},
+    ]
+    body = "\n".join(json.dumps(line) for line in lines) + "\n"
+
+    async def scenario(client):
+        response = await client.post("/weirdion/profiles/import", data=body.encode())
+        return response.status, await response.json()
+
+    status, data = _run(app, scenario)
+    assert status == 400
+    assert (data["profiles"], data["checkpoint_defaults"], data["batches"]) == (2, 1, 2)
+    assert "Broken" in data["error"]
+    assert sorted(profile_store.get_profile_snapshot().profiles) == ["Fast", "Slow"]
+
+
+def test_import_round_trips_export(app) -> None:
+    """Test that an exported library imports cleanly, leaving other entries untouched."""
+    profile_store.update_profiles({"Fast": PROFILE}, {"a.safetensors": "Fast"})
+
+    async def scenario(client):
+        exported = await (await client.get("/weirdion/profiles/export")).read()
+        await client.delete("/weirdion/profiles/Fast")
+        await client.patch("/weirdion/profiles/Other", json=PROFILE)
+        response = await client.post("/weirdion/profiles/import", data=exported)
+        return response.status, await response.json()
+
+    status, data = _run(app, scenario)
+    snapshot = profile_store.get_profile_snapshot()
+    assert (status, data["profiles"], data["checkpoint_defaults"]) == (200, 1, 1)
+    assert sorted(snapshot.profiles) == ["Fast", "Other"]
+    assert snapshot.checkpoint_defaults == {"a.safetensors": "Fast"}
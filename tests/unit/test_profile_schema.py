@@ -0,0 +1,69 @@
+"""Tests for the compiled profile schema validator."""
+
+import pytest
+
+from weirdion.utils.profile_schema import ProfileValidationError, profile_errors, validate_profile
+
+VALID_PROFILE = {
+    "steps": 20,
+    "cfg": 7,
+    "sampler": "euler",
+    "scheduler": "normal",
+    "denoise": 1.0,
+    "clip_skip": -1,
+    "note": "",
+    "checkpoints": ["model.safetensors"],
+}
+
+
+def test_valid_profile_has_no_errors() -> None:
+    """Test that a well-formed profile passes."""
+    assert profile_errors(VALID_PROFILE, "Fast") == []
+
+
+def test_checkpoints_field_is_optional() -> None:
+    """Test that profiles without checkpoints are accepted."""
+    profile = {key: value for key, value in VALID_PROFILE.items() if key != "checkpoints"}
+    assert profile_errors(profile, "Fast") == []
+
+
+def test_all_errors_reported_in_one_pass() -> None:
+    """Test that every problem with a profile is reported together."""
+    profile = dict(VALID_PROFILE, steps="20", checkpoints=[1])
+    del profile["note"]
+
+    errors = profile_errors(profile, "Broken")
+
+    assert errors == [
+        "profile 'Broken' field 'steps' has invalid type",
+        "profile 'Broken' missing 'note'",
+        "profile 'Broken' field 'checkpoints' must be a list of strings",
+    ]
+
+
+def test_non_object_profile() -> None:
+    """Test that a non-object profile is rejected."""
+    assert profile_errors(["steps"], "Broken") == ["profile 'Broken' must be an object"]
+
+
+def test_isinstance_semantics_preserved() -> None:
+    """Test that values accepted by isinstance (bool for int) still pass."""
+    assert profile_errors(dict(VALID_PROFILE, steps=True), "Fast") == []
+
+
+def test_validate_profile_raises_with_errors() -> None:
+    """Test that validate_profile raises a ValueError carrying all errors."""
+    with pytest.raises(ProfileValidationError) as excinfo:
+        validate_profile({}, "Empty")
+
+    assert isinstance(excinfo.value, ValueError)
+    assert len(excinfo.value.errors) == 7
+
+
+def test_warm_lists_are_optional_string_lists() -> None:
+    """Test that warm_checkpoints and warm_loras accept string lists and reject anything else."""
+    profile = dict(VALID_PROFILE, warm_checkpoints=["model.safetensors"], warm_loras=["style"])
+    assert profile_errors(profile, "Warm") == []
+    assert profile_errors(dict(VALID_PROFILE, warm_loras="style"), "Warm") == [
+        "profile 'Warm' field 'warm_loras' must be a list of strings"
+    ]
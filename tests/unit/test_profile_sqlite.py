@@ -0,0 +1,106 @@
+"""Tests for the SQLite profile backend."""
+
+import json
+
+import pytest
+
+from weirdion.utils import profile_store
+from weirdion.utils.profile_sqlite import SQLiteProfileStore
+from weirdion.utils.profile_store import (
+    delete_profile,
+    get_profile_snapshot,
+    get_profiles_for_checkpoint,
+    patch_profile,
+    resolve_profile,
+    save_user_profiles,
+    set_checkpoint_default,
+)
+
+
+def _profile(**overrides):
+    profile = {
+        "steps": 20,
+        "cfg": 7.0,
+        "sampler": "euler",
+        "scheduler": "normal",
+        "denoise": 1.0,
+        "clip_skip": -1,
+        "note": "",
+        "checkpoints": ["model.safetensors"],
+    }
+    profile.update(overrides)
+    return profile
+
+
+@pytest.fixture
+def sqlite_config_dir(profile_config_dir, monkeypatch):
+    """Select the SQLite backend inside an isolated config directory."""
+    monkeypatch.setenv(profile_store.PROFILE_BACKEND_ENV, "sqlite")
+    profile_store.invalidate_profile_snapshot()
+    return profile_config_dir
+
+
+def test_sqlite_database_uses_wal(sqlite_config_dir) -> None:
+    """Test that the database is created in WAL mode."""
+    get_profile_snapshot()
+    store = SQLiteProfileStore(sqlite_config_dir / "profiles.user.sqlite3")
+
+    assert store._connection().execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+
+def test_sqlite_single_profile_updates(sqlite_config_dir) -> None:
+    """Test that per-profile operations are committed immediately without a JSON file."""
+    patch_profile("Fast", _profile())
+    set_checkpoint_default("model.safetensors", "Fast")
+
+    store = SQLiteProfileStore(sqlite_config_dir / "profiles.user.sqlite3")
+    assert store.get_profile("Fast")["steps"] == 20
+    assert store.get_checkpoint_default("model.safetensors") == "Fast"
+    assert store.profiles_for_checkpoint("model.safetensors") == ["Fast"]
+    assert not (sqlite_config_dir / "profiles.user.json").exists()
+
+    delete_profile("Fast")
+    assert store.get_profile("Fast") is None
+    assert store.get_checkpoint_default("model.safetensors") is None
+
+
+def test_sqlite_save_replaces_everything(sqlite_config_dir) -> None:
+    """Test that save_user_profiles replaces the whole library."""
+    patch_profile("Old", _profile())
+    save_user_profiles({"profiles": {"New": _profile()}, "checkpoint_defaults": {}})
+
+    store = SQLiteProfileStore(sqlite_config_dir / "profiles.user.sqlite3")
+    assert store.get_profile("Old") is None
+    assert store.get_profile("New") is not None
+
+
+def test_sqlite_imports_json_once(profile_config_dir, monkeypatch) -> None:
+    """Test that existing JSON profiles are imported into a new database once."""
+    profile_config_dir.mkdir(parents=True, exist_ok=True)
+    data = {"profiles": {"Fast": _profile()}, "checkpoint_defaults": {"model.safetensors": "Fast"}}
+    (profile_config_dir / "profiles.user.json").write_text(json.dumps(data), encoding="utf-8")
+    monkeypatch.setenv(profile_store.PROFILE_BACKEND_ENV, "sqlite")
+    profile_store.invalidate_profile_snapshot()
+
+    name, _profile_data = resolve_profile("Default", checkpoint_name="model.safetensors", allow_checkpoint_default=True)
+    assert name == "Fast"
+
+    delete_profile("Fast")
+    monkeypatch.setattr(profile_store, "_sqlite_store", None)
+    profile_store.invalidate_profile_snapshot()
+    assert "Fast" not in get_profile_snapshot().profiles
+
+
+def test_sqlite_picks_up_other_process_changes_incrementally(sqlite_config_dir, monkeypatch) -> None:
+    """Test that commits from another connection are applied from the change log."""
+    patch_profile("Fast", _profile())
+    revision = get_profile_snapshot().revision
+
+    other = SQLiteProfileStore(sqlite_config_dir / "profiles.user.sqlite3")
+    other.apply_changes({"Slow": _profile(checkpoints=["model.safetensors"])}, {})
+
+    monkeypatch.setattr(SQLiteProfileStore, "load", lambda self: pytest.fail("unexpected full load"))
+    snapshot = get_profile_snapshot()
+    assert snapshot.revision > revision
+    assert set(snapshot.profiles) == {"Fast", "Slow"}
+    assert get_profiles_for_checkpoint("model.safetensors") == ("Fast", "Slow")
@@ -0,0 +1,249 @@
+"""Tests for the cached profile store."""
+
+import json
+import os
+
+import pytest
+
+from weirdion.utils import profile_store
+from weirdion.utils.profile_store import (
+    DEFAULT_PROFILE_NAME,
+    delete_profile,
+    flush_profile_writes,
+    get_checkpoint_default,
+    get_profile_snapshot,
+    get_profiles_for_checkpoint,
+    get_store_revision,
+    load_user_profiles,
+    patch_profile,
+    resolve_profile,
+    save_user_profiles,
+)
+
+
+def _profile(**overrides):
+    profile = {
+        "steps": 20,
+        "cfg": 7.0,
+        "sampler": "euler",
+        "scheduler": "normal",
+        "denoise": 1.0,
+        "clip_skip": -1,
+        "note": "",
+        "checkpoints": ["model.safetensors"],
+    }
+    profile.update(overrides)
+    return profile
+
+
+def _write_user_file(config_dir, data) -> None:
+    config_dir.mkdir(parents=True, exist_ok=True)
+    (config_dir / "profiles.user.json").write_text(json.dumps(data), encoding="utf-8")
+
+
+def test_snapshot_creates_default_file(profile_config_dir) -> None:
+    """Test that the first read recreates the default profile file."""
+    snapshot = get_profile_snapshot()
+
+    assert (profile_config_dir / "profiles.default.json").exists()
+    assert snapshot.default_profile["name"] == DEFAULT_PROFILE_NAME
+    assert len(snapshot.profiles) == 0
+
+
+def test_snapshot_is_reused_until_files_change(profile_config_dir, monkeypatch) -> None:
+    """Test that unchanged files are not parsed again."""
+    first = get_profile_snapshot()
+
+    def fail_read(path):
+        raise AssertionError(f"unexpected read of {path}")
+
+    monkeypatch.setattr(profile_store, "_read_json", fail_read)
+    assert get_profile_snapshot() is first
+
+
+def test_snapshot_reloads_when_user_file_changes(profile_config_dir) -> None:
+    """Test that an external edit bumps the revision and is picked up."""
+    revision = get_store_revision()
+
+    _write_user_file(profile_config_dir, {"profiles": {"Fast": _profile()}, "checkpoint_defaults": {}})
+    path = profile_config_dir / "profiles.user.json"
+    os.utime(path, ns=(1, 1))
+
+    snapshot = get_profile_snapshot()
+    assert snapshot.revision > revision
+    assert "Fast" in snapshot.profiles
+
+
+def test_snapshot_is_immutable(profile_config_dir) -> None:
+    """Test that snapshot contents cannot be mutated by readers."""
+    save_user_profiles({"profiles": {"Fast": _profile()}, "checkpoint_defaults": {}})
+    snapshot = get_profile_snapshot()
+
+    with pytest.raises(TypeError):
+        snapshot.profiles["Fast"]["steps"] = 1  # type: ignore[index]
+    assert isinstance(snapshot.profiles["Fast"]["checkpoints"], tuple)
+
+
+def test_load_user_profiles_returns_mutable_copy(profile_config_dir) -> None:
+    """Test that the legacy loader returns plain dicts detached from the snapshot."""
+    save_user_profiles({"profiles": {"Fast": _profile()}, "checkpoint_defaults": {}})
+
+    data = load_user_profiles()
+    data["profiles"]["Fast"]["steps"] = 99
+
+    assert data["profiles"]["Fast"]["checkpoints"] == ["model.safetensors"]
+    assert get_profile_snapshot().profiles["Fast"]["steps"] == 20
+
+
+def test_save_publishes_snapshot_without_reload(profile_config_dir, monkeypatch) -> None:
+    """Test that saving updates the snapshot in memory."""
+    get_profile_snapshot()
+    revision = get_store_revision()
+    save_user_profiles({"profiles": {"Fast": _profile()}, "checkpoint_defaults": {"model.safetensors": "Fast"}})
+
+    monkeypatch.setattr(profile_store, "_read_json", lambda path: pytest.fail("unexpected read"))
+    assert get_store_revision() == revision + 1
+    name, _profile_data = resolve_profile(
+        DEFAULT_PROFILE_NAME, checkpoint_name="model.safetensors", allow_checkpoint_default=True
+    )
+    assert name == "Fast"
+
+
+def test_save_coalesces_writes(profile_config_dir, monkeypatch) -> None:
+    """Test that bursts of saves produce a single disk write."""
+    writes = []
+    real_write = profile_store._write_json
+    monkeypatch.setattr(profile_store, "_write_json", lambda path, data: (writes.append(data), real_write(path, data)))
+    get_profile_snapshot()
+
+    for steps in (10, 20, 30):
+        save_user_profiles({"profiles": {"Fast": _profile(steps=steps)}, "checkpoint_defaults": {}})
+    assert get_profile_snapshot().profiles["Fast"]["steps"] == 30
+
+    flush_profile_writes()
+    user_writes = [data for data in writes if "profiles" in data]
+    assert len(user_writes) == 1
+    assert user_writes[0]["profiles"]["Fast"]["steps"] == 30
+
+
+def test_pending_save_is_not_replaced_by_reload(profile_config_dir) -> None:
+    """Test that a reload while a save is pending keeps the local edit, even if another process wrote the file."""
+    get_profile_snapshot()
+    patch_profile("Fast", _profile(steps=12))
+    _write_user_file(profile_config_dir, {"profiles": {"Other": _profile()}, "checkpoint_defaults": {}})
+
+    assert profile_store._reload_snapshot().profiles["Fast"]["steps"] == 12
+    flush_profile_writes()
+
+    on_disk = json.loads((profile_config_dir / "profiles.user.json").read_text(encoding="utf-8"))
+    assert on_disk["profiles"]["Fast"]["steps"] == 12
+    assert get_profile_snapshot().profiles["Fast"]["steps"] == 12
+
+
+def test_flush_writes_atomically(profile_config_dir) -> None:
+    """Test that a flushed save lands on disk without leftover temp files."""
+    save_user_profiles({"profiles": {"Fast": _profile()}, "checkpoint_defaults": {}})
+    revision = get_store_revision()
+    flush_profile_writes()
+
+    on_disk = json.loads((profile_config_dir / "profiles.user.json").read_text(encoding="utf-8"))
+    assert on_disk["profiles"]["Fast"]["steps"] == 20
+    assert not list(profile_config_dir.glob("*.tmp"))
+    assert get_store_revision() == revision
+
+
+def test_save_validates_only_changed_profiles(profile_config_dir, monkeypatch) -> None:
+    """Test that unchanged profiles are not revalidated on save."""
+    profiles = {f"P{index}": _profile(steps=index + 1) for index in range(5)}
+    save_user_profiles({"profiles": profiles, "checkpoint_defaults": {}})
+
+    validated = []
+    real_errors = profile_store.profile_errors
+    monkeypatch.setattr(
+        profile_store, "profile_errors", lambda profile, name: (validated.append(name), real_errors(profile, name))[1]
+    )
+    profiles["P3"] = _profile(steps=99)
+    save_user_profiles({"profiles": profiles, "checkpoint_defaults": {}})
+
+    assert validated == ["P3"]
+    assert get_profile_snapshot().profiles["P3"]["steps"] == 99
+
+
+def test_checkpoint_reverse_index(profile_config_dir) -> None:
+    """Test that the reverse index maps checkpoints to every profile listing them."""
+    save_user_profiles(
+        {
+            "profiles": {
+                "Slow": _profile(checkpoints=["a.safetensors", "b.safetensors"]),
+                "Fast": _profile(checkpoints=["a.safetensors"]),
+            },
+            "checkpoint_defaults": {"a.safetensors": "Fast"},
+        }
+    )
+
+    assert get_profiles_for_checkpoint("a.safetensors") == ("Fast", "Slow")
+    assert get_profiles_for_checkpoint("b.safetensors") == ("Slow",)
+    assert get_profiles_for_checkpoint("c.safetensors") == ()
+    assert get_checkpoint_default("a.safetensors") == "Fast"
+    assert get_checkpoint_default("b.safetensors") is None
+
+
+def test_checkpoint_reverse_index_follows_single_profile_edits(profile_config_dir) -> None:
+    """Test that patching and deleting a profile keep the reverse index current."""
+    patch_profile("Fast", _profile(checkpoints=["a.safetensors"]))
+    patch_profile("Slow", _profile(checkpoints=["a.safetensors"]))
+    patch_profile("Fast", {"checkpoints": ["b.safetensors"]})
+
+    assert get_profiles_for_checkpoint("a.safetensors") == ("Slow",)
+    assert get_profiles_for_checkpoint("b.safetensors") == ("Fast",)
+
+    delete_profile("Slow")
+    assert "a.safetensors" not in get_profile_snapshot().checkpoint_profiles
+
+
+def test_invalid_user_file_raises(profile_config_dir) -> None:
+    """Test that an invalid user file is rejected, not cached."""
+    _write_user_file(profile_config_dir, {"profiles": {"Broken": {"steps": 1}}})
+
+    with pytest.raises(ValueError, match="missing"):
+        get_profile_snapshot()
+
+
+def test_resolve_profile_missing(profile_config_dir) -> None:
+    """Test that resolving an unknown profile raises."""
+    with pytest.raises(ValueError, match="Profile not found"):
+        resolve_profile("Nope")
+
+
+def test_listener_receives_changes_from_saves_and_reloads(profile_config_dir) -> None:
+    """Test that listeners hear about in-process saves and about files changed on disk."""
+    changes = []
+    profile_store.add_profile_listener(changes.append)
+    try:
+        get_profile_snapshot()
+        save_user_profiles({"profiles": {"Fast": _profile(), "Slow": _profile()}, "checkpoint_defaults": {}})
+        flush_profile_writes()
+
+        data = {
+            "profiles": {"Fast": _profile(), "Slow": _profile(steps=50)},
+            "checkpoint_defaults": {"model.safetensors": "Slow"},
+        }
+        _write_user_file(profile_config_dir, data)
+        os.utime(profile_config_dir / "profiles.user.json", ns=(1, 1))
+        get_profile_snapshot()
+    finally:
+        profile_store.remove_profile_listener(changes.append)
+
+    assert [change.profiles for change in changes] == [("Fast", "Slow"), ("Slow",)]
+    assert changes[1].checkpoint_defaults == ("model.safetensors",)
+    assert changes[1].to_dict()["profiles"]["Slow"]["steps"] == 50
+
+
+def test_update_profiles_merges_and_skips_unchanged(profile_config_dir) -> None:
+    """Test that update_profiles keeps unmentioned entries and does not commit identical data."""
+    save_user_profiles({"profiles": {"Keep": _profile()}, "checkpoint_defaults": {}})
+
+    revision = profile_store.update_profiles({"Fast": _profile()}, {"model.safetensors": "Fast"})
+    assert sorted(get_profile_snapshot().profiles) == ["Fast", "Keep"]
+    assert get_checkpoint_default("model.safetensors") == "Fast"
+    assert profile_store.update_profiles({"Fast": _profile()}, {"model.safetensors": "Fast"}) == revision
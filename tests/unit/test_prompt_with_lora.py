@@ -167,3 +167,27 @@ def test_prompt_with_lora_negative_strength() -> None:
 
     assert text == prompt
     assert "<lora:style:-0.5>" in text
+
+
+def test_validate_inputs_checks_lora_tags_when_loading(model_listings) -> None:
+    """Test that unresolvable LoRA tags are rejected only when MODEL and CLIP are connected."""
+    model_listings["loras"] = ["styles/Detail.safetensors"]
+    connected = {"opt_model": "MODEL", "opt_clip": "CLIP"}
+    prompt = "a cat <lora:detail:0.5> <lora:missing:1.0> <lora:missing:0.2>"
+
+    validate = PromptWithLoraNode.VALIDATE_INPUTS
+    assert validate(prompt=prompt, input_types=connected) == "LoRA not found: 'missing'"
+    assert validate(prompt="a cat <lora:detail:0.5>", input_types=connected) is True
+    assert validate(prompt=prompt, input_types={"opt_clip": "CLIP"}) is True
+    assert validate(prompt=prompt) is True
+
+
+def test_validate_inputs_accepts_lora_added_after_index_was_built(model_listings) -> None:
+    """Test that a LoRA added since the last lookup passes validation on the first queue."""
+    connected = {"opt_model": "MODEL", "opt_clip": "CLIP"}
+    model_listings["loras"] = ["detail.safetensors"]
+    for _ in range(2):
+        assert PromptWithLoraNode.VALIDATE_INPUTS(prompt="<lora:detail:0.5>", input_types=connected) is True
+
+    model_listings["loras"] = ["detail.safetensors", "new.safetensors"]
+    assert PromptWithLoraNode.VALIDATE_INPUTS(prompt="<lora:new:0.5>", input_types=connected) is True
@@ -0,0 +1,125 @@
+"""Tests for checkpoint page-cache hints."""
+
+import types
+
+import pytest
+
+from weirdion.utils import checkpoint_loader, readahead
+from weirdion.utils.readahead import LoadSequencePredictor
+
+
+def test_predictor_returns_most_frequent_successor() -> None:
+    """Test that the predicted next load is the most frequent successor seen so far."""
+    predictor = LoadSequencePredictor()
+
+    assert predictor.record("a") is None
+    for name in ("b", "a", "c", "a", "b", "a"):
+        predictor.record(name)
+
+    assert predictor.record("a") == "b"
+    assert predictor.record("b") == "a"
+
+
+def test_predictor_forgets_least_recently_updated() -> None:
+    """Test that only max_tracked predecessors are remembered."""
+    predictor = LoadSequencePredictor(max_tracked=2)
+    for name in ("a", "b", "c", "d"):
+        predictor.record(name)
+
+    assert predictor.record("c") == "d"
+    assert predictor.record("a") is None
+
+
+@pytest.mark.skipif(not readahead._supported, reason="posix_fadvise not available")
+def test_hints_are_given_for_existing_files(tmp_path) -> None:
+    """Test that will-need and release hints succeed on a real file."""
+    path = tmp_path / "model.safetensors"
+    path.write_bytes(b"\0" * 4096)
+
+    assert readahead.advise_will_need(str(path))
+    assert readahead.release_page_cache(str(path))
+    assert not readahead.advise_will_need(str(tmp_path / "missing.safetensors"))
+
+
+def test_hints_can_be_disabled(tmp_path, monkeypatch) -> None:
+    """Test that WEIRDION_FADVISE=0 turns every hint into a no-op."""
+    path = tmp_path / "model.safetensors"
+    path.write_bytes(b"\0" * 4096)
+    monkeypatch.setenv(readahead.FADVISE_ENV, "0")
+
+    assert not readahead.is_enabled()
+    assert not readahead.advise_will_need(str(path))
+    assert not readahead.prefetch(str(path))
+
+
+def test_prefetch_skips_files_already_queued(tmp_path, monkeypatch) -> None:
+    """Test that a file is queued for prefetch once until its read finishes."""
+    path = tmp_path / "model.safetensors"
+    path.write_bytes(b"\0" * 4096)
+    submitted = []
+    monkeypatch.setattr(readahead, "_supported", True)
+    monkeypatch.setattr(readahead, "_prefetching", set())
+    monkeypatch.setattr(
+        readahead, "_get_prefetch_executor", lambda: types.SimpleNamespace(submit=lambda *args: submitted.append(args))
+    )
+
+    assert readahead.prefetch(str(path))
+    assert not readahead.prefetch(str(path))
+    assert readahead.is_prefetching(str(path))
+    assert len(submitted) == 1
+
+    readahead._read_through(*submitted[0][1:])
+    assert not readahead.is_prefetching(str(path))
+    assert readahead.prefetch(str(path))
+
+
+def test_loading_checkpoint_is_not_prefetched(monkeypatch) -> None:
+    """Test that a predicted checkpoint that is being loaded right now is not prefetched."""
+    prefetched = []
+    monkeypatch.setattr(checkpoint_loader, "prefetch", prefetched.append)
+    monkeypatch.setattr(checkpoint_loader, "checkpoint_sequence", LoadSequencePredictor())
+    monkeypatch.setattr(
+        checkpoint_loader.checkpoint_loads, "in_flight", lambda: [("/models/checkpoints/refiner.safetensors", (1, 2))]
+    )
+    folder_paths = types.SimpleNamespace(get_full_path=lambda kind, name: f"/models/{kind}/{name}")
+
+    for name in ("base.safetensors", "refiner.safetensors", "base.safetensors"):
+        checkpoint_loader._prefetch_next(folder_paths, name)
+
+    assert prefetched == []
+
+
+def test_evicted_checkpoints_release_their_pages(monkeypatch) -> None:
+    """Test that evicting a cached checkpoint drops its file from the page cache."""
+    released = []
+    monkeypatch.setattr(checkpoint_loader, "release_page_cache", released.append)
+    monkeypatch.setitem(checkpoint_loader._checkpoint_paths, "model.safetensors", "/models/model.safetensors")
+    checkpoint_loader.checkpoint_cache.put("model.safetensors", ("model", "clip", "vae"), size_bytes=1)
+
+    checkpoint_loader.checkpoint_cache.evict("model.safetensors")
+
+    assert released == ["/models/model.safetensors"]
+    assert "model.safetensors" not in checkpoint_loader._checkpoint_paths
+
+
+def test_predicted_next_checkpoint_is_prefetched(monkeypatch) -> None:
+    """Test that loading a checkpoint prefetches the one that followed it before, unless cached."""
+    prefetched = []
+    monkeypatch.setattr(checkpoint_loader, "prefetch", prefetched.append)
+    monkeypatch.setattr(checkpoint_loader, "checkpoint_sequence", LoadSequencePredictor())
+    folder_paths = types.SimpleNamespace(get_full_path=lambda kind, name: f"/models/{kind}/{name}")
+
+    for name in ("base.safetensors", "refiner.safetensors", "base.safetensors"):
+        checkpoint_loader._prefetch_next(folder_paths, name)
+
+    assert prefetched == ["/models/checkpoints/refiner.safetensors"]
+
+    checkpoint_loader.checkpoint_cache.put("refiner.safetensors", ("model", "clip", "vae"), size_bytes=1)
+    try:
+        checkpoint_loader._prefetch_next(folder_paths, "refiner.safetensors")
+        checkpoint_loader._prefetch_next(folder_paths, "base.safetensors")
+    finally:
+        checkpoint_loader.checkpoint_cache.evict("refiner.safetensors")
+
+    # The cached refiner is not prefetched again; base, predicted after it, is
+    assert prefetched == ["/models/checkpoints/refiner.safetensors", "/models/checkpoints/base.safetensors"]
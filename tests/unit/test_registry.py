@@ -2,7 +2,7 @@
 
 import pytest
 
-from weirdion.core import NodeRegistry, UtilityNode
+from weirdion.core import BaseNode, NodeDeclaration, NodeRegistry, UtilityNode
 from weirdion.types import ComfyType, InputSpec, NodeOutput
 
 
@@ -81,3 +81,42 @@ def test_registry_as_decorator() -> None:
 
     class_mappings, _ = registry.to_comfy_mappings()
     assert class_mappings["DecoratedNode"] is DecoratedNode
+
+
+def test_declared_node_is_imported_on_first_lookup() -> None:
+    """Test that a declared node's module is only imported when its class is looked up."""
+    registry = NodeRegistry()
+    registry.declare(NodeDeclaration("Lazy", "Lazy Node", __name__, "MockNode"))
+
+    class_mappings, display_mappings = registry.to_comfy_mappings()
+    assert "Lazy" in class_mappings
+    assert display_mappings == {"Lazy": "Lazy Node"}
+    assert not registry.is_loaded("Lazy")
+
+    assert class_mappings["Lazy"] is MockNode
+    assert registry.is_loaded("Lazy")
+
+
+def test_register_binds_matching_declaration() -> None:
+    """Test that @register in the declared module binds the class instead of clashing."""
+    registry = NodeRegistry()
+    registry.declare(NodeDeclaration("Lazy", "Lazy Node", __name__, "MockNode"))
+
+    registry.register(MockNode, name="Lazy", display_name="Lazy Node")
+    assert registry.is_loaded("Lazy")
+
+    with pytest.raises(ValueError, match="does not match its declaration"):
+        other = NodeRegistry()
+        other.declare(NodeDeclaration("Lazy", "Lazy Node", __name__, "OtherNode"))
+        other.register(MockNode, name="Lazy", display_name="Lazy Node")
+
+
+def test_package_declarations_match_node_classes() -> None:
+    """Test that every declared package node resolves to a class registered under the same names."""
+    from weirdion import NODE_CLASS_MAPPINGS, NODE_DISPLAY_NAME_MAPPINGS
+    from weirdion.core.registry import _global_registry
+
+    for name, node_class in NODE_CLASS_MAPPINGS.items():
+        assert _global_registry.is_loaded(name)
+        assert issubclass(node_class, BaseNode)
+        assert NODE_DISPLAY_NAME_MAPPINGS[name].endswith("(weirdion)")
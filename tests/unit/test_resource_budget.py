@@ -0,0 +1,163 @@
+"""Tests for the shared cache resource budget."""
+
+import sys
+import types
+
+import pytest
+
+from weirdion.utils import lora_loader, resource_budget
+from weirdion.utils.resource_budget import GIB, BudgetedCache, ResourceBudget, estimate_size
+
+
+@pytest.fixture
+def budget():
+    """A budget of 100 bytes of RAM, with no free-memory floor."""
+    return ResourceBudget(ram_limit_bytes=100, min_free_ram_bytes=0)
+
+
+def test_cache_get_put_and_version(budget) -> None:
+    """Test that hits are counted and a stale version is a miss that drops the entry."""
+    cache = BudgetedCache("things", budget)
+    assert cache.put("a", "A", size_bytes=10, version=1)
+    assert cache.get("a", 1) == "A"
+    assert cache.get("a", 2) is None
+    assert "a" not in cache
+    assert cache.stats() | {"name": None} == {
+        "name": None,
+        "entries": 0,
+        "size_bytes": 0,
+        "hits": 1,
+        "misses": 1,
+        "pins": [],
+    }
+
+
+def test_eviction_is_cost_aware_across_caches(budget) -> None:
+    """Test that the entry cheapest to rebuild per byte is evicted first, whichever cache holds it."""
+    evicted = []
+    checkpoints = BudgetedCache("checkpoints", budget, on_evict=lambda key, value: evicted.append(key))
+    loras = BudgetedCache("loras", budget, on_evict=lambda key, value: evicted.append(key))
+
+    checkpoints.put("slow", 1, size_bytes=40, cost_seconds=10.0)
+    loras.put("fast", 2, size_bytes=40, cost_seconds=0.1)
+    loras.put("new", 3, size_bytes=40, cost_seconds=1.0)
+
+    assert evicted == ["fast"]
+    assert budget.usage() == 80
+    assert budget.evictions == 1
+
+
+def test_pinned_entries_survive_and_oversized_values_are_rejected(budget) -> None:
+    """Test that pinned entries are never chosen by the budget and values over the limit are not stored."""
+    cache = BudgetedCache("things", budget)
+    cache.put("pinned", 1, size_bytes=60)
+    assert cache.pin("pinned")
+    cache.put("other", 2, size_bytes=60, cost_seconds=100.0)
+
+    assert "pinned" in cache and "other" not in cache
+    assert not cache.put("huge", 3, size_bytes=101)
+    assert cache.evict("pinned")
+    assert len(cache) == 0
+
+    assert not cache.pin("later")
+    cache.put("later", 4, size_bytes=60)
+    assert cache.entries()[0]["pinned"]
+
+
+def test_zero_limit_disables_caching() -> None:
+    """Test that a RAM limit of zero stores nothing."""
+    cache = BudgetedCache("things", ResourceBudget(ram_limit_bytes=0, min_free_ram_bytes=0))
+    assert not cache.put("a", 1, size_bytes=0)
+    assert len(cache) == 0
+
+
+def test_duplicate_cache_names_are_rejected(budget) -> None:
+    """Test that two caches cannot share a name within one budget."""
+    BudgetedCache("things", budget)
+    with pytest.raises(ValueError, match="already registered"):
+        BudgetedCache("things", budget)
+
+
+def test_memory_pressure_releases_entries(budget, monkeypatch) -> None:
+    """Test that low free RAM and a short ComfyUI free_memory call both trigger eviction."""
+    free = {"cpu": 10 * GIB}
+    monkeypatch.setattr(resource_budget, "_free_memory", lambda device: free[str(device)])
+    budget.min_free_ram_bytes = GIB
+    cache = BudgetedCache("things", budget)
+    cache.put("a", 1, size_bytes=30)
+    cache.put("b", 2, size_bytes=30, cost_seconds=1.0)
+
+    free["cpu"] = GIB - 20
+    assert budget.relieve_memory_pressure() == 30
+    assert [entry["key"] for entry in cache.entries()] == ["b"]
+
+    free["cpu"] = GIB
+    assert budget.on_comfy_free_memory(30, "cpu") == 30
+    assert len(cache) == 0
+
+    # VRAM is left to ComfyUI
+    free["cuda"] = 0
+    cache.put("c", 3, size_bytes=30)
+    assert budget.on_comfy_free_memory(5, "cuda") == 0
+    assert "c" in cache
+
+
+def test_comfy_free_memory_hook(monkeypatch) -> None:
+    """Test that the hook wraps comfy.model_management.free_memory and asks the budget to release."""
+    calls = []
+    model_management = types.SimpleNamespace(
+        free_memory=lambda required, device, keep_loaded=(): calls.append(required)
+    )
+    comfy = types.ModuleType("comfy")
+    comfy.model_management = model_management
+    monkeypatch.setitem(sys.modules, "comfy", comfy)
+    monkeypatch.setitem(sys.modules, "comfy.model_management", model_management)
+    monkeypatch.setattr(resource_budget, "_hook_installed", False)
+    released = []
+    monkeypatch.setattr(
+        resource_budget.get_resource_budget(),
+        "on_comfy_free_memory",
+        lambda required, device: released.append((required, device)),
+    )
+
+    assert resource_budget.install_memory_pressure_hook()
+    model_management.free_memory(1024, "cuda", keep_loaded=[])
+    assert calls == [1024]
+    assert released == [(1024, "cuda")]
+
+
+def test_comfy_free_memory_hook_can_be_disabled(monkeypatch) -> None:
+    """Test that WEIRDION_CACHE_HOOK=0 leaves comfy.model_management.free_memory alone."""
+    installs = []
+    monkeypatch.setenv(resource_budget.MEMORY_HOOK_ENV, "0")
+    monkeypatch.setattr(resource_budget, "_budget", None)
+    monkeypatch.setattr(resource_budget, "install_memory_pressure_hook", lambda: installs.append(True))
+
+    resource_budget.get_resource_budget()
+    assert installs == []
+
+
+def test_estimate_size_understands_tensors_and_patchers() -> None:
+    """Test size estimates for tensor-like values, model patchers and containers."""
+    tensor = types.SimpleNamespace(element_size=lambda: 2, nelement=lambda: 8)
+    patcher = types.SimpleNamespace(model_size=lambda: 100)
+    clip = types.SimpleNamespace(patcher=patcher)
+    assert estimate_size({"a": tensor, "b": types.SimpleNamespace(nbytes=4)}) == 20
+    assert estimate_size((patcher, clip, None)) == 200
+
+
+def test_lora_state_dicts_are_cached(monkeypatch, tmp_path) -> None:
+    """Test that a LoRA file is read once and served from the cache until it changes."""
+    lora_file = tmp_path / "style.safetensors"
+    lora_file.write_bytes(b"1234")
+    reads = []
+    comfy_utils = types.SimpleNamespace(load_torch_file=lambda path, safe_load: reads.append(path) or {"w": b"12"})
+    monkeypatch.setattr(lora_loader.lora_cache, "_entries", {})
+
+    first = lora_loader.load_lora_state_dict(comfy_utils, "style.safetensors", str(lora_file))
+    second = lora_loader.load_lora_state_dict(comfy_utils, "style.safetensors", str(lora_file))
+    lora_file.write_bytes(b"123456")
+    lora_loader.load_lora_state_dict(comfy_utils, "style.safetensors", str(lora_file))
+
+    assert first is second
+    assert len(reads) == 2
@@ -0,0 +1,238 @@
+"""Tests for the host-wide shared memory tier."""
+
+import fcntl
+import gc
+import json
+import os
+import struct
+import subprocess
+import sys
+import types
+import weakref
+
+import pytest
+
+from weirdion.utils import shared_tier
+from weirdion.utils.safetensors_map import read_header
+from weirdion.utils.shared_tier import SharedTier
+
+
+class _Mapping:
+    """Stands in for an mmap that fake tensors keep alive."""
+
+
+@pytest.fixture
+def fake_tensors(monkeypatch):
+    """Save and map state dicts of SimpleNamespace(nbytes=...) as U8 safetensors files, without torch."""
+
+    def save(state_dict, path, metadata=None):
+        tensors = {name: ("U8", [value.nbytes], b"\0" * value.nbytes) for name, value in state_dict.items()}
+        _write_safetensors(path, tensors, metadata)
+
+    def map_(path, *, on_unmap=None):
+        header, _offset = read_header(path)
+        metadata = header.pop("__metadata__", None)
+        mapping = _Mapping()
+        state_dict = {
+            name: types.SimpleNamespace(nbytes=info["data_offsets"][1] - info["data_offsets"][0], mapping=mapping)
+            for name, info in header.items()
+        }
+        if on_unmap is not None:
+            weakref.finalize(mapping, on_unmap)
+        return state_dict, metadata
+
+    monkeypatch.setattr(shared_tier, "save_state_dict", save)
+    monkeypatch.setattr(shared_tier, "map_state_dict", map_)
+
+
+def _source(tmp_path, name, size=16):
+    path = tmp_path / "models" / name
+    path.parent.mkdir(exist_ok=True)
+    path.write_bytes(b"\0" * size)
+    return str(path)
+
+
+def _ref_path(tier, key, name):
+    os.makedirs(os.path.join(tier.directory, key + ".refs"), exist_ok=True)
+    return os.path.join(tier.directory, key + ".refs", name)
+
+
+def test_second_process_attaches_without_reading(tmp_path, fake_tensors) -> None:
+    """Test that a file read once is mapped from the tier by every later loader."""
+    source = _source(tmp_path, "model.safetensors")
+    reads = []
+
+    def read():
+        reads.append(source)
+        return {"weight": types.SimpleNamespace(nbytes=100)}, {"format": "pt"}
+
+    first = SharedTier(str(tmp_path / "shm"))
+    state_dict, metadata = first.load(source, read)
+    other = SharedTier(str(tmp_path / "shm"))
+    shared, shared_metadata = other.load(source, read)
+
+    assert reads == [source]
+    assert state_dict["weight"].nbytes == shared["weight"].nbytes == 100
+    assert metadata == shared_metadata == {"format": "pt"}
+    assert first.materializations == 1 and other.attaches == 1
+
+    [entry] = other.entries()
+    assert entry["source"] == os.path.realpath(source)
+    assert entry["refs"] == [os.getpid()]
+
+    del state_dict, shared
+    gc.collect()
+    assert other.entries()[0]["refs"] == []
+
+
+def test_eviction_spares_entries_referenced_by_live_processes(tmp_path, fake_tensors) -> None:
+    """Test that over-quota entries are evicted oldest first, skipping ones a live process maps."""
+    tier = SharedTier(str(tmp_path / "shm"), quota_bytes=250)
+    loaded = {}
+    for name in ("a.safetensors", "b.safetensors", "c.safetensors"):
+        source = _source(tmp_path, name)
+        loaded[name] = tier.load(source, lambda: ({"weight": types.SimpleNamespace(nbytes=100)}, None))
+    keys = {entry["source"].rsplit("/", 1)[-1]: entry["key"] for entry in tier.entries()}
+    del loaded["a.safetensors"], loaded["b.safetensors"]
+    gc.collect()
+
+    # b is referenced only by a process that exited, even though its pid is alive here
+    open(_ref_path(tier, keys["b.safetensors"], f"{os.getpid()}-exited"), "w").close()
+    for index, name in enumerate(("a.safetensors", "b.safetensors", "c.safetensors")):
+        os.utime(os.path.join(tier.directory, keys[name] + ".safetensors"), (index, index))
+
+    # a is held by a process in another PID namespace whose pid does not exist here
+    with open(_ref_path(tier, keys["a.safetensors"], "999999999-othercontainer"), "w") as other:
+        fcntl.flock(other, fcntl.LOCK_SH)
+        assert tier.evict(needed_bytes=100) == 1
+        remaining = {entry["key"]: entry["refs"] for entry in tier.entries()}
+    assert remaining == {keys["a.safetensors"]: [999999999], keys["c.safetensors"]: [os.getpid()]}
+
+
+def test_references_die_with_their_process(tmp_path, fake_tensors) -> None:
+    """Test that a reference held by another process stops counting once that process exits."""
+    tier = SharedTier(str(tmp_path / "shm"))
+    path = _ref_path(tier, "entry", "1-child")
+    holder = (
+        "import fcntl, sys, time; handle = open(sys.argv[1], 'w'); fcntl.flock(handle, fcntl.LOCK_SH); "
+        "print('locked', flush=True); time.sleep(60)"
+    )
+    child = subprocess.Popen([sys.executable, "-c", holder, path], stdout=subprocess.PIPE, text=True)
+    try:
+        assert child.stdout.readline().strip() == "locked"
+        assert tier._live_refs("entry") == [1]
+    finally:
+        child.kill()
+        child.wait()
+        child.stdout.close()
+
+    assert tier._live_refs("entry") == []
+    assert not os.path.exists(path)
+
+
+def test_reference_lost_to_eviction_falls_back_to_a_fresh_load(tmp_path, fake_tensors, monkeypatch) -> None:
+    """Test that an entry evicted while being referenced is materialized again, leaving no stale count."""
+    source = _source(tmp_path, "model.safetensors")
+
+    def read():
+        return {"weight": types.SimpleNamespace(nbytes=100)}, None
+
+    SharedTier(str(tmp_path / "shm")).load(source, read)
+    gc.collect()
+
+    tier = SharedTier(str(tmp_path / "shm"))
+    other = SharedTier(str(tmp_path / "shm"))
+    key = tier.key_for(source)
+    makedirs = os.makedirs
+    evicted = []
+
+    def makedirs_then_evict(path, *args, **kwargs):
+        makedirs(path, *args, **kwargs)
+        if not evicted:
+            # Another process evicts the entry between creating the refs directory and the reference
+            evicted.append(other.clear())
+
+    monkeypatch.setattr(shared_tier.os, "makedirs", makedirs_then_evict)
+    state_dict, _metadata = tier.load(source, read)
+
+    assert evicted == [1]
+    assert tier.materializations == 1
+    assert tier._mapped == {key: 1}
+    assert [entry["refs"] for entry in tier.entries()] == [[os.getpid()]]
+    del state_dict
+    gc.collect()
+    assert tier._mapped == {} and tier._ref_files == {}
+
+
+def test_state_dicts_over_the_quota_stay_private(tmp_path, fake_tensors, capsys) -> None:
+    """Test that a state dict too large for the tier is returned from the read, not mapped."""
+    tier = SharedTier(str(tmp_path / "shm"), quota_bytes=50)
+    source = _source(tmp_path, "big.safetensors")
+    private = {"weight": types.SimpleNamespace(nbytes=100)}
+
+    state_dict, _metadata = tier.load(source, lambda: (private, None))
+
+    assert state_dict is private
+    assert tier.entries() == []
+    assert "over the 0 MB quota" in capsys.readouterr().out
+
+
+def test_tier_is_disabled_without_a_directory(tmp_path, monkeypatch) -> None:
+    """Test that the tier is only created when WEIRDION_SHARED_TIER_DIR is set."""
+    monkeypatch.delenv(shared_tier.SHARED_TIER_DIR_ENV, raising=False)
+    assert shared_tier.get_shared_tier() is None
+
+    monkeypatch.setenv(shared_tier.SHARED_TIER_DIR_ENV, str(tmp_path / "shm"))
+    monkeypatch.setenv(shared_tier.SHARED_TIER_QUOTA_ENV, "64")
+    monkeypatch.setattr(shared_tier, "_tier", None)
+    tier = shared_tier.get_shared_tier()
+
+    assert tier is not None and tier.quota_bytes == 64 * 1024**2
+    assert shared_tier.get_shared_tier() is tier
+
+
+def _write_safetensors(path, tensors, metadata=None):
+    header = {}
+    data = b""
+    for name, (dtype, shape, raw) in tensors.items():
+        header[name] = {"dtype": dtype, "shape": shape, "data_offsets": [len(data), len(data) + len(raw)]}
+        data += raw
+    if metadata is not None:
+        header["__metadata__"] = metadata
+    encoded = json.dumps(header).encode()
+    with open(path, "wb") as handle:
+        handle.write(struct.pack("<Q", len(encoded)) + encoded + data)
+
+
+def test_read_header(tmp_path) -> None:
+    """Test that safetensors headers are parsed and malformed files rejected."""
+    path = tmp_path / "model.safetensors"
+    _write_safetensors(path, {"weight": ("F32", [2], struct.pack("<2f", 1.0, 2.0))}, {"format": "pt"})
+
+    header, offset = read_header(str(path))
+
+    assert header["weight"]["shape"] == [2]
+    assert header["__metadata__"] == {"format": "pt"}
+    assert offset == path.stat().st_size - 8
+
+    (tmp_path / "broken.safetensors").write_bytes(b"\x01")
+    with pytest.raises(ValueError):
+        read_header(str(tmp_path / "broken.safetensors"))
+
+
+def test_map_state_dict_views_the_file(tmp_path) -> None:
+    """Test that mapped tensors read the file's data and report when the mapping is freed."""
+    torch = pytest.importorskip("torch")
+    from weirdion.utils.safetensors_map import map_state_dict
+
+    path = tmp_path / "model.safetensors"
+    _write_safetensors(path, {"weight": ("F32", [2, 2], struct.pack("<4f", 1.0, 2.0, 3.0, 4.0))})
+    unmapped = []
+
+    state_dict, metadata = map_state_dict(str(path), on_unmap=lambda: unmapped.append(True))
+
+    assert metadata is None
+    assert torch.equal(state_dict["weight"], torch.tensor([[1.0, 2.0], [3.0, 4.0]]))
+    del state_dict
+    gc.collect()
+    assert unmapped == [True]
@@ -0,0 +1,106 @@
+"""Tests for single-flight deduplication of concurrent loads."""
+
+import threading
+import time
+import types
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from weirdion.utils import lora_loader
+from weirdion.utils.single_flight import SingleFlight
+
+
+def _run_concurrently(count, func):
+    with ThreadPoolExecutor(max_workers=count) as pool:
+        futures = [pool.submit(func) for _ in range(count)]
+        return [future.exception() or future.result() for future in futures]
+
+
+def test_concurrent_calls_share_one_execution() -> None:
+    """Test that callers arriving during an in-flight call get its result without running func."""
+    flight = SingleFlight()
+    calls = []
+    started = threading.Event()
+    release = threading.Event()
+
+    def load():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return object()
+
+    def request():
+        return flight.do("model.safetensors", load)
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        leader = pool.submit(request)
+        assert started.wait(5)
+        followers = [pool.submit(request) for _ in range(3)]
+        while flight.shared < 3:
+            time.sleep(0.001)
+        release.set()
+        results = [leader.result()] + [future.result() for future in followers]
+
+    assert len(calls) == 1
+    assert all(result is results[0] for result in results)
+    assert flight.in_flight() == []
+
+
+def test_errors_are_shared_and_not_remembered() -> None:
+    """Test that waiters see the leader's exception and the next call runs again."""
+    flight = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+
+    def fail():
+        started.set()
+        release.wait(5)
+        raise OSError("disk gone")
+
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        leader = pool.submit(flight.do, "key", fail)
+        assert started.wait(5)
+        followers = [pool.submit(flight.do, "key", fail) for _ in range(2)]
+        while flight.shared < 2:
+            time.sleep(0.001)
+        release.set()
+        errors = [leader.exception()] + [future.exception() for future in followers]
+
+    assert all(isinstance(error, OSError) for error in errors)
+    assert flight.do("key", lambda: "recovered") == "recovered"
+
+
+def test_concurrent_lora_misses_read_once(monkeypatch, tmp_path) -> None:
+    """Test that concurrent misses for one LoRA file share a single read."""
+    lora_file = tmp_path / "style.safetensors"
+    lora_file.write_bytes(b"1234")
+    reads = []
+
+    def load_torch_file(path, safe_load):
+        reads.append(path)
+        time.sleep(0.1)
+        return {"w": types.SimpleNamespace(nbytes=4)}
+
+    comfy_utils = types.SimpleNamespace(load_torch_file=load_torch_file)
+    monkeypatch.setattr(lora_loader.lora_cache, "_entries", {})
+
+    results = _run_concurrently(4, lambda: lora_loader.load_lora_state_dict(comfy_utils, "style", str(lora_file)))
+
+    assert len(reads) == 1
+    assert all(result is results[0] for result in results)
+
+
+@pytest.mark.parametrize("count", [1, 8])
+def test_distinct_keys_do_not_wait_for_each_other(count) -> None:
+    """Test that calls for different keys all run."""
+    flight = SingleFlight()
+    keys = iter(range(count))
+    lock = threading.Lock()
+
+    def request():
+        with lock:
+            key = next(keys)
+        return flight.do(key, lambda: key)
+
+    assert sorted(_run_concurrently(count, request)) == list(range(count))
@@ -0,0 +1,119 @@
+"""Tests for Chrome trace-event export."""
+
+import json
+import sys
+import threading
+import types
+
+import pytest
+
+from weirdion.core import BaseNode, tracing
+from weirdion.core.tracing import clear_traces, disable_tracing, enable_tracing, get_trace, trace_span
+from weirdion.utils.checkpoint_loader import load_checkpoint
+
+
+class _TracedNode(BaseNode):
+    @classmethod
+    def get_input_spec(cls):
+        return {"required": {}}
+
+    @classmethod
+    def get_return_types(cls):
+        return ("STRING",)
+
+    def process(self):
+        with trace_span("work", "test", step=1):
+            worker = threading.Thread(target=self._prefetch, name="prefetch")
+            worker.start()
+            worker.join()
+        return ("done",)
+
+    @staticmethod
+    def _prefetch():
+        with trace_span("prefetch", "test"):
+            pass
+
+
+@pytest.fixture
+def prompt_server(monkeypatch):
+    """Install a fake PromptServer reporting prompt 'p-1' as executing."""
+    instance = types.SimpleNamespace(last_prompt_id="p-1")
+    server_module = types.ModuleType("server")
+    server_module.PromptServer = types.SimpleNamespace(instance=instance)
+    monkeypatch.setitem(sys.modules, "server", server_module)
+    return instance
+
+
+@pytest.fixture
+def trace_dir(tmp_path):
+    """Enable tracing into a temporary directory for one test."""
+    enable_tracing(tmp_path)
+    yield tmp_path
+    disable_tracing()
+    clear_traces()
+
+
+def _spans(trace):
+    return [event for event in trace["traceEvents"] if event["ph"] == "X"]
+
+
+def test_disabled_tracing_records_nothing() -> None:
+    """Test that spans are free no-ops while tracing is off."""
+    with trace_span("ignored") as args:
+        args["file"] = "x"
+    assert get_trace(tracing.UNKNOWN_PROMPT_ID) is None
+
+
+def test_node_trace_is_written_per_prompt(prompt_server, trace_dir) -> None:
+    """Test that a node's spans, including other threads', land in its prompt's trace file."""
+    assert _TracedNode().process() == ("done",)
+
+    trace = json.loads((trace_dir / "p-1.trace.json").read_text())
+    assert trace["otherData"] == {"prompt_id": "p-1"}
+    spans = {event["name"]: event for event in _spans(trace)}
+    assert set(spans) == {"_TracedNode", "work", "prefetch"}
+    assert spans["work"]["args"] == {"step": 1}
+    assert spans["prefetch"]["tid"] != spans["work"]["tid"]
+    node, work = spans["_TracedNode"], spans["work"]
+    assert node["ts"] <= work["ts"] and work["ts"] + work["dur"] <= node["ts"] + node["dur"]
+
+    thread_names = {event["args"]["name"] for event in trace["traceEvents"] if event["ph"] == "M"}
+    assert "prefetch" in thread_names
+
+
+def test_spans_are_grouped_by_prompt_and_record_errors(prompt_server, trace_dir) -> None:
+    """Test that events follow the executing prompt id and failed spans keep their error."""
+    with trace_span("first"):
+        pass
+    prompt_server.last_prompt_id = "p-2"
+    with pytest.raises(ValueError), trace_span("second"):
+        raise ValueError("bad")
+
+    assert [event["name"] for event in _spans(get_trace("p-1"))] == ["first"]
+    (second,) = _spans(get_trace("p-2"))
+    assert second["args"]["error"] == "ValueError('bad')"
+
+
+def test_checkpoint_load_is_split_into_read_and_config_guess(monkeypatch, prompt_server, trace_dir) -> None:
+    """Test that checkpoint loading records separate read and config guess spans."""
+    calls = []
+    comfy = types.ModuleType("comfy")
+    comfy.sd = types.SimpleNamespace(
+        load_state_dict_guess_config=lambda sd, **kwargs: calls.append((sd, kwargs)) or ("model", "clip", "vae", None)
+    )
+    comfy.utils = types.SimpleNamespace(
+        load_torch_file=lambda path, return_metadata: ({"path": path}, {"format": "pt"})
+    )
+    folder_paths = types.ModuleType("folder_paths")
+    folder_paths.get_full_path = lambda kind, name: f"/models/{kind}/{name}"
+    folder_paths.get_folder_paths = lambda kind: [f"/models/{kind}"]
+    monkeypatch.setitem(sys.modules, "comfy", comfy)
+    monkeypatch.setitem(sys.modules, "comfy.sd", comfy.sd)
+    monkeypatch.setitem(sys.modules, "comfy.utils", comfy.utils)
+    monkeypatch.setitem(sys.modules, "folder_paths", folder_paths)
+
+    assert load_checkpoint("a.ckpt") == ("model", "clip", "vae")
+    assert calls[0][0] == {"path": "/models/checkpoints/a.ckpt"}
+    assert calls[0][1]["metadata"] == {"format": "pt"}
+    names = [event["name"] for event in _spans(get_trace("p-1"))]
+    assert names == ["checkpoint.resolve", "checkpoint.read", "checkpoint.config_guess", "checkpoint.account"]
@@ -0,0 +1,86 @@
+"""Tests for background warm-up of profile warm lists."""
+
+import pytest
+
+from weirdion.utils import warmup
+from weirdion.utils.profile_store import get_profile_snapshot, save_user_profiles
+from weirdion.utils.warmup import collect_warm_list, get_warmup_report, start_warmup, wait_for_warmup
+
+
+def _profile(**overrides):
+    profile = {
+        "steps": 20,
+        "cfg": 7.0,
+        "sampler": "euler",
+        "scheduler": "normal",
+        "denoise": 1.0,
+        "clip_skip": -1,
+        "note": "",
+    }
+    profile.update(overrides)
+    return profile
+
+
+@pytest.fixture
+def warm_profiles(profile_config_dir):
+    """Two profiles whose warm lists overlap."""
+    save_user_profiles(
+        {
+            "profiles": {
+                "A": _profile(warm_checkpoints=["base.safetensors", "big.safetensors"], warm_loras=["style"]),
+                "B": _profile(warm_checkpoints=["base.safetensors", "missing.safetensors"], warm_loras=["broken"]),
+            },
+            "checkpoint_defaults": {},
+        }
+    )
+
+
+def test_collect_warm_list_deduplicates(warm_profiles) -> None:
+    """Test that warm lists are merged across profiles without duplicates."""
+    checkpoints, loras = collect_warm_list(get_profile_snapshot())
+
+    assert checkpoints == ("base.safetensors", "big.safetensors", "missing.safetensors")
+    assert loras == ("style", "broken")
+
+
+def test_warmup_loads_within_budget_and_reports_ready(warm_profiles, monkeypatch) -> None:
+    """Test that warm-up loads what fits, skips the rest and reports readiness once."""
+    loaded = []
+    paths = {"base.safetensors": "/base", "big.safetensors": "/big", "style": "/style", "broken": "/broken"}
+    sizes = {"/base": 10, "/big": 10**12, "/style": 1, "/broken": 1}
+    monkeypatch.setattr(warmup, "_resolve_path", lambda kind, name: paths.get(name))
+    monkeypatch.setattr(warmup.os.path, "getsize", lambda path: sizes[path])
+    monkeypatch.setattr(warmup, "_fits_budget", lambda size: size < 10**9)
+    monkeypatch.setattr(warmup, "_load_checkpoint", lambda name: loaded.append(name))
+
+    def load_lora(name, path):
+        if name == "broken":
+            raise ValueError("corrupt file")
+        loaded.append(name)
+
+    monkeypatch.setattr(warmup, "_load_lora", load_lora)
+    ready = []
+
+    assert start_warmup(delay=0, on_ready=ready.append)
+    assert wait_for_warmup(timeout=5)
+
+    report = get_warmup_report()
+    assert report["status"] == "ready"
+    assert loaded == ["base.safetensors", "style"]
+    statuses = {item["name"]: (item["status"], item["detail"]) for item in report["items"]}
+    assert statuses == {
+        "base.safetensors": ("loaded", ""),
+        "big.safetensors": ("skipped", "over memory budget"),
+        "missing.safetensors": ("skipped", "not found"),
+        "style": ("loaded", ""),
+        "broken": ("failed", "corrupt file"),
+    }
+    assert ready == [report]
+
+
+def test_warmup_can_be_disabled(monkeypatch) -> None:
+    """Test that WEIRDION_WARMUP=0 disables warm-up."""
+    monkeypatch.setenv(warmup.WARMUP_ENV, "0")
+
+    assert not start_warmup(delay=0)
+    assert get_warmup_report()["status"] == "disabled"
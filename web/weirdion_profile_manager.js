@@ -3,11 +3,14 @@
  */
 
 import { app } from "../../scripts/app.js";
+import { api } from "../../scripts/api.js";
 
 const EXTENSION_NAME = "weirdion.ProfileManager";
 const DEFAULT_PROFILE_NAME = "Default";
 const UNSAVED_SUFFIX = " (unsaved)";
 const API_URL = "/weirdion/profiles";
+const CHECKPOINT_DEFAULTS_URL = "/weirdion/checkpoint-defaults";
+const PROFILES_CHANGED_EVENT = "weirdion.profiles.changed";
 const CSS_URL = "/extensions/comfyui-weirdion/weirdion_profile_manager.css";
 const PARAM_WIDGET_NAMES = ["steps", "cfg", "sampler", "scheduler", "denoise", "clip_skip"];
 const NOTE_DEFAULT_HEIGHT = 160;
@@ -15,6 +18,11 @@ const NOTE_MAX_HEIGHT = 160;
 const PROFILE_NODES = ["weirdion_LoadProfileInputParameters", "weirdion_LoadCheckpointWithProfiles"];
 const PROFILE_NODE_INSTANCES = new Set();
 
+let profilesEtag = null;
+let profilesCache = null;
+let profilesRevision = null;
+let profileChangeQueue = Promise.resolve();
+
 function configureProfileWidget(node, widget) {
     if (widget._weirdionConfigured) {
         return;
@@ -226,27 +234,99 @@ function showToast(message, type = "info", timeoutMs = 3000) {
 }
 
 async function fetchProfiles() {
-    const res = await fetch(API_URL, { method: "GET" });
+    const headers = profilesEtag && profilesCache ? { "If-None-Match": profilesEtag } : {};
+    const res = await fetch(API_URL, { method: "GET", headers });
+    if (res.status === 304 && profilesCache) {
+        return structuredClone(profilesCache);
+    }
     const data = await res.json();
     if (!res.ok) {
         throw new Error(data?.error || "Failed to load profiles");
     }
-    return data;
+    profilesEtag = res.headers.get("ETag");
+    profilesCache = data;
+    profilesRevision = data.revision ?? null;
+    return structuredClone(data);
+}
+
+function applyProfileDelta(data, delta) {
+    Object.entries(delta.profiles || {}).forEach(([name, profile]) => {
+        if (profile === null) {
+            delete data.profiles[name];
+        } else {
+            data.profiles[name] = structuredClone(profile);
+        }
+    });
+    Object.entries(delta.checkpoint_defaults || {}).forEach(([checkpoint, profileName]) => {
+        if (profileName === null) {
+            delete data.checkpoint_defaults[checkpoint];
+        } else {
+            data.checkpoint_defaults[checkpoint] = profileName;
+        }
+    });
+    if (delta.default_profile) {
+        data.default_profile = structuredClone(delta.default_profile);
+    }
+    data.revision = delta.revision;
+}
+
+async function handleProfileChange(delta) {
+    if (!delta || (profilesRevision !== null && delta.revision <= profilesRevision)) {
+        return;
+    }
+
+    // A missed revision or a bulk change means the local copy can no longer be patched.
+    const canPatch = !delta.full && profilesCache && delta.revision === profilesRevision + 1;
+    if (canPatch) {
+        applyProfileDelta(profilesCache, delta);
+        profilesRevision = delta.revision;
+        profilesEtag = null;
+        if (window.weirdionProfileData) {
+            applyProfileDelta(window.weirdionProfileData, delta);
+        } else {
+            window.weirdionProfileData = structuredClone(profilesCache);
+        }
+    } else {
+        window.weirdionProfileData = await fetchProfiles();
+    }
+    PROFILE_NODE_INSTANCES.forEach((node) => syncProfileState(node));
 }
 
-async function saveProfiles(payload) {
-    const res = await fetch(API_URL, {
-        method: "POST",
+async function sendJson(url, method, payload, fallbackError) {
+    const res = await fetch(url, {
+        method,
         headers: { "Content-Type": "application/json" },
-        body: JSON.stringify(payload),
+        body: payload === undefined ? undefined : JSON.stringify(payload),
     });
     const data = await res.json();
     if (!res.ok) {
-        throw new Error(data?.error || "Failed to save profiles");
+        throw new Error(data?.error || fallbackError);
     }
     return data;
 }
 
+async function patchProfile(name, profile) {
+    return sendJson(`${API_URL}/${encodeURIComponent(name)}`, "PATCH", profile, "Failed to save profile");
+}
+
+async function deleteProfile(name) {
+    return sendJson(`${API_URL}/${encodeURIComponent(name)}`, "DELETE", undefined, "Failed to delete profile");
+}
+
+async function syncCheckpointDefaults(previous, next) {
+    const url = (ckpt) => `${CHECKPOINT_DEFAULTS_URL}/${encodeURIComponent(ckpt)}`;
+    for (const ckpt of Object.keys(previous)) {
+        if (!(ckpt in next)) {
+            await sendJson(url(ckpt), "DELETE", undefined, "Failed to clear checkpoint default");
+        }
+    }
+    for (const [ckpt, profileName] of Object.entries(next)) {
+        if (previous[ckpt] !== profileName) {
+            await sendJson(url(ckpt), "PATCH", { profile: profileName }, "Failed to set checkpoint default");
+        }
+    }
+}
+
 function normalizeProfile(profile) {
     return {
         steps: Number(profile.steps ?? 30),
@@ -312,6 +392,8 @@ class ProfileManagerUI {
     constructor() {
         this.data = null;
         this.selectedProfile = DEFAULT_PROFILE_NAME;
+        // Profiles whose checkpoint associations changed since the last save
+        this.dirtyProfiles = new Set();
         this.overlay = document.createElement("div");
         this.modal = document.createElement("div");
         this.overlay.className = "weirdion-profile-overlay";
@@ -410,6 +492,8 @@ class ProfileManagerUI {
             this.data.profiles = this.data.profiles || {};
             this.data.checkpoint_defaults = this.data.checkpoint_defaults || {};
             this.data.checkpoints = this.data.checkpoints || [];
+            this.savedCheckpointDefaults = { ...this.data.checkpoint_defaults };
+            this.dirtyProfiles.clear();
             window.weirdionProfileData = this.data;
             this._render();
             this.overlay.classList.add("is-open");
@@ -578,6 +662,7 @@ class ProfileManagerUI {
             checkpoints.add(ckpt);
         }
         profile.checkpoints = Array.from(checkpoints);
+        this.dirtyProfiles.add(this.selectedProfile);
         this._renderCheckpointChips();
     }
 
@@ -658,10 +743,18 @@ class ProfileManagerUI {
         this.selectedProfile = name;
 
         try {
-            await saveProfiles({
-                profiles: this.data.profiles,
-                checkpoint_defaults: this.data.checkpoint_defaults,
-            });
+            await patchProfile(name, payload);
+            this.dirtyProfiles.delete(name);
+            // Checkpoint toggles on other profiles are saved with this one
+            for (const dirtyName of Array.from(this.dirtyProfiles)) {
+                const dirty = this.data.profiles[dirtyName];
+                if (dirty) {
+                    await patchProfile(dirtyName, { checkpoints: dirty.checkpoints || [] });
+                }
+                this.dirtyProfiles.delete(dirtyName);
+            }
+            await syncCheckpointDefaults(this.savedCheckpointDefaults || {}, this.data.checkpoint_defaults);
+            this.savedCheckpointDefaults = { ...this.data.checkpoint_defaults };
             window.weirdionProfileData = this.data;
             window.dispatchEvent(new CustomEvent("weirdion:profiles-updated"));
             showToast("Profile saved.");
@@ -685,19 +778,20 @@ class ProfileManagerUI {
             return;
         }
 
-        delete this.data.profiles[this.selectedProfile];
+        const deletedName = this.selectedProfile;
+        delete this.data.profiles[deletedName];
+        this.dirtyProfiles.delete(deletedName);
         Object.keys(this.data.checkpoint_defaults).forEach((ckpt) => {
-            if (this.data.checkpoint_defaults[ckpt] === this.selectedProfile) {
+            if (this.data.checkpoint_defaults[ckpt] === deletedName) {
                 delete this.data.checkpoint_defaults[ckpt];
             }
         });
         this.selectedProfile = DEFAULT_PROFILE_NAME;
 
         try {
-            await saveProfiles({
-                profiles: this.data.profiles,
-                checkpoint_defaults: this.data.checkpoint_defaults,
-            });
+            // The server removes checkpoint defaults that pointed at the deleted profile.
+            await deleteProfile(deletedName);
+            this.savedCheckpointDefaults = { ...this.data.checkpoint_defaults };
             window.weirdionProfileData = this.data;
             window.dispatchEvent(new CustomEvent("weirdion:profiles-updated"));
             showToast("Profile deleted.");
@@ -839,13 +933,16 @@ app.registerExtension({
             console.warn("[weirdion] Failed to preload profiles", error);
         }
 
-        window.addEventListener("weirdion:profiles-updated", async () => {
-            try {
-                window.weirdionProfileData = await fetchProfiles();
-                PROFILE_NODE_INSTANCES.forEach((node) => syncProfileState(node));
-            } catch (error) {
-                console.warn("[weirdion] Failed to refresh profiles", error);
-            }
+        // Local saves update weirdionProfileData directly; the server pushes the same change shortly after.
+        window.addEventListener("weirdion:profiles-updated", () => {
+            PROFILE_NODE_INSTANCES.forEach((node) => syncProfileState(node));
+        });
+
+        // Changes are applied one at a time, in revision order, as the server pushes them.
+        api.addEventListener(PROFILES_CHANGED_EVENT, (event) => {
+            profileChangeQueue = profileChangeQueue
+                .then(() => handleProfileChange(event.detail))
+                .catch((error) => console.warn("[weirdion] Failed to apply profile change", error));
         });
     },
 